@@ -1,7 +1,14 @@
-from semver import Version
-
 VERSION = "0.1.1"
 
-SEMANTIC_VERSION = Version.parse(VERSION)
 GITHUB_ORG_NAME = "nexient-llc"
 GITHUB_REPO_NAME = "launch-cli"
+
+
+def __getattr__(name: str):
+    # SEMANTIC_VERSION is parsed on first use, so that importing the package doesn't import semver.
+    if name == "SEMANTIC_VERSION":
+        from semver import Version
+
+        globals()[name] = Version.parse(VERSION)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,80 @@
 import logging
 import os
+import pathlib
 import sys
+import threading
+from concurrent.futures import Future
+from functools import partial
 
 import click
 
+from launch.cli.lazy import LazyGroup
 from launch.env import UPDATE_ALLOW_PRERELEASE, UPDATE_CHECK
-from launch.update import check_for_updates
+from launch.github.cache import set_response_cache_enabled
+from launch.profiling import disable_profiling, enable_profiling
+
+logger = logging.getLogger(__name__)
+
+
+def start_update_check(include_prerelease: bool = False) -> Future:
+    """Runs check_for_updates on a daemon thread so that it doesn't hold up the subcommand. Daemon threads are abandoned
+    when the interpreter exits, so a slow check never extends the total runtime of the CLI.
+
+    Args:
+        include_prerelease (bool, optional): Include prerelease versions in the version search. Defaults to False.
+
+    Returns:
+        Future: Resolves to the result of check_for_updates once the check finishes.
+    """
+    update_check: Future = Future()
+
+    def run_update_check():
+        try:
+            # Imported here, launch.update pulls in PyGithub and semver, which commands that don't check never need.
+            from launch.update import check_for_updates
+
+            update_check.set_result(
+                check_for_updates(include_prerelease=include_prerelease)
+            )
+        except Exception as e:
+            update_check.set_exception(e)
+
+    threading.Thread(
+        target=run_update_check, name="launch-update-check", daemon=True
+    ).start()
+    return update_check
+
+
+def report_update_check(update_check: Future) -> None:
+    """Tells the user about a new version if the background update check has already finished, and stays quiet otherwise."""
+    if not update_check.done():
+        logger.debug("Update check didn't finish before exit, skipping it")
+        return
+    if update_check.exception():
+        logger.debug(f"Update check failed: {update_check.exception()}")
+        return
+    new_version = update_check.result()
+    if new_version:
+        click.secho(
+            f"Version {new_version} of Launch-CLI is now available!", fg="yellow"
+        )
+        click.secho("To install the latest version, execute the following command: ")
+        click.secho("    pip install --update launch-cli", fg="yellow")
+
+
+def report_profile(trace_path: pathlib.Path | None = None) -> None:
+    """Prints the profile recorded during this invocation to stderr, and writes it as a Chrome trace if asked to.
+
+    Args:
+        trace_path (pathlib.Path | None, optional): File the Chrome trace is written to. Defaults to None, which writes none.
+    """
+    profiler = disable_profiling()
+    if profiler is None:
+        return
+    click.echo(profiler.summary(), err=True)
+    if trace_path:
+        profiler.write_chrome_trace(trace_path)
+        click.echo(f"Wrote a Chrome trace to {trace_path}", err=True)
 
 
 @click.command("version")
@@ -17,7 +86,12 @@ def get_version():
     sys.exit(0)
 
 
-@click.group(name="cli", invoke_without_command=True)
+@click.group(
+    name="cli",
+    cls=LazyGroup,
+    invoke_without_command=True,
+    lazy_subcommands={"github": "launch.cli.github.github_group"},
+)
 @click.option(
     "--verbose",
     "-v",
@@ -33,8 +107,32 @@ def get_version():
     default=False,
     help="Prints the current version of the tool and immediately exits.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Send every request to GitHub in full, instead of revalidating responses cached by earlier runs.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help="Print the time spent in each phase of the command, its GitHub API calls and its git operations to stderr.",
+)
+@click.option(
+    "--profile-trace",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    help="Also write the profile as a Chrome trace to this file, for chrome://tracing or Perfetto. Implies --profile.",
+)
 @click.pass_context
-def cli(context: click.core.Context, verbose: bool, version: bool):
+def cli(
+    context: click.core.Context,
+    verbose: bool,
+    version: bool,
+    no_cache: bool,
+    profile: bool,
+    profile_trace: pathlib.Path | None,
+):
     """Launch CLI tooling to help automate common tasks performed by Launch engineers and their clients."""
     logging.basicConfig(
         level=logging.DEBUG if verbose else logging.INFO,
@@ -42,23 +140,18 @@ def cli(context: click.core.Context, verbose: bool, version: bool):
         datefmt="%F %T %Z",
     )
     # breakpoint()
+    if profile or profile_trace:
+        enable_profiling()
+        context.call_on_close(partial(report_profile, profile_trace))
+    if no_cache:
+        set_response_cache_enabled(False)
     if UPDATE_CHECK and not context.invoked_subcommand == "pipeline":
-        new_version = check_for_updates(include_prerelease=UPDATE_ALLOW_PRERELEASE)
-        if new_version:
-            click.secho(
-                f"Version {new_version} of Launch-CLI is now available!", fg="yellow"
-            )
-            click.secho(
-                "To install the latest version, execute the following command: "
-            )
-            click.secho("    pip install --update launch-cli", fg="yellow")
+        update_check = start_update_check(include_prerelease=UPDATE_ALLOW_PRERELEASE)
+        context.call_on_close(partial(report_update_check, update_check))
     if context.invoked_subcommand is None and not version:
         click.echo(cli.get_help(context))
     if version:
         context.invoke(get_version)
 
 
-from .github import github_group
-
 cli.add_command(get_version)
-cli.add_command(github_group)
@@ -1,15 +1,16 @@
 import click
 
-from .access import access_group
-from .hooks import hooks_group
-from .version import version_group
+from launch.cli.lazy import LazyGroup
 
 
-@click.group(name="github")
+@click.group(
+    name="github",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "access": "launch.cli.github.access.access_group",
+        "hooks": "launch.cli.github.hooks.hooks_group",
+        "version": "launch.cli.github.version.version_group",
+    },
+)
 def github_group():
     """Command family for GitHub-related tasks."""
-
-
-github_group.add_command(access_group)
-github_group.add_command(hooks_group)
-github_group.add_command(version_group)
@@ -1,11 +1,14 @@
 import click
 
-from .commands import set_default
+from launch.cli.lazy import LazyGroup
 
 
-@click.group(name="access")
+@click.group(
+    name="access",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "set-default": "launch.cli.github.access.commands.set_default",
+    },
+)
 def access_group():
     """Command family for dealing with GitHub access."""
-
-
-access_group.add_command(set_default)
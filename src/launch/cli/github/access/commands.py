@@ -3,14 +3,25 @@ import logging
 import click
 
 from launch import GITHUB_ORG_NAME
+from launch.cli.github.bulk import (
+    bulk_repository_options,
+    is_bulk_request,
+    report_bulk_results,
+    select_repositories,
+)
 from launch.github.access import (
+    PLATFORM_ADMIN_TEAM_SLUG,
+    PLATFORM_TEAM_SLUG,
+    REPO_PREFIX_ADMIN_TEAM_SLUG,
     NoMatchingTeamException,
-    configure_default_branch_protection,
-    grant_admin,
-    grant_maintain,
+    PermissionSnapshot,
+    apply_default_access,
+    resolve_teams,
     select_administrative_team,
 )
 from launch.github.auth import get_github_instance
+from launch.github.bulk import run_bulk
+from launch.profiling import phase
 
 logger = logging.getLogger(__name__)
 
@@ -21,8 +32,14 @@ logger = logging.getLogger(__name__)
     default=GITHUB_ORG_NAME,
     help=f"GitHub organization containing your repository. Defaults to the {GITHUB_ORG_NAME} organization.",
 )
+@click.option("--repository-name", help="Name of the repository to be updated.")
+@bulk_repository_options
 @click.option(
-    "--repository-name", required=True, help="Name of the repository to be updated."
+    "--graphql",
+    "use_graphql",
+    is_flag=True,
+    default=False,
+    help="When updating more than one repository, read existing team permissions and default branch protection through the GraphQL API, a hundred repositories per request.",
 )
 @click.option(
     "--dry-run",
@@ -30,34 +47,114 @@ logger = logging.getLogger(__name__)
     default=False,
     help="Perform a dry run that reports on what it would do, but does not update access.",
 )
-def set_default(organization: str, repository_name: str, dry_run: bool):
-    """Sets the default access and branch protections for a single repository."""
-    g = get_github_instance()
-
-    organization = g.get_organization(login=organization)
+def set_default(
+    organization: str,
+    repository_name: str | None,
+    all_repositories: bool,
+    prefix: str | None,
+    name_pattern: str | None,
+    from_stdin: bool,
+    max_workers: int,
+    rate_limit_reserve: int,
+    use_graphql: bool,
+    dry_run: bool,
+):
+    """Sets the default access and branch protections for a single repository, or for many repositories at once.
 
-    platform_team = organization.get_team_by_slug("platform")
-    platform_admin_team = organization.get_team_by_slug("platform-administrators")
+    Use --repository-name to update a single repository. To update many repositories, use --all, --prefix, --name-pattern,
+    or pipe a list of repository names into --from-stdin; the repositories are updated concurrently and a summary is printed
+    at the end.
+    """
+    bulk = is_bulk_request(
+        repository_name=repository_name,
+        all_repositories=all_repositories,
+        prefix=prefix,
+        name_pattern=name_pattern,
+        from_stdin=from_stdin,
+    )
+    g = get_github_instance(per_page=100 if bulk else None)
 
-    repository = organization.get_repo(name=repository_name)
+    with phase("organization lookup"):
+        organization = g.get_organization(organization)
 
-    try:
-        specific_admin_team = select_administrative_team(
-            repository=repository, organization=organization
-        )
-    except NoMatchingTeamException:
-        click.secho(
-            "Couldn't match a domain-specific administrative team to your repository based on name. Only the Platform Admin team will be granted administrative access, you may need to manually update permissions on this repo!",
-            fg="yellow",
-        )
-        specific_admin_team = None
+    team_slugs = [PLATFORM_TEAM_SLUG, PLATFORM_ADMIN_TEAM_SLUG]
+    if bulk:
+        # Every team we might need is looked up once, rather than once per repository.
+        team_slugs += list(REPO_PREFIX_ADMIN_TEAM_SLUG.values())
+    teams = resolve_teams(organization=organization, slugs=team_slugs)
 
     if dry_run:
         click.secho(
             "Performing a dry run, nothing will be updated in GitHub", fg="yellow"
         )
-    grant_maintain(team=platform_team, repository=repository, dry_run=dry_run)
-    grant_admin(team=platform_admin_team, repository=repository, dry_run=dry_run)
-    if specific_admin_team:
-        grant_admin(team=specific_admin_team, repository=repository, dry_run=dry_run)
-    configure_default_branch_protection(repository=repository, dry_run=dry_run)
+
+    if not bulk:
+        repository = organization.get_repo(name=repository_name)
+        try:
+            specific_admin_team = select_administrative_team(
+                repository=repository, organization=organization, teams=teams
+            )
+        except NoMatchingTeamException:
+            click.secho(
+                "Couldn't match a domain-specific administrative team to your repository based on name. Only the Platform Admin team will be granted administrative access, you may need to manually update permissions on this repo!",
+                fg="yellow",
+            )
+            specific_admin_team = None
+        apply_default_access(
+            repository=repository,
+            platform_team=teams[PLATFORM_TEAM_SLUG],
+            platform_admin_team=teams[PLATFORM_ADMIN_TEAM_SLUG],
+            specific_admin_team=specific_admin_team,
+            dry_run=dry_run,
+        )
+        return
+
+    repositories, skipped = select_repositories(
+        organization=organization,
+        prefix=prefix,
+        name_pattern=name_pattern,
+        from_stdin=from_stdin,
+    )
+    # One listing per team tells us every permission we'd otherwise have to ask for per repository.
+    if use_graphql:
+        from launch.github.graphql import (
+            get_permission_snapshot,
+            get_protection_snapshot,
+        )
+
+        snapshot = get_permission_snapshot(
+            organization=organization.login, team_slugs=list(teams)
+        )
+        # The default branch protection of a hundred repositories comes back with each page of the listing.
+        protection_snapshot = get_protection_snapshot(organization=organization.login)
+    else:
+        snapshot = PermissionSnapshot.from_teams(teams.values())
+        protection_snapshot = None
+
+    def set_default_for_repository(repository):
+        try:
+            specific_admin_team = select_administrative_team(
+                repository=repository, organization=organization, teams=teams
+            )
+        except NoMatchingTeamException:
+            logger.warning(
+                f"Couldn't match a domain-specific administrative team to {repository.name}, only the Platform Admin team will be granted administrative access."
+            )
+            specific_admin_team = None
+        apply_default_access(
+            repository=repository,
+            platform_team=teams[PLATFORM_TEAM_SLUG],
+            platform_admin_team=teams[PLATFORM_ADMIN_TEAM_SLUG],
+            specific_admin_team=specific_admin_team,
+            dry_run=dry_run,
+            snapshot=snapshot,
+            protection_snapshot=protection_snapshot,
+        )
+
+    results = run_bulk(
+        repositories=repositories,
+        action=set_default_for_repository,
+        max_workers=max_workers,
+        rate_limit_reserve=rate_limit_reserve,
+    )
+    report_bulk_results(results=results, skipped=skipped)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+import click
+
+from launch.github.bulk import DEFAULT_MAX_WORKERS, BulkResult, filter_repositories
+from launch.profiling import profiled
+
+if TYPE_CHECKING:
+    from github.Organization import Organization
+    from github.Repository import Repository
+
+
+def bulk_repository_options(f):
+    """Adds the options that select many repositories at once, and control how they're processed, to a command."""
+    options = [
+        click.option(
+            "--all",
+            "all_repositories",
+            is_flag=True,
+            default=False,
+            help="Update every repository in the organization. Archived repositories are skipped.",
+        ),
+        click.option(
+            "--prefix",
+            help="Update every repository in the organization whose name starts with this prefix.",
+        ),
+        click.option(
+            "--name-pattern",
+            help="Update every repository in the organization whose name matches this shell-style glob, such as 'tf-*-wrapper_*'.",
+        ),
+        click.option(
+            "--from-stdin",
+            is_flag=True,
+            default=False,
+            help="Update the repositories named on standard input, one name per line.",
+        ),
+        click.option(
+            "--max-workers",
+            type=click.IntRange(min=1),
+            default=DEFAULT_MAX_WORKERS,
+            show_default=True,
+            help="Maximum number of repositories updated at the same time when updating more than one repository.",
+        ),
+        click.option(
+            "--rate-limit-reserve",
+            type=click.IntRange(min=0),
+            default=100,
+            show_default=True,
+            help="When updating more than one repository, stop starting new repositories once fewer than this many GitHub API requests remain in the rate limit.",
+        ),
+    ]
+    for option in reversed(options):
+        f = option(f)
+    return f
+
+
+def is_bulk_request(
+    repository_name: str | None,
+    all_repositories: bool,
+    prefix: str | None,
+    name_pattern: str | None,
+    from_stdin: bool,
+) -> bool:
+    """Works out whether a command was asked to act on a single repository or on a selection of repositories, and rejects
+    combinations that don't make sense."""
+    bulk_selected = any([all_repositories, prefix, name_pattern, from_stdin])
+    if repository_name and bulk_selected:
+        raise click.UsageError(
+            "--repository-name can't be combined with --all, --prefix, --name-pattern or --from-stdin."
+        )
+    if not repository_name and not bulk_selected:
+        raise click.UsageError(
+            "One of --repository-name, --all, --prefix, --name-pattern or --from-stdin is required."
+        )
+    return bulk_selected
+
+
+def read_repository_names(stream) -> list[str]:
+    """Reads repository names, one per line. Blank lines and lines starting with # are ignored."""
+    names = []
+    for line in stream:
+        name = line.strip()
+        if name and not name.startswith("#"):
+            names.append(name)
+    return names
+
+
+@profiled("repository listing")
+def select_repositories(
+    organization: Organization,
+    prefix: str | None,
+    name_pattern: str | None,
+    from_stdin: bool,
+) -> tuple[list[Repository], dict[str, str]]:
+    """Narrows the organization's repositories down to the ones selected on the command line. Repositories named on stdin are
+    looked up one by one, anything else lists the organization's repositories once.
+
+    Returns:
+        tuple[list[Repository], dict[str, str]]: The selected repositories, and why each name read from stdin that won't be
+        processed was skipped, keyed by name.
+    """
+    if not from_stdin:
+        repositories = filter_repositories(
+            repositories=organization.get_repos(),
+            prefix=prefix,
+            name_pattern=name_pattern,
+        )
+        return repositories, {}
+
+    from github.GithubException import UnknownObjectException
+
+    found = []
+    skipped = {}
+    for name in dict.fromkeys(read_repository_names(sys.stdin)):
+        try:
+            repository = organization.get_repo(name)
+        except UnknownObjectException:
+            skipped[name] = "repository not found"
+            continue
+        if repository.archived:
+            skipped[name] = "repository is archived"
+            continue
+        found.append(repository)
+    repositories = filter_repositories(
+        repositories=found, prefix=prefix, name_pattern=name_pattern
+    )
+    return repositories, skipped
+
+
+def report_bulk_results(results: list[BulkResult], skipped: dict[str, str]) -> None:
+    """Prints a per-repository summary of a bulk operation, and exits with a non-zero code if anything failed."""
+    for result in results:
+        if result.succeeded:
+            click.secho(f"{result.repository_name}: OK", fg="green")
+        else:
+            click.secho(f"{result.repository_name}: FAILED: {result.error}", fg="red")
+    for name, reason in skipped.items():
+        click.secho(f"{name}: FAILED: {reason}", fg="red")
+
+    failures = len(skipped) + len([r for r in results if not r.succeeded])
+    total = len(results) + len(skipped)
+    click.secho(
+        f"Processed {total} repositories: {total - failures} succeeded, {failures} failed.",
+        fg="red" if failures else "green",
+    )
+    if failures:
+        sys.exit(1)
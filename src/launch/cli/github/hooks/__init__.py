@@ -1,11 +1,12 @@
 import click
 
-from .commands import create
+from launch.cli.lazy import LazyGroup
 
 
-@click.group(name="hooks")
+@click.group(
+    name="hooks",
+    cls=LazyGroup,
+    lazy_subcommands={"create": "launch.cli.github.hooks.commands.create"},
+)
 def hooks_group():
     """Command family for dealing with GitHub webhooks."""
-
-
-hooks_group.add_command(create)
@@ -3,8 +3,16 @@ import json
 import click
 
 from launch import GITHUB_ORG_NAME
+from launch.cli.github.bulk import (
+    bulk_repository_options,
+    is_bulk_request,
+    report_bulk_results,
+    select_repositories,
+)
 from launch.github.auth import get_github_instance
+from launch.github.bulk import run_bulk
 from launch.github.hooks import create_hook
+from launch.profiling import phase
 
 
 @click.command()
@@ -13,9 +21,8 @@ from launch.github.hooks import create_hook
     default=GITHUB_ORG_NAME,
     help=f"GitHub organization containing your repository. Defaults to the {GITHUB_ORG_NAME} organization.",
 )
-@click.option(
-    "--repository-name", required=True, help="Name of the repository to be updated."
-)
+@click.option("--repository-name", help="Name of the repository to be updated.")
+@bulk_repository_options
 @click.option(
     "--name",
     default="web",
@@ -31,7 +38,7 @@ from launch.github.hooks import create_hook
 )
 @click.option(
     "--secret",
-    help="If provided, the secret will be used as the key to generate the HMAC hex digest value for delivery signature headers.",
+    help="If provided, the secret will be used as the key to generate the HMAC hex digest value for delivery signature headers. GitHub never reports a hook's secret, so an existing hook is always updated when one is provided.",
 )
 @click.option(
     "--insecure-ssl",
@@ -56,7 +63,13 @@ from launch.github.hooks import create_hook
 )
 def create(
     organization: str,
-    repository_name: str,
+    repository_name: str | None,
+    all_repositories: bool,
+    prefix: str | None,
+    name_pattern: str | None,
+    from_stdin: bool,
+    max_workers: int,
+    rate_limit_reserve: int,
     name: str,
     url: str,
     content_type: str,
@@ -66,8 +79,20 @@ def create(
     active: bool,
     dry_run: bool,
 ):
-    """Creates a webhook for a single repository."""
-    g = get_github_instance()
+    """Creates a webhook for a single repository, or for many repositories at once.
+
+    A repository that already has a webhook for the same URL is skipped if the hook's events and settings match, and has the
+    hook updated if they don't. Use --repository-name for a single repository, or --all, --prefix, --name-pattern or
+    --from-stdin to provision many repositories concurrently, with a summary printed at the end.
+    """
+    bulk = is_bulk_request(
+        repository_name=repository_name,
+        all_repositories=all_repositories,
+        prefix=prefix,
+        name_pattern=name_pattern,
+        from_stdin=from_stdin,
+    )
+    g = get_github_instance(per_page=100 if bulk else None)
 
     config = {
         "url": url,
@@ -75,17 +100,39 @@ def create(
         "secret": secret,
         "insecure_ssl": insecure_ssl,
     }
+    events = json.loads(events)
 
-    repository = g.get_organization(login=organization).get_repo(name=repository_name)
+    with phase("organization lookup"):
+        organization = g.get_organization(organization)
     if dry_run:
         click.secho(
             "Performing a dry run, nothing will be updated in GitHub", fg="yellow"
         )
-    create_hook(
-        repo=repository,
-        name=name,
-        config=config,
-        events=json.loads(events),
-        active=active,
-        dry_run=dry_run,
+
+    def create_hook_for_repository(repository):
+        create_hook(
+            repo=repository,
+            name=name,
+            config=config,
+            events=events,
+            active=active,
+            dry_run=dry_run,
+        )
+
+    if not bulk:
+        create_hook_for_repository(organization.get_repo(name=repository_name))
+        return
+
+    repositories, skipped = select_repositories(
+        organization=organization,
+        prefix=prefix,
+        name_pattern=name_pattern,
+        from_stdin=from_stdin,
+    )
+    results = run_bulk(
+        repositories=repositories,
+        action=create_hook_for_repository,
+        max_workers=max_workers,
+        rate_limit_reserve=rate_limit_reserve,
     )
+    report_bulk_results(results=results, skipped=skipped)
@@ -1,12 +1,16 @@
 import click
 
-from .commands import apply, predict
+from launch.cli.lazy import LazyGroup
 
 
-@click.group(name="version")
+@click.group(
+    name="version",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "apply": "launch.cli.github.version.commands.apply",
+        "predict": "launch.cli.github.version.commands.predict",
+        "predict-workspace": "launch.cli.github.version.commands.predict_workspace",
+    },
+)
 def version_group():
     """Command family for dealing with GitHub versioning."""
-
-
-version_group.add_command(predict)
-version_group.add_command(apply)
@@ -1,19 +1,38 @@
+import dataclasses
+import json
 import pathlib
 import sys
 from functools import wraps
 
 import click
+from semver import Version
 
 from launch.local_repo.branch import get_current_branch_name
-from launch.local_repo.predict import predict_version
+from launch.local_repo.predict import predict_package_versions, predict_version
+from launch.local_repo.session import TAG_SOURCES, RepositorySession
 from launch.local_repo.tags import (
     CommitNotTaggedException,
     CommitTagNotSemanticVersionException,
+    create_package_version_tags,
     create_version_tag,
     push_version_tag,
-    read_semantic_tags,
+    push_version_tags,
+    read_changed_packages,
+    read_latest_package_versions,
+    read_latest_semantic_tag,
     read_semantic_version_tag,
 )
+from launch.local_repo.workspace import (
+    DEFAULT_DISCOVERY_DEPTH,
+    discover_repositories,
+)
+from launch.local_repo.workspace import predict_workspace as predict_workspace_versions
+from launch.local_repo.workspace import read_branch_map
+from launch.versions import (
+    DEFAULT_PACKAGE_TAG_SCHEME,
+    PACKAGE_TAG_SEPARATORS,
+    format_package_tag,
+)
 
 
 def version_required_options_wrapper(f):
@@ -37,20 +56,108 @@ def version_required_options_wrapper(f):
         help="Name of the branch that should be used to predict the next semantic version.",
         required=True,
     )
+    @click.option(
+        "--package",
+        "packages",
+        type=click.STRING,
+        multiple=True,
+        callback=parse_package_options,
+        help="Version a package kept in this repository separately, with tags of the form <package>/<version> or <package>-v<version>. Given as NAME or NAME=PATH, where PATH is the package's directory relative to the top of the repository and defaults to NAME. May be repeated; every package with changes since its latest version is versioned together.",
+    )
+    @click.option(
+        "--tag-scheme",
+        type=click.Choice(list(PACKAGE_TAG_SEPARATORS)),
+        default=DEFAULT_PACKAGE_TAG_SCHEME,
+        show_default=True,
+        help="How new package tags are named: slash for <package>/<version>, dash for <package>-v<version>. Only used with --package.",
+    )
+    @click.option(
+        "--tag-source",
+        type=click.Choice(TAG_SOURCES),
+        default="local",
+        show_default=True,
+        help="Where existing version tags are read from. remote lists the tags of origin with a single git ls-remote, without fetching anything, for shallow checkouts that were cloned without tags.",
+    )
+    @click.option(
+        "--fetch-missing-tags",
+        is_flag=True,
+        default=False,
+        help="With --tag-source remote, fetch the individual tags that are needed locally but missing, such as the tag a package's changes are compared against.",
+    )
     def wrapper(*args, **kwargs):
         return f(*args, **kwargs)
 
     return wrapper
 
 
+def parse_package_options(
+    ctx: click.Context, param: click.Parameter, values: tuple[str, ...]
+) -> dict[str, str]:
+    packages = {}
+    for value in values:
+        name, _, path = value.partition("=")
+        if not name:
+            raise click.BadParameter(f"{value!r} doesn't name a package")
+        packages[name] = path or name
+    return packages
+
+
+def predict_changed_packages(
+    repo_path: pathlib.Path,
+    packages: dict[str, str],
+    source_branch: str,
+    session: RepositorySession,
+) -> dict[str, Version]:
+    changed = read_changed_packages(
+        repo_path=repo_path, packages=packages, session=session
+    )
+    return predict_package_versions(
+        latest_versions=read_latest_package_versions(
+            repo_path=repo_path, packages=changed, session=session
+        ),
+        branch_name=source_branch,
+    )
+
+
 @click.command()
 @version_required_options_wrapper
-def predict(repo_path: pathlib.Path, source_branch: str):
-    """Predicts the next semantic version for a repository."""
+def predict(
+    repo_path: pathlib.Path,
+    source_branch: str,
+    packages: dict[str, str],
+    tag_scheme: str,
+    tag_source: str,
+    fetch_missing_tags: bool,
+):
+    """Predicts the next semantic version for a repository, or with --package, the next tag of each changed package."""
+    session = RepositorySession(
+        repo_path=repo_path,
+        tag_source=tag_source,
+        fetch_missing_tags=fetch_missing_tags,
+    )
+
+    if packages:
+        try:
+            predicted_versions = predict_changed_packages(
+                repo_path=repo_path,
+                packages=packages,
+                source_branch=source_branch,
+                session=session,
+            )
+        except Exception as e:
+            click.secho(
+                f"Failed to predict next versions for packages in repository at {repo_path}: {e}",
+                fg="red",
+            )
+            raise click.Abort()
+        for package, version in predicted_versions.items():
+            click.echo(format_package_tag(package, version, scheme=tag_scheme))
+        return
 
     try:
         predicted_version = predict_version(
-            existing_tags=read_semantic_tags(repo_path=repo_path),
+            existing_tags=[],
+            known_latest=read_latest_semantic_tag(repo_path=repo_path, session=session),
             branch_name=source_branch,
         )
         click.echo(predicted_version)
@@ -70,14 +177,31 @@ def predict(repo_path: pathlib.Path, source_branch: str):
     help="Run this command in pipeline mode, which disables additional safety checks. End users should never need to specify this option, it should only be used in conjunction with pipelines that enforce a consistent repository state!",
 )
 @version_required_options_wrapper
-def apply(repo_path: pathlib.Path, source_branch: str, pipeline: bool):
+def apply(
+    repo_path: pathlib.Path,
+    source_branch: str,
+    pipeline: bool,
+    packages: dict[str, str],
+    tag_scheme: str,
+    tag_source: str,
+    fetch_missing_tags: bool,
+):
     """Predicts the next semantic version for a repository based on the provided source branch, then creates and pushes a tag.
 
     Run this command inside a repo that has had its branch merged to main in order to apply the next semantic version. When running this command locally, the repo *MUST* be on the `main` branch. For use with pipelines and detached HEADs, the --pipeline option may be supplied, which will skip the check to ensure that the branch is on main. Use of the --pipeline flag in non-pipeline scenarios is highly discouraged and may lead to improper tagging. User beware!
+
+    With --package, every listed package that changed since its latest version is tagged with its next version, and all of the new tags are pushed together.
     """
+    # Every step below reads from and writes to the same repository, which is only opened once.
+    session = RepositorySession(
+        repo_path=repo_path,
+        tag_source=tag_source,
+        fetch_missing_tags=fetch_missing_tags,
+    )
+
     # Safeguard to ensure that we can't accidentally bump a version if the branch is being merged against anything but main.
     if not pipeline:
-        active_branch = get_current_branch_name(repo_path=repo_path)
+        active_branch = get_current_branch_name(repo_path=repo_path, session=session)
         if not active_branch == "main":
             click.secho(
                 f"Failed to apply next version for repository at {repo_path}: repo is not on main branch!",
@@ -85,9 +209,20 @@ def apply(repo_path: pathlib.Path, source_branch: str, pipeline: bool):
             )
             raise click.Abort()
 
+    if packages:
+        apply_package_versions(
+            repo_path=repo_path,
+            packages=packages,
+            source_branch=source_branch,
+            tag_scheme=tag_scheme,
+            session=session,
+        )
+        return
+
     try:
         predicted_version = predict_version(
-            existing_tags=read_semantic_tags(repo_path=repo_path),
+            existing_tags=[],
+            known_latest=read_latest_semantic_tag(repo_path=repo_path, session=session),
             branch_name=source_branch,
         )
     except Exception as e:
@@ -98,7 +233,7 @@ def apply(repo_path: pathlib.Path, source_branch: str, pipeline: bool):
         raise click.Abort()
 
     try:
-        existing_tag = read_semantic_version_tag(repo_path=repo_path)
+        existing_tag = read_semantic_version_tag(repo_path=repo_path, session=session)
         click.secho(
             f"Failed to apply next version for repository at {repo_path}: HEAD is already tagged {existing_tag}",
             fg="red",
@@ -108,8 +243,10 @@ def apply(repo_path: pathlib.Path, source_branch: str, pipeline: bool):
         pass
 
     try:
-        new_tag = create_version_tag(repo_path=repo_path, version=predicted_version)
-        push_version_tag(repo_path=repo_path, tag=new_tag)
+        new_tag = create_version_tag(
+            repo_path=repo_path, version=predicted_version, session=session
+        )
+        push_version_tag(repo_path=repo_path, tag=new_tag, session=session)
         click.echo(f"Version is now {predicted_version}")
     except Exception as e:
         click.secho(
@@ -117,3 +254,113 @@ def apply(repo_path: pathlib.Path, source_branch: str, pipeline: bool):
             fg="red",
         )
         raise click.Abort()
+
+
+def apply_package_versions(
+    repo_path: pathlib.Path,
+    packages: dict[str, str],
+    source_branch: str,
+    tag_scheme: str,
+    session: RepositorySession,
+):
+    try:
+        predicted_versions = predict_changed_packages(
+            repo_path=repo_path,
+            packages=packages,
+            source_branch=source_branch,
+            session=session,
+        )
+    except Exception as e:
+        click.secho(
+            f"Failed to apply next versions for packages in repository at {repo_path} during prediction: {e}",
+            fg="red",
+        )
+        raise click.Abort()
+
+    if not predicted_versions:
+        click.echo("No packages changed since their latest version")
+        return
+
+    try:
+        new_tags = create_package_version_tags(
+            repo_path=repo_path,
+            versions=predicted_versions,
+            scheme=tag_scheme,
+            session=session,
+        )
+        push_version_tags(repo_path=repo_path, tags=new_tags, session=session)
+    except Exception as e:
+        click.secho(
+            f"Failed to apply next versions for packages in repository at {repo_path} during tagging: {e}",
+            fg="red",
+        )
+        raise click.Abort()
+    for package, version in predicted_versions.items():
+        click.echo(f"Version of {package} is now {version}")
+
+
+@click.command(name="predict-workspace")
+@click.option(
+    "--root",
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        readable=True,
+        resolve_path=True,
+        path_type=pathlib.Path,
+    ),
+    default=".",
+    help="Workspace directory to search for repositories. Defaults to the current directory.",
+)
+@click.option(
+    "--branch-map",
+    type=click.Path(
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        path_type=pathlib.Path,
+    ),
+    help="JSON file mapping each repository's path relative to the workspace root to the source branch its version is predicted from. Repositories that aren't listed use their current branch.",
+)
+@click.option(
+    "--max-depth",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DISCOVERY_DEPTH,
+    show_default=True,
+    help="How many directories below the workspace root are searched for repositories.",
+)
+@click.option(
+    "--max-workers",
+    type=click.IntRange(min=1),
+    help="Number of repositories predicted at the same time, each in its own process. Defaults to the number of CPU cores.",
+)
+def predict_workspace(
+    root: pathlib.Path,
+    branch_map: pathlib.Path | None,
+    max_depth: int,
+    max_workers: int | None,
+):
+    """Predicts the next semantic version of every repository under a workspace directory.
+
+    Repositories are predicted in parallel. Each result is written as soon as it's ready, as one JSON object per line with the repository's path, source branch, latest and predicted versions, and the error if the prediction failed. Exits with status 1 if any prediction failed.
+    """
+    try:
+        branches = read_branch_map(branch_map) if branch_map else {}
+    except ValueError as e:
+        click.secho(f"Failed to read branch map: {e}", fg="red")
+        raise click.Abort()
+
+    repositories = discover_repositories(root=root, max_depth=max_depth)
+    failed = 0
+    for prediction in predict_workspace_versions(
+        root=root,
+        repositories=repositories,
+        branch_map=branches,
+        max_workers=max_workers,
+    ):
+        click.echo(json.dumps(dataclasses.asdict(prediction)))
+        failed += not prediction.succeeded
+    if failed:
+        sys.exit(1)
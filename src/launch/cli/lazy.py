@@ -0,0 +1,36 @@
+import importlib
+
+import click
+
+from launch.profiling import phase
+
+
+class LazyGroup(click.Group):
+    """A click Group that only imports its subcommands when they're resolved.
+
+    Subcommands are declared as a mapping of command name to an import path of the form "package.module.attribute",
+    so that heavy dependencies pulled in by a subcommand's module aren't loaded unless that subcommand is invoked.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted(super().list_commands(ctx) + list(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            return self._load_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        import_path = self.lazy_subcommands[cmd_name]
+        module_name, attribute_name = import_path.rsplit(".", 1)
+        with phase(f"import {module_name}"):
+            command = getattr(importlib.import_module(module_name), attribute_name)
+        if not isinstance(command, click.Command):
+            raise ValueError(
+                f"Lazy loading of {import_path} for command {cmd_name} did not return a click Command"
+            )
+        return command
@@ -1,4 +1,5 @@
 import os
+import pathlib
 
 
 def strtobool(value: str) -> bool:
@@ -42,5 +43,72 @@ def get_bool_env_var(env_var_name: str, default_value: bool) -> bool:
     return strtobool(os.environ.get(env_var_name, default=default_value))
 
 
+def get_int_env_var(env_var_name: str, default_value: int) -> int:
+    """Gets an integer value from an environment variable if it is set, and returns the default_value otherwise.
+
+    Args:
+        env_var_name (str): Name of the environment variable to pull from.
+        default_value (int): Replacement value if the environment variable is not set.
+
+    Raises:
+        ValueError: Raised if the value in the environment variable can't be interpreted as an integer.
+
+    Returns:
+        int: Value of the environment variable as an integer.
+    """
+    value = os.environ.get(env_var_name, default=default_value)
+    try:
+        return int(value)
+    except ValueError as e:
+        raise ValueError(
+            f"Provided value '{value}' for {env_var_name} was not valid! Must be an integer."
+        ) from e
+
+
+def cache_directory() -> pathlib.Path:
+    """Directory where the tool keeps per-user cache files. Follows the XDG Base Directory specification, so it honors
+    $XDG_CACHE_HOME and falls back to ~/.cache otherwise. The directory isn't created by this function.
+
+    Returns:
+        pathlib.Path: Path to the launch-cli cache directory.
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        base_directory = pathlib.Path(xdg_cache_home)
+    else:
+        base_directory = pathlib.Path.home().joinpath(".cache")
+    return base_directory.joinpath("launch-cli")
+
+
 UPDATE_CHECK = get_bool_env_var("LAUNCH_CLI_UPDATE_CHECK", False)
 UPDATE_ALLOW_PRERELEASE = get_bool_env_var("LAUNCH_CLI_UPDATE_ALLOW_PRERELEASE", False)
+# Seconds that a successful update check is remembered before GitHub is asked again.
+UPDATE_CHECK_TTL = get_int_env_var("LAUNCH_CLI_UPDATE_CHECK_TTL", 24 * 60 * 60)
+# Seconds that a failed update check is remembered, so that a GitHub outage doesn't slow down every command.
+UPDATE_CHECK_FAILURE_TTL = get_int_env_var(
+    "LAUNCH_CLI_UPDATE_CHECK_FAILURE_TTL", 60 * 60
+)
+# Root of the GitHub REST API. Pointed elsewhere for GitHub Enterprise Server, or for a local stand-in during load tests.
+GITHUB_API_URL = os.environ.get(
+    "LAUNCH_CLI_GITHUB_API_URL", "https://api.github.com"
+).rstrip("/")
+# Maximum number of keep-alive connections to GitHub kept open by the shared HTTP session.
+GITHUB_POOL_SIZE = get_int_env_var("LAUNCH_CLI_GITHUB_POOL_SIZE", 32)
+# Seconds to wait on GitHub before a request is abandoned.
+GITHUB_TIMEOUT = get_int_env_var("LAUNCH_CLI_GITHUB_TIMEOUT", 15)
+# Sustained number of requests per second sent to GitHub, and how many may be sent back-to-back above that rate.
+GITHUB_REQUESTS_PER_SECOND = get_int_env_var(
+    "LAUNCH_CLI_GITHUB_REQUESTS_PER_SECOND", 10
+)
+GITHUB_REQUEST_BURST = get_int_env_var("LAUNCH_CLI_GITHUB_REQUEST_BURST", 20)
+# Upper bound on concurrent requests to GitHub. Lowered automatically while GitHub reports secondary rate limits.
+GITHUB_MAX_CONCURRENCY = get_int_env_var("LAUNCH_CLI_GITHUB_MAX_CONCURRENCY", 16)
+# Minimum seconds between two content-creating requests, as GitHub asks of API clients. 0 sends them without spacing.
+GITHUB_SECONDS_BETWEEN_WRITES = get_int_env_var(
+    "LAUNCH_CLI_GITHUB_SECONDS_BETWEEN_WRITES", 1
+)
+# Number of times an idempotent request is retried after being rate limited or hitting a transient server error.
+GITHUB_MAX_RETRIES = get_int_env_var("LAUNCH_CLI_GITHUB_MAX_RETRIES", 5)
+# Whether GET requests to GitHub are cached on disk and revalidated with conditional requests, and how many responses are kept.
+GITHUB_CACHE = get_bool_env_var("LAUNCH_CLI_GITHUB_CACHE", True)
+GITHUB_CACHE_MAX_ENTRIES = get_int_env_var("LAUNCH_CLI_GITHUB_CACHE_MAX_ENTRIES", 5000)
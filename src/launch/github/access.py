@@ -1,14 +1,20 @@
+from __future__ import annotations
+
 import logging
+import threading
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Iterable
 
-import requests
-from github.Branch import Branch
-from github.Organization import Organization
-from github.Permissions import Permissions
-from github.Repository import Repository
-from github.Team import Team
+from launch.profiling import phase, profiled
 
 from .auth import github_headers
 
+if TYPE_CHECKING:
+    from github.Organization import Organization
+    from github.Permissions import Permissions
+    from github.Repository import Repository
+    from github.Team import Team
+
 logging.getLogger("github.Requester").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
@@ -18,6 +24,10 @@ class NoMatchingTeamException(Exception):
     pass
 
 
+# Slugs of the teams that are granted access to every repository
+PLATFORM_TEAM_SLUG = "platform"
+PLATFORM_ADMIN_TEAM_SLUG = "platform-administrators"
+
 # Maps repo prefixes to the slug of the team responsible for administration
 REPO_PREFIX_ADMIN_TEAM_SLUG: dict[str, str] = {
     "tf-": "terraform-administrators",
@@ -26,7 +36,97 @@ REPO_PREFIX_ADMIN_TEAM_SLUG: dict[str, str] = {
 }
 
 
-def grant_maintain(team: Team, repository: Repository, dry_run=True) -> None:
+class PermissionSnapshot:
+    """In-memory index of the permissions a set of teams hold on the organization's repositories.
+
+    Building the snapshot pages through each team's repository listing once, which costs one request per page of repositories
+    instead of one request per (team, repository) pair. The grant functions read from it when it's supplied, so they only send
+    requests for pairs that actually need an update.
+    """
+
+    def __init__(self, teams: Iterable[str] = ()):
+        self._permissions: dict[tuple[str, str], Permissions] = {}
+        self._teams = set(teams)
+        self._lock = threading.Lock()
+
+    @classmethod
+    @profiled("permission snapshot")
+    def from_teams(cls, teams: Iterable[Team]) -> PermissionSnapshot:
+        snapshot = cls()
+        for team in teams:
+            snapshot._teams.add(team.slug)
+            for repository in team.get_repos():
+                snapshot._permissions[(team.slug, repository.full_name)] = (
+                    repository.permissions
+                )
+            logger.debug(f"Indexed repository permissions for team {team.slug}")
+        return snapshot
+
+    def covers(self, team: Team) -> bool:
+        """Whether the snapshot knows about this team. Repositories missing from a covered team's listing have no access."""
+        return team.slug in self._teams
+
+    def get(self, team: Team, repository: Repository) -> Permissions | None:
+        with self._lock:
+            return self._permissions.get((team.slug, repository.full_name))
+
+    def set(self, team_slug: str, full_name: str, permissions: dict[str, bool]) -> None:
+        with self._lock:
+            self._teams.add(team_slug)
+            self._permissions[(team_slug, full_name)] = SimpleNamespace(**permissions)
+
+    def record(
+        self, team: Team, repository: Repository, permissions: dict[str, bool]
+    ) -> None:
+        """Updates the snapshot after permissions have been granted, so that it keeps matching GitHub."""
+        self.set(
+            team_slug=team.slug,
+            full_name=repository.full_name,
+            permissions=permissions,
+        )
+
+
+class ProtectionSnapshot:
+    """In-memory index of the protection on the organization's default branches, in the shape returned by
+    flatten_branch_protection().
+
+    Entries are keyed by the repository's full name and the branch they were read for, so a default branch renamed since
+    the snapshot was built isn't mistaken for the old one. Repositories without an entry have their protection read from
+    GitHub as usual.
+    """
+
+    def __init__(self):
+        self._protection: dict[tuple[str, str], dict[str, bool | int | None]] = {}
+
+    def set(
+        self,
+        full_name: str,
+        branch_name: str,
+        protection: dict[str, bool | int | None],
+    ) -> None:
+        self._protection[(full_name, branch_name)] = protection
+
+    def get(
+        self, full_name: str, branch_name: str
+    ) -> dict[str, bool | int | None] | None:
+        return self._protection.get((full_name, branch_name))
+
+
+@profiled("permission probes")
+def read_repo_permission(
+    team: Team, repository: Repository, snapshot: PermissionSnapshot | None = None
+) -> Permissions | None:
+    if snapshot is not None and snapshot.covers(team):
+        return snapshot.get(team=team, repository=repository)
+    return team.get_repo_permission(repo=repository)
+
+
+def grant_maintain(
+    team: Team,
+    repository: Repository,
+    dry_run=True,
+    snapshot: PermissionSnapshot | None = None,
+) -> None:
     expected_permissions = {
         "triage": True,
         "push": True,
@@ -35,7 +135,9 @@ def grant_maintain(team: Team, repository: Repository, dry_run=True) -> None:
         "admin": False,
     }
 
-    existing_permissions: Permissions = team.get_repo_permission(repo=repository)
+    existing_permissions = read_repo_permission(
+        team=team, repository=repository, snapshot=snapshot
+    )
 
     needs_update = False
 
@@ -55,14 +157,24 @@ def grant_maintain(team: Team, repository: Repository, dry_run=True) -> None:
             logger.info(
                 f"Granting maintain permissions to {team.slug} on {repository.url}"
             )
-            team.set_repo_permission(repo=repository, permission="maintain")
+            with phase("permission writes"):
+                team.set_repo_permission(repo=repository, permission="maintain")
+            if snapshot is not None:
+                snapshot.record(
+                    team=team, repository=repository, permissions=expected_permissions
+                )
     else:
         logger.warning(
             f"Permissions are already in place for {team.slug} on {repository.url}"
         )
 
 
-def grant_admin(team: Team, repository: Repository, dry_run=True) -> None:
+def grant_admin(
+    team: Team,
+    repository: Repository,
+    dry_run=True,
+    snapshot: PermissionSnapshot | None = None,
+) -> None:
     expected_permissions = {
         "triage": True,
         "push": True,
@@ -71,7 +183,9 @@ def grant_admin(team: Team, repository: Repository, dry_run=True) -> None:
         "admin": True,
     }
 
-    existing_permissions: Permissions = team.get_repo_permission(repo=repository)
+    existing_permissions = read_repo_permission(
+        team=team, repository=repository, snapshot=snapshot
+    )
 
     needs_update = False
 
@@ -91,88 +205,316 @@ def grant_admin(team: Team, repository: Repository, dry_run=True) -> None:
             logger.info(
                 f"Granting admin permissions to {team.slug} on {repository.url}"
             )
-            team.set_repo_permission(repo=repository, permission="admin")
+            with phase("permission writes"):
+                team.set_repo_permission(repo=repository, permission="admin")
+            if snapshot is not None:
+                snapshot.record(
+                    team=team, repository=repository, permissions=expected_permissions
+                )
     else:
         logger.warning(
             f"Permissions are already in place for {team.slug} on {repository.url}"
         )
 
 
-def configure_default_branch_protection(repository: Repository, dry_run=True) -> None:
-    default_branch: Branch = repository.get_branch(repository.default_branch)
-    if not default_branch.name == "main":
-        logger.warning(
-            f"Repository at {repository.url} uses default branch {default_branch.name}, should be main!"
+# Protection we expect on every repository's default branch. Review settings are nested under required_pull_request_reviews
+# in GitHub's API, everything else is a top-level setting.
+DEFAULT_BRANCH_PROTECTION: dict[str, bool | int] = {
+    "enforce_admins": False,
+    "dismiss_stale_reviews": False,
+    "require_code_owner_reviews": True,
+    "required_approving_review_count": 2,
+    "require_last_push_approval": True,
+    "required_linear_history": True,
+    "allow_force_pushes": False,
+    "block_creations": True,
+    "required_conversation_resolution": False,
+    "lock_branch": False,
+    "allow_fork_syncing": True,
+}
+REVIEW_PROTECTION_FIELDS = frozenset(
+    [
+        "dismiss_stale_reviews",
+        "require_code_owner_reviews",
+        "required_approving_review_count",
+        "require_last_push_approval",
+    ]
+)
+
+
+def branch_protection_path(repository: Repository, branch_name: str) -> str:
+    from urllib.parse import quote
+
+    return f"/repos/{repository.full_name}/branches/{quote(branch_name, safe='')}/protection"
+
+
+@profiled("protection reads")
+def read_branch_protection(repository: Repository, branch_name: str) -> dict | None:
+    """Reads a branch's protection as GitHub's REST API reports it.
+
+    Args:
+        repository (Repository): GitHub Repository
+        branch_name (str): Name of the protected branch.
+
+    Raises:
+        RuntimeError: Raised if the protection couldn't be read.
+
+    Returns:
+        dict | None: The protection, or None if the branch isn't protected.
+    """
+    from .client import github_request
+
+    path = branch_protection_path(repository=repository, branch_name=branch_name)
+    response = github_request(method="GET", path=path, headers=github_headers())
+    if response.status_code == 404:
+        return None
+    if not response.ok:
+        raise RuntimeError(
+            f"Failed to read branch protection from {path}: Status Code: {response.status_code} Body: {response.text}"
         )
+    return response.json()
+
 
-    default_protections = {
-        "enforce_admins": False,
-        "dismiss_stale_reviews": False,
-        "require_code_owner_reviews": True,
-        "required_approving_review_count": 2,
-        "required_linear_history": True,
-        "allow_force_pushes": False,
-        "block_creations": True,
-        "required_conversation_resolution": False,
-        "lock_branch": False,
-        "allow_fork_syncing": True,
+def flatten_branch_protection(protection: dict | None) -> dict[str, bool | int | None]:
+    """Picks the fields of DEFAULT_BRANCH_PROTECTION out of a protection returned by read_branch_protection(). Fields that
+    aren't set on the branch are None."""
+    protection = protection or {}
+    reviews = protection.get("required_pull_request_reviews") or {}
+    flattened = {}
+    for name in DEFAULT_BRANCH_PROTECTION:
+        if name in REVIEW_PROTECTION_FIELDS:
+            flattened[name] = reviews.get(name)
+        else:
+            flattened[name] = (protection.get(name) or {}).get("enabled")
+    return flattened
+
+
+def diff_branch_protection(
+    protection: dict | None,
+) -> dict[str, tuple[bool | int | None, bool | int]]:
+    """Compares a branch's protection with DEFAULT_BRANCH_PROTECTION.
+
+    Args:
+        protection (dict | None): Protection returned by read_branch_protection().
+
+    Returns:
+        dict[str, tuple[bool | int | None, bool | int]]: Current and expected values of every field that doesn't match.
+    """
+    return diff_protection_fields(flatten_branch_protection(protection))
+
+
+def diff_protection_fields(
+    current: dict[str, bool | int | None],
+) -> dict[str, tuple[bool | int | None, bool | int]]:
+    """Compares protection fields, in the shape returned by flatten_branch_protection(), with DEFAULT_BRANCH_PROTECTION."""
+    return {
+        name: (current[name], expected)
+        for name, expected in DEFAULT_BRANCH_PROTECTION.items()
+        if current[name] != expected
     }
 
-    if dry_run:
-        logger.info(
-            f"Would have applied default branch protection to {default_branch.name} for repo {repository.url}"
-        )
-    else:
-        logger.info(
-            f"Applying default branch protection to {default_branch.name} for repo {repository.url}"
-        )
-        default_branch.edit_protection(**default_protections)
-        default_branch.edit_required_pull_request_reviews(
-            require_code_owner_reviews=True, required_approving_review_count=2
-        )
-        set_require_approval_of_most_recent_reviewable_push(
-            organization=repository.organization,
-            repository=repository,
-            branch=default_branch,
+
+def actor_names(actors: dict | None) -> dict[str, list[str]] | None:
+    """Turns the users, teams and apps GitHub reports on a protection into the login and slug lists a protection PUT
+    takes."""
+    if not actors:
+        return None
+    return {
+        "users": [user["login"] for user in actors.get("users", [])],
+        "teams": [team["slug"] for team in actors.get("teams", [])],
+        "apps": [app["slug"] for app in actors.get("apps", [])],
+    }
+
+
+def build_branch_protection_payload(protection: dict | None) -> dict:
+    """Builds the body of a single protection PUT that applies DEFAULT_BRANCH_PROTECTION. The PUT replaces the whole
+    protection, so required status checks, push restrictions, review dismissal restrictions and pull request bypass
+    allowances already on the branch are carried over.
+    """
+    protection = protection or {}
+    status_checks = protection.get("required_status_checks")
+    if status_checks:
+        status_checks = {
+            "strict": status_checks.get("strict", False),
+            "checks": [
+                {"context": check["context"], "app_id": check.get("app_id")}
+                for check in status_checks.get("checks", [])
+            ],
+        }
+    reviews = protection.get("required_pull_request_reviews") or {}
+
+    payload = {
+        "required_status_checks": status_checks or None,
+        "restrictions": actor_names(protection.get("restrictions")),
+        "required_pull_request_reviews": {},
+    }
+    for name in ("dismissal_restrictions", "bypass_pull_request_allowances"):
+        actors = actor_names(reviews.get(name))
+        if actors:
+            payload["required_pull_request_reviews"][name] = actors
+    for name, value in DEFAULT_BRANCH_PROTECTION.items():
+        if name in REVIEW_PROTECTION_FIELDS:
+            payload["required_pull_request_reviews"][name] = value
+        else:
+            payload[name] = value
+    return payload
+
+
+@profiled("protection writes")
+def write_branch_protection(
+    repository: Repository, branch_name: str, payload: dict
+) -> None:
+    """Replaces a branch's protection with a single PUT.
+
+    Raises:
+        RuntimeError: Raised if GitHub rejected the protection.
+    """
+    from .client import github_request
+
+    path = branch_protection_path(repository=repository, branch_name=branch_name)
+    response = github_request(
+        method="PUT", path=path, json=payload, headers=github_headers()
+    )
+    if not response.ok:
+        raise RuntimeError(
+            f"Failed to apply branch protection to {path}: Status Code: {response.status_code} Body: {response.text}"
         )
 
 
-def set_require_approval_of_most_recent_reviewable_push(
-    organization: Organization, repository: Repository, branch: Branch
+def configure_default_branch_protection(
+    repository: Repository,
+    dry_run=True,
+    protection_snapshot: ProtectionSnapshot | None = None,
 ) -> None:
-    """Hack to work around the fact that PyGithub doesn't support setting this configuration natively.
+    """Applies DEFAULT_BRANCH_PROTECTION to the repository's default branch. The current protection is read first, and
+    nothing is written if it already matches.
 
     Args:
-        organization (Organization): GitHub Organization
         repository (Repository): GitHub Repository
-        branch (Branch): Repository Branch
-
-    Raises:
-        RuntimeError: Raised if there was an issue setting this configuration
+        dry_run (bool, optional): Report the fields that would change without changing anything. Defaults to True.
+        protection_snapshot (ProtectionSnapshot | None, optional): Protection already read for the organization's default
+            branches. When it covers this repository's default branch, the REST protection is only read before a write, to
+            carry over its status checks and push restrictions. Defaults to None.
     """
-    url = f"https://api.github.com/repos/{organization.login}/{repository.name}/branches/{branch.name}/protection/required_pull_request_reviews"
-    payload = {"require_last_push_approval": True}
-    try:
-        response = requests.patch(url=url, json=payload, headers=github_headers())
-        if not response.ok:
-            raise RuntimeError(
-                f"Failed to set_require_approval_of_most_recent_reviewable_push to {url}: Status Code: {response.status_code} Body: {response.text}"
+    branch_name = repository.default_branch
+    if not branch_name == "main":
+        logger.warning(
+            f"Repository at {repository.url} uses default branch {branch_name}, should be main!"
+        )
+
+    current = None
+    if protection_snapshot is not None:
+        current = protection_snapshot.get(
+            full_name=repository.full_name, branch_name=branch_name
+        )
+    protection_read = current is None
+    protection = None
+    if protection_read:
+        protection = read_branch_protection(
+            repository=repository, branch_name=branch_name
+        )
+        current = flatten_branch_protection(protection)
+    differences = diff_protection_fields(current)
+    if not differences:
+        logger.warning(
+            f"Branch protection is already in place for {branch_name} on {repository.url}"
+        )
+        return
+
+    changes = ", ".join(
+        f"{name}: {current} -> {expected}"
+        for name, (current, expected) in differences.items()
+    )
+    if dry_run:
+        logger.info(
+            f"Would have applied default branch protection to {branch_name} for repo {repository.url}: {changes}"
+        )
+    else:
+        logger.info(
+            f"Applying default branch protection to {branch_name} for repo {repository.url}: {changes}"
+        )
+        if not protection_read:
+            protection = read_branch_protection(
+                repository=repository, branch_name=branch_name
             )
-    except RuntimeError as re:
-        raise re
-    except Exception as e:
-        raise RuntimeError(
-            f"Failed to set_require_approval_of_most_recent_reviewable_push to {url}"
-        ) from e
+        write_branch_protection(
+            repository=repository,
+            branch_name=branch_name,
+            payload=build_branch_protection_payload(protection),
+        )
 
 
 def select_administrative_team(
-    repository: Repository, organization: Organization
+    repository: Repository,
+    organization: Organization,
+    teams: dict[str, Team] | None = None,
 ) -> Team:
     for name_prefix, team_slug in REPO_PREFIX_ADMIN_TEAM_SLUG.items():
         if repository.name.startswith(name_prefix):
+            if teams is not None and team_slug in teams:
+                return teams[team_slug]
             return organization.get_team_by_slug(team_slug)
     else:
         raise NoMatchingTeamException(
             f"Repository {repository.name} not matched for any known administrative team."
         )
+
+
+@profiled("team lookups")
+def resolve_teams(organization: Organization, slugs: list[str]) -> dict[str, Team]:
+    """Looks up each team once, so that bulk operations don't repeat the same lookups for every repository.
+
+    Args:
+        organization (Organization): GitHub Organization
+        slugs (list[str]): Slugs of the teams to look up. Duplicates are only looked up once.
+
+    Returns:
+        dict[str, Team]: Teams keyed by slug.
+    """
+    return {slug: organization.get_team_by_slug(slug) for slug in dict.fromkeys(slugs)}
+
+
+@profiled("apply default access")
+def apply_default_access(
+    repository: Repository,
+    platform_team: Team,
+    platform_admin_team: Team,
+    specific_admin_team: Team | None,
+    dry_run: bool = True,
+    snapshot: PermissionSnapshot | None = None,
+    protection_snapshot: ProtectionSnapshot | None = None,
+) -> None:
+    """Applies our default team access and branch protections to a single repository.
+
+    Args:
+        repository (Repository): GitHub Repository
+        platform_team (Team): Team granted maintain permissions.
+        platform_admin_team (Team): Team granted admin permissions.
+        specific_admin_team (Team | None): Domain-specific team granted admin permissions, if one applies to this repository.
+        dry_run (bool, optional): Report what would be changed without changing anything. Defaults to True.
+        snapshot (PermissionSnapshot | None, optional): Existing permissions to check against, instead of asking GitHub for
+            each team. Defaults to None.
+        protection_snapshot (ProtectionSnapshot | None, optional): Existing default branch protection to check against,
+            instead of reading it from GitHub. Defaults to None.
+    """
+    grant_maintain(
+        team=platform_team, repository=repository, dry_run=dry_run, snapshot=snapshot
+    )
+    grant_admin(
+        team=platform_admin_team,
+        repository=repository,
+        dry_run=dry_run,
+        snapshot=snapshot,
+    )
+    if specific_admin_team:
+        grant_admin(
+            team=specific_admin_team,
+            repository=repository,
+            dry_run=dry_run,
+            snapshot=snapshot,
+        )
+    configure_default_branch_protection(
+        repository=repository,
+        dry_run=dry_run,
+        protection_snapshot=protection_snapshot,
+    )
@@ -1,8 +1,19 @@
+from __future__ import annotations
+
 import logging
 import os
 from functools import cache
+from typing import TYPE_CHECKING
+
+from launch.env import (
+    GITHUB_API_URL,
+    GITHUB_POOL_SIZE,
+    GITHUB_SECONDS_BETWEEN_WRITES,
+    GITHUB_TIMEOUT,
+)
 
-from github import Auth, Consts, Github
+if TYPE_CHECKING:
+    from github import Github
 
 logger = logging.getLogger(__name__)
 
@@ -22,17 +33,59 @@ def github_headers() -> dict[str, str]:
     return {"Authorization": f"Bearer {read_github_token()}"}
 
 
-def get_github_instance(token: str | None = None, timeout: int | None = None) -> Github:
+@cache
+def shared_github_instance(token: str | None, timeout: int, per_page: int) -> Github:
+    """One Github instance per distinct configuration for the whole process, all of them sending their requests over the
+    pooled session from launch.github.client.
+
+    Args:
+        token (str | None): Token to authenticate with, or None for anonymous access.
+        timeout (int): Seconds to wait on GitHub before a request is abandoned.
+        per_page (int): Page size for paginated listings.
+
+    Returns:
+        Github: The shared Github instance for this configuration.
+    """
+    from github import Auth, Github
+
+    from .client import install_shared_session
+
+    install_shared_session()
+    return Github(
+        base_url=GITHUB_API_URL,
+        auth=Auth.Token(token) if token else None,
+        timeout=timeout,
+        per_page=per_page,
+        pool_size=GITHUB_POOL_SIZE,
+        # Requests are paced by launch.github.ratelimit, PyGithub's own spacing would serialize concurrent callers. The spacing
+        # between writes is kept, since GitHub asks for at least a second between content-creating requests.
+        seconds_between_requests=None,
+        seconds_between_writes=GITHUB_SECONDS_BETWEEN_WRITES or None,
+    )
+
+
+def get_github_instance(
+    token: str | None = None, timeout: int | None = None, per_page: int | None = None
+) -> Github:
+    from github import Consts
+
     if timeout is None:
-        timeout = Consts.DEFAULT_TIMEOUT
+        timeout = GITHUB_TIMEOUT
+    if per_page is None:
+        per_page = Consts.DEFAULT_PER_PAGE
     if not token:
         logger.debug("Token wasn't passed, reading from environment.")
         token = read_github_token()
-    auth = Auth.Token(token)
-    return Github(auth=auth, timeout=timeout)
+    return shared_github_instance(token=token, timeout=timeout, per_page=per_page)
+
 
+def get_anonymous_github_instance(
+    timeout: int | None = None, per_page: int | None = None
+) -> Github:
+    from github import Consts
 
-def get_anonymous_github_instance(timeout: int | None = None) -> Github:
     if timeout is None:
-        timeout = Consts.DEFAULT_TIMEOUT
-    return Github(auth=None, timeout=timeout)
+        timeout = GITHUB_TIMEOUT
+    if per_page is None:
+        per_page = Consts.DEFAULT_PER_PAGE
+    return shared_github_instance(token=None, timeout=timeout, per_page=per_page)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import fnmatch
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from launch.profiling import profiled
+
+from .auth import github_headers
+from .ratelimit import RateLimitBudgetExhausted, get_rate_limit_scheduler
+
+if TYPE_CHECKING:
+    from github.Repository import Repository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class BulkResult:
+    repository_name: str
+    succeeded: bool
+    error: str | None = None
+
+
+def filter_repositories(
+    repositories: Iterable[Repository],
+    names: list[str] | None = None,
+    prefix: str | None = None,
+    name_pattern: str | None = None,
+    include_archived: bool = False,
+) -> list[Repository]:
+    """Narrows a listing of repositories down to the ones a bulk operation should act on. All supplied criteria must match.
+
+    Args:
+        repositories (Iterable[Repository]): Repositories to choose from, typically every repository in an organization.
+        names (list[str] | None, optional): Exact repository names to keep. Defaults to None, which keeps any name.
+        prefix (str | None, optional): Keep only repositories whose names start with this prefix. Defaults to None.
+        name_pattern (str | None, optional): Keep only repositories whose names match this shell-style glob. Defaults to None.
+        include_archived (bool, optional): Keep archived repositories, which can't be modified. Defaults to False.
+
+    Returns:
+        list[Repository]: Matching repositories, in the order they were listed.
+    """
+    wanted_names = set(names) if names is not None else None
+    selected = []
+    for repository in repositories:
+        if wanted_names is not None and repository.name not in wanted_names:
+            continue
+        if prefix and not repository.name.startswith(prefix):
+            continue
+        if name_pattern and not fnmatch.fnmatchcase(repository.name, name_pattern):
+            continue
+        if repository.archived and not include_archived:
+            logger.debug(f"Skipping archived repository {repository.name}")
+            continue
+        selected.append(repository)
+    logger.debug(f"Selected {len(selected)} repositories")
+    return selected
+
+
+@profiled("bulk run")
+def run_bulk(
+    repositories: list[Repository],
+    action: Callable[[Repository], None],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limit_reserve: int = 0,
+) -> list[BulkResult]:
+    """Runs an action against many repositories on a bounded pool of worker threads. A failure on one repository is recorded
+    in its result and doesn't stop the others.
+
+    Args:
+        repositories (list[Repository]): Repositories to act on.
+        action (Callable[[Repository], None]): Called once per repository, raises to signal failure.
+        max_workers (int, optional): Maximum number of repositories processed at the same time. Defaults to DEFAULT_MAX_WORKERS.
+        rate_limit_reserve (int, optional): Repositories that haven't been started yet are skipped, and recorded as failures,
+            once fewer than this many requests remain in the GITHUB_TOKEN's core rate limit. Defaults to 0, which never skips.
+
+    Returns:
+        list[BulkResult]: One result per repository, in the same order as `repositories`.
+    """
+    scheduler = get_rate_limit_scheduler()
+    authorization = github_headers()["Authorization"] if rate_limit_reserve else None
+
+    def run_action(repository: Repository) -> None:
+        if rate_limit_reserve and not scheduler.has_budget(
+            rate_limit_reserve, authorization=authorization
+        ):
+            raise RateLimitBudgetExhausted(
+                f"Skipped, fewer than {rate_limit_reserve} GitHub API requests remain before the rate limit resets"
+            )
+        action(repository)
+
+    results: dict[str, BulkResult] = {}
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="launch-bulk"
+    ) as executor:
+        futures = {
+            executor.submit(run_action, repository): repository.name
+            for repository in repositories
+        }
+        for future in as_completed(futures):
+            repository_name = futures[future]
+            try:
+                future.result()
+                results[repository_name] = BulkResult(
+                    repository_name=repository_name, succeeded=True
+                )
+            except Exception as e:
+                logger.error(f"Failed to process {repository_name}: {e}")
+                results[repository_name] = BulkResult(
+                    repository_name=repository_name, succeeded=False, error=str(e)
+                )
+    return [results[repository.name] for repository in repositories]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pathlib
+import threading
+import time
+from dataclasses import dataclass
+from functools import cache
+
+from launch.env import GITHUB_CACHE, GITHUB_CACHE_MAX_ENTRIES, cache_directory
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_FILE_NAME = "github-responses.sqlite3"
+# Headers describing how the body was transferred. Cached bodies are stored decoded, so these no longer apply to them.
+TRANSFER_HEADERS = frozenset(
+    ["content-encoding", "content-length", "transfer-encoding"]
+)
+
+_enabled = GITHUB_CACHE
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: str | None
+    last_modified: str | None
+    headers: dict[str, str]
+    body: bytes
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that turn a GET into a conditional request, which GitHub answers with 304 Not Modified when nothing
+        changed. Those responses don't count against the rate limit."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Persistent cache of GitHub GET responses carrying an ETag or Last-Modified header, evicting the least recently used
+    responses once it holds more than `max_entries`. Safe to share between threads, and between processes through SQLite's
+    own locking."""
+
+    def __init__(self, path: pathlib.Path, max_entries: int = GITHUB_CACHE_MAX_ENTRIES):
+        import sqlite3
+
+        self.path = path
+        self.max_entries = max_entries
+        # Cached bodies can include private repository data, so only the current user may read them.
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=5, check_same_thread=False, isolation_level=None
+        )
+        path.chmod(0o600)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "headers TEXT NOT NULL, body BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+
+    @staticmethod
+    def cache_key(url: str, authorization: str | None, accept: str | None) -> str:
+        """Responses are only shared between requests for the same URL, made as the same identity and asking for the same
+        representation. The credential itself is never stored, only a hash of it."""
+        identity = hashlib.sha256((authorization or "").encode()).hexdigest()
+        return hashlib.sha256(f"{url}\0{identity}\0{accept or ''}".encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, etag, last_modified, headers, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        url, etag, last_modified, headers, body = row
+        return CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            headers=json.loads(headers),
+            body=body,
+        )
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in TRANSFER_HEADERS
+        }
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    response.etag,
+                    response.last_modified,
+                    json.dumps(headers),
+                    response.body,
+                    time.time(),
+                ),
+            )
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+
+@cache
+def open_response_cache(path: pathlib.Path) -> ResponseCache | None:
+    try:
+        return ResponseCache(path=path)
+    except Exception as e:
+        # A cache we can't open only costs us rate limit, it shouldn't stop the command.
+        logger.debug(f"Not caching GitHub responses, failed to open {path}: {e}")
+        return None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """The response cache in the user's cache directory, or None if caching is turned off or the cache can't be opened."""
+    if not _enabled:
+        return None
+    return open_response_cache(cache_directory().joinpath(RESPONSE_CACHE_FILE_NAME))
+
+
+def set_response_cache_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
@@ -0,0 +1,255 @@
+import logging
+import threading
+import time
+from functools import cache
+from typing import Any
+
+import requests
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+from launch.env import GITHUB_API_URL, GITHUB_POOL_SIZE, GITHUB_TIMEOUT
+from launch.profiling import get_profiler, phase
+
+from .cache import (
+    TRANSFER_HEADERS,
+    CachedResponse,
+    ResponseCache,
+    get_response_cache,
+)
+from .ratelimit import RateLimitScheduler, get_rate_limit_scheduler, request_resource
+
+logger = logging.getLogger(__name__)
+
+_install_lock = threading.Lock()
+_installed = False
+
+
+class GitHubAdapter(HTTPAdapter):
+    """Transport adapter that sends every request through a RateLimitScheduler, which paces requests and retries the
+    idempotent ones that were rate limited or hit a transient server error.
+
+    GET requests are also revalidated against the response cache from launch.github.cache: a response GitHub has sent before
+    is requested conditionally, and a 304 Not Modified answer is handed back to the caller as the cached response.
+    """
+
+    def __init__(self, scheduler: RateLimitScheduler | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler or get_rate_limit_scheduler()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        response_cache = None
+        if (
+            request.method == "GET"
+            and not kwargs.get("stream")
+            # Callers making their own conditional requests expect to see the 304.
+            and "If-None-Match" not in request.headers
+            and "If-Modified-Since" not in request.headers
+        ):
+            response_cache = get_response_cache()
+        if response_cache is None:
+            return self.send_with_retries(request, **kwargs)
+
+        key = ResponseCache.cache_key(
+            url=request.url,
+            authorization=request.headers.get("Authorization"),
+            accept=request.headers.get("Accept"),
+        )
+        cached = response_cache.get(key)
+        if cached is not None:
+            request.headers.update(cached.conditional_headers())
+
+        response = self.send_with_retries(request, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Using cached response for {request.url}")
+            return self.build_cached_response(request, response, cached)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            response_cache.put(
+                key,
+                CachedResponse(
+                    url=request.url,
+                    etag=etag,
+                    last_modified=last_modified,
+                    headers=dict(response.headers),
+                    body=response.content,
+                ),
+            )
+        return response
+
+    def build_cached_response(
+        self,
+        request: requests.PreparedRequest,
+        not_modified: requests.Response,
+        cached: CachedResponse,
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(cached.headers)
+        # The 304 carries the current rate limit and caching headers.
+        response.headers.update(
+            {
+                name: value
+                for name, value in not_modified.headers.items()
+                if name.lower() not in TRANSFER_HEADERS
+            }
+        )
+        response._content = cached.body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        not_modified.close()
+        return response
+
+    def send_with_retries(
+        self, request: requests.PreparedRequest, **kwargs
+    ) -> requests.Response:
+        attempt = 0
+        authorization = request.headers.get("Authorization")
+        resource = request_resource(request.url)
+        while True:
+            with phase("rate limiter wait"):
+                self.scheduler.acquire(authorization=authorization, resource=resource)
+            start = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            finally:
+                self.scheduler.release()
+            profiler = get_profiler()
+            if profiler is not None:
+                profiler.record_http(
+                    method=request.method,
+                    url=request.url,
+                    status_code=response.status_code,
+                    start=start,
+                    end=time.perf_counter(),
+                    headers=response.headers,
+                )
+            body = response.text if response.status_code in (403, 429) else ""
+            self.scheduler.record_response(
+                response.status_code,
+                response.headers,
+                body,
+                authorization=authorization,
+            )
+            delay = self.scheduler.retry_delay(
+                method=request.method,
+                status_code=response.status_code,
+                headers=response.headers,
+                body=body,
+                attempt=attempt,
+            )
+            if delay is None:
+                return response
+            logger.info(
+                f"Retrying {request.method} {request.url} in {delay:.1f}s after status {response.status_code}"
+            )
+            response.close()
+            self.scheduler.wait(delay)
+            attempt += 1
+
+
+@cache
+def get_http_session() -> requests.Session:
+    """Process-wide HTTP session used for every request to GitHub, whether it's made by PyGithub or by our own REST helpers.
+    The session keeps up to GITHUB_POOL_SIZE keep-alive connections open, so repeated calls don't pay for a new TCP and TLS
+    handshake each time.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = requests.Session()
+    # Having Session.auth set to something other than None disables the fallback to ~/.netrc, our requests always carry their
+    # own Authorization header. This mirrors what PyGithub does for its own sessions.
+    session.auth = Requester.noopAuth
+    adapter = GitHubAdapter(
+        # Rate limits and server errors are retried by the adapter's scheduler, urllib3 only retries failed connections.
+        max_retries=Retry(total=None, connect=3, read=0, redirect=0, status=0, other=0),
+        pool_connections=GITHUB_POOL_SIZE,
+        pool_maxsize=GITHUB_POOL_SIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    logger.debug(f"Created shared GitHub HTTP session with {GITHUB_POOL_SIZE=}")
+    return session
+
+
+class SharedSessionConnectionMixin:
+    """Replaces the per-instance session that PyGithub's connection classes create with the shared session."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None = None,
+        strict: bool = False,
+        timeout: int | None = None,
+        retry: Any = None,
+        pool_size: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.port = port if port else self.default_port
+        self.host = host
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.retry = retry
+        self.pool_size = pool_size
+        self.session = get_http_session()
+
+    def close(self) -> None:
+        # The shared session outlives any single connection, PyGithub closes connections whenever it replaces them.
+        pass
+
+
+class SharedSessionHTTPSConnection(
+    SharedSessionConnectionMixin, HTTPSRequestsConnectionClass
+):
+    protocol = "https"
+    default_port = 443
+
+
+class SharedSessionHTTPConnection(
+    SharedSessionConnectionMixin, HTTPRequestsConnectionClass
+):
+    protocol = "http"
+    default_port = 80
+
+
+def install_shared_session() -> None:
+    """Points PyGithub at the shared session. Safe to call more than once, only the first call has any effect."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        Requester.injectConnectionClasses(
+            SharedSessionHTTPConnection, SharedSessionHTTPSConnection
+        )
+        _installed = True
+
+
+def github_request(
+    method: str, path: str, headers: dict[str, str], **kwargs
+) -> requests.Response:
+    """Sends a request to the GitHub REST API over the shared session.
+
+    Args:
+        method (str): HTTP method, such as GET or PATCH.
+        path (str): Path of the endpoint, relative to GITHUB_API_URL. Absolute URLs are used as-is.
+        headers (dict[str, str]): Request headers, typically from launch.github.auth.github_headers().
+        **kwargs: Passed through to requests.Session.request.
+
+    Returns:
+        requests.Response: The response, regardless of its status code.
+    """
+    url = path if path.startswith("http") else f"{GITHUB_API_URL}{path}"
+    kwargs.setdefault("timeout", GITHUB_TIMEOUT)
+    return get_http_session().request(method=method, url=url, headers=headers, **kwargs)
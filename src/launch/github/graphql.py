@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any, Iterator
+
+from .access import (
+    DEFAULT_BRANCH_PROTECTION,
+    REVIEW_PROTECTION_FIELDS,
+    PermissionSnapshot,
+    ProtectionSnapshot,
+)
+from .auth import github_headers
+
+logger = logging.getLogger(__name__)
+
+GRAPHQL_PAGE_SIZE = 100
+# Branch protection rules are fetched alongside each repository. Repositories rarely carry more than a handful of them.
+BRANCH_PROTECTION_RULE_LIMIT = 10
+
+# Permissions implied by each of GitHub's GraphQL RepositoryPermission values, in the same shape as the REST API's
+# `permissions` object.
+REPOSITORY_PERMISSIONS: dict[str, dict[str, bool]] = {
+    "READ": {
+        "pull": True,
+        "triage": False,
+        "push": False,
+        "maintain": False,
+        "admin": False,
+    },
+    "TRIAGE": {
+        "pull": True,
+        "triage": True,
+        "push": False,
+        "maintain": False,
+        "admin": False,
+    },
+    "WRITE": {
+        "pull": True,
+        "triage": True,
+        "push": True,
+        "maintain": False,
+        "admin": False,
+    },
+    "MAINTAIN": {
+        "pull": True,
+        "triage": True,
+        "push": True,
+        "maintain": True,
+        "admin": False,
+    },
+    "ADMIN": {
+        "pull": True,
+        "triage": True,
+        "push": True,
+        "maintain": True,
+        "admin": True,
+    },
+}
+
+REPOSITORIES_QUERY = """
+query($organization: String!, $pageSize: Int!, $ruleLimit: Int!, $cursor: String) {
+  organization(login: $organization) {
+    repositories(first: $pageSize, after: $cursor, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        isArchived
+        defaultBranchRef { name }
+        branchProtectionRules(first: $ruleLimit) {
+          pageInfo { hasNextPage }
+          nodes {
+            pattern
+            isAdminEnforced
+            requiresApprovingReviews
+            requiredApprovingReviewCount
+            requiresCodeOwnerReviews
+            dismissesStaleReviews
+            requireLastPushApproval
+            requiresLinearHistory
+            allowsForcePushes
+            blocksCreations
+            requiresConversationResolution
+            lockBranch
+            lockAllowsFetchAndMerge
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+TEAM_REPOSITORIES_QUERY = """
+query($organization: String!, $team: String!, $pageSize: Int!, $cursor: String) {
+  organization(login: $organization) {
+    team(slug: $team) {
+      repositories(first: $pageSize, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        edges {
+          permission
+          node { nameWithOwner }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class GraphQLException(Exception):
+    pass
+
+
+def branch_pattern_matches(pattern: str, branch_name: str) -> bool:
+    """Whether a branch protection rule's pattern covers a branch. GitHub matches patterns with fnmatch and
+    File::FNM_PATHNAME, so wildcards don't match across a /."""
+    pattern_parts = pattern.split("/")
+    branch_parts = branch_name.split("/")
+    return len(pattern_parts) == len(branch_parts) and all(
+        fnmatchcase(branch_part, pattern_part)
+        for branch_part, pattern_part in zip(branch_parts, pattern_parts)
+    )
+
+
+@dataclass
+class BranchProtectionRule:
+    pattern: str
+    enforce_admins: bool
+    requires_approving_reviews: bool
+    required_approving_review_count: int | None
+    require_code_owner_reviews: bool
+    dismiss_stale_reviews: bool
+    require_last_push_approval: bool
+    required_linear_history: bool
+    allow_force_pushes: bool
+    block_creations: bool
+    required_conversation_resolution: bool
+    lock_branch: bool
+    allow_fork_syncing: bool
+
+    @classmethod
+    def from_node(cls, node: dict[str, Any]) -> BranchProtectionRule:
+        return cls(
+            pattern=node["pattern"],
+            enforce_admins=node["isAdminEnforced"],
+            requires_approving_reviews=node["requiresApprovingReviews"],
+            required_approving_review_count=node["requiredApprovingReviewCount"],
+            require_code_owner_reviews=node["requiresCodeOwnerReviews"],
+            dismiss_stale_reviews=node["dismissesStaleReviews"],
+            require_last_push_approval=node["requireLastPushApproval"],
+            required_linear_history=node["requiresLinearHistory"],
+            allow_force_pushes=node["allowsForcePushes"],
+            block_creations=node["blocksCreations"],
+            required_conversation_resolution=node["requiresConversationResolution"],
+            lock_branch=node["lockBranch"],
+            allow_fork_syncing=node["lockAllowsFetchAndMerge"],
+        )
+
+    def flatten(self) -> dict[str, bool | int | None]:
+        """The rule's fields of DEFAULT_BRANCH_PROTECTION, in the shape access.flatten_branch_protection() returns for the
+        REST protection. As there, review fields are None unless the rule requires pull request reviews.
+        """
+        return {
+            name: (
+                None
+                if name in REVIEW_PROTECTION_FIELDS
+                and not self.requires_approving_reviews
+                else getattr(self, name)
+            )
+            for name in DEFAULT_BRANCH_PROTECTION
+        }
+
+
+@dataclass
+class RepositoryState:
+    name: str
+    full_name: str
+    archived: bool
+    default_branch: str | None
+    branch_protection_rules: list[BranchProtectionRule] = field(default_factory=list)
+    # False when the repository has more than BRANCH_PROTECTION_RULE_LIMIT rules, so some of them weren't read.
+    branch_protection_rules_complete: bool = True
+
+    @property
+    def default_branch_rules(self) -> list[BranchProtectionRule]:
+        """The protection rules whose patterns cover the default branch."""
+        if self.default_branch is None:
+            return []
+        return [
+            rule
+            for rule in self.branch_protection_rules
+            if branch_pattern_matches(rule.pattern, self.default_branch)
+        ]
+
+    @property
+    def default_branch_protection(self) -> BranchProtectionRule | None:
+        """The protection rule GitHub applies to the default branch. As on GitHub, a rule for the branch's exact name takes
+        priority over wildcard rules. When several wildcard rules match GitHub applies the oldest, which the API doesn't
+        say, so None is returned."""
+        rules = self.default_branch_rules
+        for rule in rules:
+            if rule.pattern == self.default_branch:
+                return rule
+        if len(rules) == 1:
+            return rules[0]
+        return None
+
+    @classmethod
+    def from_node(cls, node: dict[str, Any]) -> RepositoryState:
+        default_branch_ref = node.get("defaultBranchRef")
+        rules = node.get("branchProtectionRules") or {"nodes": []}
+        rules_page_info = rules.get("pageInfo") or {}
+        return cls(
+            name=node["name"],
+            full_name=node["nameWithOwner"],
+            archived=node["isArchived"],
+            default_branch=default_branch_ref["name"] if default_branch_ref else None,
+            branch_protection_rules=[
+                BranchProtectionRule.from_node(rule) for rule in rules["nodes"]
+            ],
+            branch_protection_rules_complete=not rules_page_info.get("hasNextPage"),
+        )
+
+
+def graphql_query(query: str, variables: dict[str, Any]) -> dict[str, Any]:
+    """Sends a query to the GitHub GraphQL API over the shared session.
+
+    Args:
+        query (str): GraphQL query document.
+        variables (dict[str, Any]): Values for the query's variables.
+
+    Raises:
+        GraphQLException: Raised if the request failed, or if GitHub reported errors for the query.
+
+    Returns:
+        dict[str, Any]: The `data` member of the response.
+    """
+    from .client import github_request
+
+    response = github_request(
+        method="POST",
+        path="/graphql",
+        headers=github_headers(),
+        json={"query": query, "variables": variables},
+    )
+    if not response.ok:
+        raise GraphQLException(
+            f"GraphQL query failed: Status Code: {response.status_code} Body: {response.text}"
+        )
+    body = response.json()
+    if body.get("errors"):
+        messages = "; ".join(error.get("message", "") for error in body["errors"])
+        raise GraphQLException(f"GraphQL query failed: {messages}")
+    return body["data"]
+
+
+def paginate(
+    query: str, variables: dict[str, Any], path: list[str]
+) -> Iterator[dict[str, Any]]:
+    """Follows a connection's cursor until its last page, yielding each page.
+
+    Args:
+        query (str): GraphQL query document, taking a `$cursor: String` variable for the connection.
+        variables (dict[str, Any]): Values for the query's other variables.
+        path (list[str]): Keys leading from the response's `data` to the paginated connection.
+
+    Raises:
+        GraphQLException: Raised if an object along `path` doesn't exist, such as an unknown organization or team.
+    """
+    cursor = None
+    while True:
+        connection = graphql_query(
+            query=query, variables={**variables, "cursor": cursor}
+        )
+        for key in path:
+            if connection is None:
+                break
+            connection = connection.get(key)
+        if connection is None:
+            raise GraphQLException(
+                f"GraphQL query returned nothing at {'.'.join(path)}"
+            )
+        yield connection
+        page_info = connection["pageInfo"]
+        if not page_info["hasNextPage"]:
+            return
+        cursor = page_info["endCursor"]
+
+
+def get_repository_states(organization: str) -> list[RepositoryState]:
+    """Reads the name, default branch and branch protection rules of every repository in an organization, fetching
+    GRAPHQL_PAGE_SIZE repositories per request.
+
+    Args:
+        organization (str): Login of the GitHub organization.
+
+    Returns:
+        list[RepositoryState]: One entry per repository, sorted by name.
+    """
+    states = []
+    for page in paginate(
+        query=REPOSITORIES_QUERY,
+        variables={
+            "organization": organization,
+            "pageSize": GRAPHQL_PAGE_SIZE,
+            "ruleLimit": BRANCH_PROTECTION_RULE_LIMIT,
+        },
+        path=["organization", "repositories"],
+    ):
+        states += [RepositoryState.from_node(node) for node in page["nodes"]]
+    logger.debug(f"Read the state of {len(states)} repositories in {organization}")
+    return states
+
+
+def get_team_permissions(
+    organization: str, team_slug: str
+) -> dict[str, dict[str, bool]]:
+    """Reads the permissions a team holds on each of the organization's repositories it has access to.
+
+    Args:
+        organization (str): Login of the GitHub organization.
+        team_slug (str): Slug of the team.
+
+    Returns:
+        dict[str, dict[str, bool]]: Permissions keyed by the repository's full name, in the same shape as the REST API's
+        `permissions` object.
+    """
+    permissions = {}
+    for page in paginate(
+        query=TEAM_REPOSITORIES_QUERY,
+        variables={
+            "organization": organization,
+            "team": team_slug,
+            "pageSize": GRAPHQL_PAGE_SIZE,
+        },
+        path=["organization", "team", "repositories"],
+    ):
+        for edge in page["edges"]:
+            permissions[edge["node"]["nameWithOwner"]] = REPOSITORY_PERMISSIONS[
+                edge["permission"]
+            ]
+    return permissions
+
+
+def get_permission_snapshot(
+    organization: str, team_slugs: list[str]
+) -> PermissionSnapshot:
+    """Builds a PermissionSnapshot for the given teams from the GraphQL API.
+
+    Args:
+        organization (str): Login of the GitHub organization.
+        team_slugs (list[str]): Slugs of the teams to include. Duplicates are only read once.
+
+    Returns:
+        PermissionSnapshot: Snapshot covering every team in `team_slugs`.
+    """
+    snapshot = PermissionSnapshot(teams=team_slugs)
+    for team_slug in dict.fromkeys(team_slugs):
+        for full_name, permissions in get_team_permissions(
+            organization=organization, team_slug=team_slug
+        ).items():
+            snapshot.set(
+                team_slug=team_slug, full_name=full_name, permissions=permissions
+            )
+        logger.debug(f"Indexed repository permissions for team {team_slug}")
+    return snapshot
+
+
+def get_protection_snapshot(organization: str) -> ProtectionSnapshot:
+    """Builds a ProtectionSnapshot of every default branch in an organization from get_repository_states().
+
+    A default branch without a matching rule is recorded as unprotected, unless the repository has more rules than were
+    read, in which case it's left out of the snapshot and its protection is read from the REST API instead. Default branches
+    covered by several wildcard rules are left out too.
+
+    Args:
+        organization (str): Login of the GitHub organization.
+
+    Returns:
+        ProtectionSnapshot: Snapshot covering each repository with a default branch.
+    """
+    snapshot = ProtectionSnapshot()
+    for state in get_repository_states(organization=organization):
+        if state.default_branch is None:
+            continue
+        rule = state.default_branch_protection
+        if rule is not None:
+            protection = rule.flatten()
+        elif state.branch_protection_rules_complete and not state.default_branch_rules:
+            protection = dict.fromkeys(DEFAULT_BRANCH_PROTECTION)
+        else:
+            continue
+        snapshot.set(
+            full_name=state.full_name,
+            branch_name=state.default_branch,
+            protection=protection,
+        )
+    return snapshot
@@ -1,11 +1,38 @@
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
+
+from launch.profiling import profiled
 
-from github.Hook import Hook
-from github.Repository import Repository
+if TYPE_CHECKING:
+    from github.Hook import Hook
+    from github.Repository import Repository
 
 logger = logging.getLogger(__name__)
 
 
+# Config settings that GitHub reports back for a hook. The secret is never returned, so it can't be compared, and a hook
+# is always updated when a secret is supplied in case it was rotated.
+COMPARED_CONFIG_KEYS = ["url", "content_type", "insecure_ssl"]
+
+
+@profiled("hook lookups")
+def find_matching_hooks(repo: Repository, url: str) -> list[Hook]:
+    return [hook for hook in repo.get_hooks() if hook.config.get("url") == url]
+
+
+def hook_matches(
+    hook: Hook, config: dict[str, str], events: list[str], active: bool
+) -> bool:
+    if config.get("secret"):
+        return False
+    for key in COMPARED_CONFIG_KEYS:
+        if key in config and str(hook.config.get(key)) != str(config[key]):
+            return False
+    return set(hook.events) == set(events) and hook.active == active
+
+
 def create_hook(
     repo: Repository,
     name: str,
@@ -14,8 +41,40 @@ def create_hook(
     active: bool,
     dry_run: bool = True,
 ) -> None:
-    if dry_run:
-        logger.info(f"Would have created webhook on {repo.name} for repo {repo.url}")
+    """Makes sure the repository has a webhook delivering to config's url. An existing hook for the same url is left alone
+    if its events and settings already match, and updated in place if they don't, so running this again never creates a
+    duplicate hook. GitHub never reports a hook's secret, so an existing hook is always updated when config has one.
+
+    Args:
+        repo (Repository): GitHub Repository
+        name (str): Name of the hook, always web for webhooks.
+        config (dict[str, str]): Hook configuration, including the url payloads are delivered to.
+        events (list[str]): Events the hook is triggered for.
+        active (bool): Whether the hook delivers notifications.
+        dry_run (bool, optional): Report what would be changed without changing anything. Defaults to True.
+    """
+    existing_hooks = find_matching_hooks(repo=repo, url=config["url"])
+    if len(existing_hooks) > 1:
+        logger.warning(
+            f"Found {len(existing_hooks)} webhooks delivering to the same URL on {repo.name}, only the first is managed"
+        )
+
+    if not existing_hooks:
+        if dry_run:
+            logger.info(
+                f"Would have created webhook on {repo.name} for repo {repo.url}"
+            )
+        else:
+            logger.info(f"Creating webhook on {repo.name} for repo {repo.url}")
+            repo.create_hook(name=name, config=config, events=events, active=active)
+    elif hook_matches(
+        hook=existing_hooks[0], config=config, events=events, active=active
+    ):
+        logger.warning(
+            f"Webhook is already in place on {repo.name} for repo {repo.url}"
+        )
+    elif dry_run:
+        logger.info(f"Would have updated webhook on {repo.name} for repo {repo.url}")
     else:
-        logger.info(f"Creating webhook on {repo.name} for repo {repo.url}")
-        repo.create_hook(name=name, config=config, events=events, active=active)
+        logger.info(f"Updating webhook on {repo.name} for repo {repo.url}")
+        existing_hooks[0].edit(name=name, config=config, events=events, active=active)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from github.Requester import Requester
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# GitHub's maximum page size for REST listings.
+DEFAULT_PAGE_SIZE = 100
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+def prefetch(iterable: Iterable[T], buffer_size: int) -> Iterator[T]:
+    """Iterates over `iterable` on a background thread, keeping up to `buffer_size` items ready. When the iterable is a paged
+    listing and `buffer_size` is its page size, the next page downloads while the caller works through the current one.
+
+    Exceptions raised by the iterable are re-raised to the caller. Closing the generator early, for instance by breaking out
+    of a loop over it, stops the background thread after at most one more page.
+    """
+    items: queue.Queue = queue.Queue(maxsize=max(buffer_size, 1))
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    threading.Thread(target=produce, name="launch-prefetch", daemon=True).start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exception
+            yield item
+    finally:
+        stopped.set()
+
+
+def paginate(
+    content_class: type[T],
+    requester: Requester,
+    url: str,
+    params: dict[str, Any] | None = None,
+    per_page: int = DEFAULT_PAGE_SIZE,
+    limit: int | None = None,
+    prefetch_pages: bool = True,
+) -> Iterator[T]:
+    """Yields the items of a paged GitHub REST listing as their pages arrive, rather than waiting for the whole listing.
+
+    Args:
+        content_class (type[T]): PyGithub class of the listed items, such as github.Tag.Tag.
+        requester (Requester): Requester of the object the listing belongs to.
+        url (str): URL of the listing.
+        params (dict[str, Any] | None, optional): Query parameters for the first page. Defaults to None.
+        per_page (int, optional): Page size, regardless of the page size the GitHub instance was created with. Defaults to
+            DEFAULT_PAGE_SIZE.
+        limit (int | None, optional): Stop after this many items, without requesting any further pages. Defaults to None,
+            which yields the entire listing.
+        prefetch_pages (bool, optional): Download the next page in the background while the current one is processed.
+            Defaults to True.
+    """
+    from github.PaginatedList import PaginatedList
+
+    listing = PaginatedList(
+        content_class, requester, url, {**(params or {}), "per_page": per_page}
+    )
+    items: Iterable[T] = listing
+    if limit is not None:
+        items = itertools.islice(items, limit)
+    if prefetch_pages:
+        items = prefetch(items, buffer_size=per_page)
+    yield from items
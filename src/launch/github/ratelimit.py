@@ -0,0 +1,301 @@
+import hashlib
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import cache
+from typing import Callable
+from urllib.parse import urlsplit
+
+from launch.env import (
+    GITHUB_MAX_CONCURRENCY,
+    GITHUB_MAX_RETRIES,
+    GITHUB_REQUEST_BURST,
+    GITHUB_REQUESTS_PER_SECOND,
+)
+
+logger = logging.getLogger(__name__)
+
+# Methods that can safely be sent again after a failure, see RFC 9110 section 9.2.2
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+# Server errors that are typically transient on GitHub's side
+RETRYABLE_SERVER_ERRORS = frozenset([502, 503, 504])
+# Number of successful responses in a row before a reduced concurrency limit is raised again
+CONCURRENCY_RECOVERY_STREAK = 20
+# GitHub keeps a separate primary rate limit per resource, named by the X-RateLimit-Resource header.
+CORE_RESOURCE = "core"
+RESOURCES_BY_PATH_PREFIX = {"/graphql": "graphql", "/search/": "search"}
+
+
+class RateLimitBudgetExhausted(Exception):
+    pass
+
+
+@dataclass
+class RateLimitBudget:
+    """Most recent view of the primary rate limit, as reported by GitHub's X-RateLimit-* headers. Values are None until a
+    response carrying those headers has been seen."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    used: int | None = None
+    reset_at: float | None = None
+
+
+def rate_limit_identity(authorization: str | None) -> str:
+    """Names the identity GitHub counts a request against, without keeping its credential. PyGithub sends "token ..." and
+    our own helpers "Bearer ...", GitHub counts both against the same budget."""
+    if not authorization:
+        return "anonymous"
+    credential = authorization.split()[-1]
+    return hashlib.sha256(credential.encode()).hexdigest()
+
+
+def request_resource(url: str) -> str:
+    """The rate limit resource a request to `url` is counted against."""
+    path = urlsplit(url).path
+    for prefix, resource in RESOURCES_BY_PATH_PREFIX.items():
+        if path.startswith(prefix):
+            return resource
+    return CORE_RESOURCE
+
+
+class RateLimitScheduler:
+    """Paces requests to GitHub and decides when a rate limited request should be retried.
+
+    Requests are paced with a token bucket that refills at `requests_per_second` and holds up to `burst` tokens. At most
+    `max_concurrency` requests are in flight at once; that limit is halved whenever GitHub reports a secondary rate limit and
+    raised again by one after every CONCURRENCY_RECOVERY_STREAK successful responses. When the primary rate limit has been
+    used up, new requests wait until it resets.
+
+    GitHub keeps a primary rate limit per identity and resource, so a budget is tracked for each (identity, resource) pair
+    and a request only waits on its own. An anonymous request running out doesn't hold up authenticated ones, and neither
+    does the GraphQL budget hold up REST requests.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = GITHUB_REQUESTS_PER_SECOND,
+        burst: int = GITHUB_REQUEST_BURST,
+        max_concurrency: int = GITHUB_MAX_CONCURRENCY,
+        max_retries: int = GITHUB_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._sleep = sleep
+
+        self._lock = threading.Lock()
+        self._slot_available = threading.Condition(self._lock)
+        self._tokens = float(self.burst)
+        self._last_refill = clock()
+        self._concurrency_limit = self.max_concurrency
+        self._in_flight = 0
+        self._success_streak = 0
+        self._budgets: dict[tuple[str, str], RateLimitBudget] = {}
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self._concurrency_limit
+
+    def budget(
+        self, authorization: str | None = None, resource: str = CORE_RESOURCE
+    ) -> RateLimitBudget:
+        """Most recent view of the primary rate limit for the identity sending `authorization`, on one resource."""
+        with self._lock:
+            budget = self._budgets.get(
+                (rate_limit_identity(authorization), resource), RateLimitBudget()
+            )
+            return RateLimitBudget(**vars(budget))
+
+    def has_budget(
+        self,
+        minimum_remaining: int,
+        authorization: str | None = None,
+        resource: str = CORE_RESOURCE,
+    ) -> bool:
+        """Whether at least `minimum_remaining` requests are left in the identity's primary rate limit on one resource. Always
+        true until GitHub has told us otherwise, and true again once the reported reset time has passed.
+        """
+        budget = self.budget(authorization=authorization, resource=resource)
+        if budget.remaining is None or budget.remaining >= minimum_remaining:
+            return True
+        return budget.reset_at is not None and budget.reset_at <= self._wall_clock()
+
+    def acquire(
+        self, authorization: str | None = None, resource: str = CORE_RESOURCE
+    ) -> None:
+        """Blocks until a request may be sent. Every call must be paired with a call to release().
+
+        Args:
+            authorization (str | None, optional): Authorization header the request is sent with. Defaults to None, for an
+                anonymous request.
+            resource (str, optional): Rate limit resource the request counts against. Defaults to CORE_RESOURCE.
+        """
+        key = (rate_limit_identity(authorization), resource)
+        with self._slot_available:
+            while self._in_flight >= self._concurrency_limit:
+                self._slot_available.wait()
+            self._in_flight += 1
+
+        while True:
+            with self._lock:
+                wait = self._primary_limit_wait(key)
+                if not wait:
+                    now = self._clock()
+                    self._tokens = min(
+                        self.burst,
+                        self._tokens
+                        + (now - self._last_refill) * self.requests_per_second,
+                    )
+                    self._last_refill = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.requests_per_second
+            self._sleep(wait)
+
+    def wait(self, seconds: float) -> None:
+        self._sleep(seconds)
+
+    def release(self) -> None:
+        with self._slot_available:
+            self._in_flight -= 1
+            self._slot_available.notify()
+
+    def _primary_limit_wait(self, key: tuple[str, str]) -> float:
+        # Called with the lock held.
+        budget = self._budgets.get(key)
+        if budget is None or budget.remaining is None or budget.remaining > 0:
+            return 0
+        if budget.reset_at is None:
+            return 0
+        wait = budget.reset_at - self._wall_clock()
+        if wait <= 0:
+            # The window has reset, let the next response tell us the new budget.
+            budget.remaining = None
+            return 0
+        logger.warning(
+            f"GitHub {key[1]} rate limit exhausted, waiting {wait:.0f}s for reset"
+        )
+        return wait
+
+    def record_response(
+        self,
+        status_code: int,
+        headers,
+        body: str = "",
+        authorization: str | None = None,
+    ) -> None:
+        """Updates the known rate limit budget and adapts the concurrency limit from a GitHub response.
+
+        Args:
+            status_code (int): Status code of the response.
+            headers: Headers of the response. X-RateLimit-Resource names the budget they describe.
+            body (str, optional): Body of the response, used to recognize secondary rate limits. Defaults to "".
+            authorization (str | None, optional): Authorization header the request was sent with. Defaults to None, for an
+                anonymous request.
+        """
+        with self._slot_available:
+            if "X-RateLimit-Remaining" in headers:
+                key = (
+                    rate_limit_identity(authorization),
+                    headers.get("X-RateLimit-Resource") or CORE_RESOURCE,
+                )
+                try:
+                    self._budgets[key] = RateLimitBudget(
+                        limit=int(headers.get("X-RateLimit-Limit", 0)) or None,
+                        remaining=int(headers["X-RateLimit-Remaining"]),
+                        used=int(headers.get("X-RateLimit-Used", 0)),
+                        reset_at=float(headers.get("X-RateLimit-Reset", 0)) or None,
+                    )
+                except ValueError:
+                    logger.debug(f"Ignoring malformed rate limit headers: {headers}")
+
+            if self.is_secondary_rate_limit(status_code, headers, body):
+                self._success_streak = 0
+                reduced_limit = max(1, self._concurrency_limit // 2)
+                if reduced_limit != self._concurrency_limit:
+                    logger.warning(
+                        f"GitHub secondary rate limit hit, reducing concurrency to {reduced_limit}"
+                    )
+                self._concurrency_limit = reduced_limit
+            elif status_code < 400:
+                self._success_streak += 1
+                if (
+                    self._success_streak >= CONCURRENCY_RECOVERY_STREAK
+                    and self._concurrency_limit < self.max_concurrency
+                ):
+                    self._success_streak = 0
+                    self._concurrency_limit += 1
+                    self._slot_available.notify()
+
+    @staticmethod
+    def is_primary_rate_limit(status_code: int, headers) -> bool:
+        return status_code in (403, 429) and headers.get("X-RateLimit-Remaining") == "0"
+
+    @classmethod
+    def is_secondary_rate_limit(cls, status_code: int, headers, body: str = "") -> bool:
+        if status_code not in (403, 429) or cls.is_primary_rate_limit(
+            status_code, headers
+        ):
+            return False
+        return "Retry-After" in headers or "secondary rate limit" in body.lower()
+
+    def retry_delay(
+        self, method: str, status_code: int, headers, body: str, attempt: int
+    ) -> float | None:
+        """Works out whether a request should be sent again, and how long to wait first.
+
+        Args:
+            method (str): HTTP method of the request. Only idempotent requests are retried.
+            status_code (int): Status code of the response.
+            headers: Headers of the response.
+            body (str): Body of the response, used to recognize secondary rate limits.
+            attempt (int): Number of retries already made for this request.
+
+        Returns:
+            float | None: Seconds to wait before retrying, or None if the response should be returned as it is.
+        """
+        if method.upper() not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return None
+        primary = self.is_primary_rate_limit(status_code, headers)
+        secondary = self.is_secondary_rate_limit(status_code, headers, body)
+        if not (primary or secondary or status_code in RETRYABLE_SERVER_ERRORS):
+            return None
+
+        if "Retry-After" in headers:
+            try:
+                return float(headers["Retry-After"])
+            except ValueError:
+                pass
+        if primary and "X-RateLimit-Reset" in headers:
+            return max(0.0, float(headers["X-RateLimit-Reset"]) - self._wall_clock())
+        # Exponential backoff with full jitter, so that concurrent workers don't retry in lockstep.
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+
+@cache
+def get_rate_limit_scheduler() -> RateLimitScheduler:
+    """Process-wide scheduler shared by every request sent over launch.github.client's session."""
+    return RateLimitScheduler()
+
+
+def rate_limit_budget(
+    authorization: str | None = None, resource: str = CORE_RESOURCE
+) -> RateLimitBudget:
+    """Most recent view of an identity's primary rate limit, for bulk commands deciding whether to carry on."""
+    return get_rate_limit_scheduler().budget(
+        authorization=authorization, resource=resource
+    )
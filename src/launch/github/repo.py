@@ -1,17 +1,45 @@
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING, Iterator
+
+from .pagination import DEFAULT_PAGE_SIZE, paginate
 
-from github import Github
-from github.AuthenticatedUser import AuthenticatedUser
-from github.Repository import Repository
+if TYPE_CHECKING:
+    from github import Github
+    from github.AuthenticatedUser import AuthenticatedUser
+    from github.Repository import Repository
 
 logger = logging.getLogger(__name__)
 
 
+def iter_github_repos(
+    g: Github,
+    user: AuthenticatedUser | None = None,
+    per_page: int = DEFAULT_PAGE_SIZE,
+    limit: int | None = None,
+) -> Iterator[Repository]:
+    """Yields the repositories of the authenticated user as each page arrives.
+
+    Args:
+        g (Github): GitHub instance, used to look up the authenticated user when `user` isn't given.
+        user (AuthenticatedUser | None, optional): User whose repositories are listed. Defaults to None.
+        per_page (int, optional): Number of repositories requested per page. Defaults to DEFAULT_PAGE_SIZE.
+        limit (int | None, optional): Stop after this many repositories. Defaults to None, which yields every repository.
+    """
+    from github.Repository import Repository
+
+    user = user or g.get_user()
+    return paginate(
+        Repository, user.requester, "/user/repos", per_page=per_page, limit=limit
+    )
+
+
 def get_github_repos(
     g: Github, user: AuthenticatedUser | None = None
 ) -> list[Repository]:
     if user:
         return user.get_repos()
-    repos = [repo for repo in g.get_user().get_repos()]
+    repos = list(iter_github_repos(g=g))
     logger.debug(f"Fetched {len(repos)}")
     return repos
@@ -1,31 +1,129 @@
-import itertools
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING, Iterator
 
-from github.Repository import Repository
-from github.Tag import Tag
 from semver import Version
 
+from launch.env import GITHUB_API_URL, GITHUB_TIMEOUT
+from launch.versions import parse_versions, top_versions
+
+from .pagination import DEFAULT_PAGE_SIZE, paginate
+
+if TYPE_CHECKING:
+    import requests
+    from github.Repository import Repository
+    from github.Tag import Tag
+
 logger = logging.getLogger(__name__)
 
+# Number of releases inspected, and of tag versions returned, by get_recent_semantic_versions. Matches the GitHub maximum page
+# size, so that reading the releases costs a single request.
+RECENT_VERSION_LIMIT = 100
+# Matches every tag ref, without also matching branches whose names merely start with "tags".
+TAG_REFS_PREFIX = "tags/"
+
+
+def iter_repo_tags(
+    repo: Repository, per_page: int = DEFAULT_PAGE_SIZE, limit: int | None = None
+) -> Iterator[Tag]:
+    """Yields a repository's tags as each page arrives. GitHub lists tags by name rather than by age, so the first tags
+    aren't necessarily the newest.
+
+    Args:
+        repo (Repository): Repository to list tags from.
+        per_page (int, optional): Number of tags requested per page. Defaults to DEFAULT_PAGE_SIZE.
+        limit (int | None, optional): Stop after this many tags. Defaults to None, which yields every tag.
+    """
+    from github.Tag import Tag
+
+    return paginate(
+        Tag, repo.requester, f"{repo.url}/tags", per_page=per_page, limit=limit
+    )
+
 
 def get_repo_tags(repo: Repository) -> list[Tag]:
-    tags = [tag for tag in repo.get_tags()]
+    tags = list(iter_repo_tags(repo=repo))
     logger.debug(f"Fetched {len(tags)} tags from {repo.name}")
     return tags
 
 
-def get_repo_semantic_versions(repo: Repository) -> list[Version]:
-    def try_parse_version(tag_name: str) -> Version | None:
-        try:
-            return Version.parse(version=tag_name)
-        except Exception as e:
-            logger.debug(f"Failed to parse version from tag {tag_name}: {e}")
+def parse_tag_versions(tag_names: list[str]) -> list[Version]:
+    """Parses tag names in one batch, logging each name that isn't a semantic version before dropping it."""
+    versions = parse_versions(tag_names)
+    for tag_name in tag_names:
+        if tag_name not in versions:
+            logger.debug(
+                f"Failed to parse version from tag {tag_name}: {tag_name} is not valid SemVer string"
+            )
+    return list(versions.values())
+
 
+def get_repo_semantic_versions(repo: Repository) -> list[Version]:
     tags = get_repo_tags(repo=repo)
-    versions = list(
-        itertools.filterfalse(
-            lambda x: x is None, [try_parse_version(t.name) for t in tags]
+    versions = parse_tag_versions([tag.name for tag in tags])
+    logger.debug(f"Successfully parsed {len(versions)} from tags on {repo.name}")
+    return versions
+
+
+def get_recent_semantic_versions(
+    full_name: str,
+    session: requests.Session,
+    limit: int = RECENT_VERSION_LIMIT,
+    timeout: float = GITHUB_TIMEOUT,
+) -> list[Version]:
+    """Looks up the semantic versions of a repository's most recent releases, without listing its entire tag history. The
+    releases endpoint returns the newest releases first, so only the first `limit` of them are inspected; drafts are skipped.
+    If the repository has no releases, every tag is read from the matching refs endpoint instead, and the `limit` highest
+    versions among them are returned. The tags endpoint lists tags by name, so its first page can miss the newest version.
+
+    The requests go over `session` rather than PyGithub, so that callers such as the update check can keep them away from the
+    shared session and its rate limit scheduler.
+
+    Args:
+        full_name (str): Full name of the repository, as owner/name.
+        session (requests.Session): Session to send the requests over.
+        limit (int, optional): Maximum number of releases to inspect, or of tag versions to return. Defaults to
+            RECENT_VERSION_LIMIT.
+        timeout (float, optional): Seconds to wait on GitHub for each request. Defaults to GITHUB_TIMEOUT.
+
+    Raises:
+        requests.HTTPError: Raised if GitHub didn't return the releases or tags.
+
+    Returns:
+        list[Version]: Versions parsed from the names of the inspected releases or tags. Names that aren't semantic versions
+        are dropped.
+    """
+    repository_url = f"{GITHUB_API_URL}/repos/{full_name}"
+    response = session.get(
+        f"{repository_url}/releases", params={"per_page": limit}, timeout=timeout
+    )
+    response.raise_for_status()
+    tag_names = [
+        release["tag_name"]
+        for release in response.json()[:limit]
+        if not release["draft"]
+    ]
+    if tag_names:
+        versions = parse_tag_versions(tag_names)
+        logger.debug(
+            f"Successfully parsed {len(versions)} from {len(tag_names)} recent releases on {full_name}"
         )
+        return versions
+
+    logger.debug(f"No releases found on {full_name}, falling back to tags")
+    tag_names = []
+    url = f"{repository_url}/git/matching-refs/{TAG_REFS_PREFIX}"
+    while url:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        tag_names += [
+            ref["ref"].removeprefix(f"refs/{TAG_REFS_PREFIX}")
+            for ref in response.json()
+        ]
+        url = response.links.get("next", {}).get("url")
+    versions = top_versions(parse_versions(tag_names).values(), limit)
+    logger.debug(
+        f"Kept the {len(versions)} highest versions of {len(tag_names)} tags on {full_name}"
     )
-    logger.debug(f"Successfully parsed {len(versions)} from tags on {repo.name}")
     return versions
@@ -1,14 +1,16 @@
 import logging
 import pathlib
 
-from git.repo import Repo
+from .session import RepositorySession
 
 logger = logging.getLogger(__name__)
 
 
-def get_current_branch_name(repo_path: pathlib.Path) -> str:
-    try:
-        repo_instance = Repo(path=repo_path)
-    except Exception as e:
-        raise RuntimeError(f"{repo_path} is not a git repository!") from e
-    return repo_instance.active_branch.name
+def get_current_branch_name(
+    repo_path: pathlib.Path, session: RepositorySession | None = None
+) -> str:
+    session = session or RepositorySession(repo_path=repo_path)
+    head = session.head()
+    if head.branch_name is None:
+        raise RuntimeError(f"HEAD of {repo_path} is detached, not on a branch!")
+    return head.branch_name
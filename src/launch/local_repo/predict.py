@@ -3,6 +3,8 @@ import logging
 
 from semver import Version
 
+from launch.versions import latest_version
+
 logger = logging.getLogger(__name__)
 
 BRANCH_DELIMITER = "/"
@@ -33,7 +35,7 @@ def split_delimiter(branch_name: str, delimiter: str | None = None) -> tuple[str
 
 
 def latest_tag(tags: list[Version]) -> Version:
-    return sorted(tags)[-1]
+    return latest_version(tags)
 
 
 def predict_version(
@@ -41,15 +43,20 @@ def predict_version(
     branch_name: str,
     breaking_chars: list[str] | None = None,
     capitalize_first_is_breaking: bool | None = None,
+    known_latest: Version | None = None,
 ):
     breaking_change: bool = False
 
-    if not len(existing_tags):
-        logger.warning(f"No tags exist on this repo, defaulting to {DEFAULT_VERSION}")
-        return DEFAULT_VERSION
-
-    latest_version = latest_tag(tags=existing_tags)
-    logger.debug(f"Got {latest_version=} as the latest tag")
+    latest = known_latest
+    if latest is None:
+        if not len(existing_tags):
+            logger.warning(
+                f"No tags exist on this repo, defaulting to {DEFAULT_VERSION}"
+            )
+            return DEFAULT_VERSION
+        # Callers that already know the latest version, such as from the version index, pass it in to skip this scan.
+        latest = latest_tag(tags=existing_tags)
+    logger.debug(f"Got {latest=} as the latest tag")
 
     if not breaking_chars:
         breaking_chars = BREAKING_CHARS
@@ -87,10 +94,38 @@ def predict_version(
 
     if breaking_change or revision_type.lower().strip() in MAJOR_NAME_PARTS:
         logger.debug("Bumping major version!")
-        return latest_version.bump_major()
+        return latest.bump_major()
     elif revision_type.lower().strip() in MINOR_NAME_PARTS:
         logger.debug("Bumping minor version!")
-        return latest_version.bump_minor()
+        return latest.bump_minor()
     else:
         logger.debug("Bumping patch version!")
-        return latest_version.bump_patch()
+        return latest.bump_patch()
+
+
+def predict_package_versions(
+    latest_versions: dict[str, Version | None],
+    branch_name: str,
+    breaking_chars: list[str] | None = None,
+    capitalize_first_is_breaking: bool | None = None,
+) -> dict[str, Version]:
+    """Predicts the next version of several packages released together from the same source branch.
+
+    Args:
+        latest_versions (dict[str, Version | None]): Latest version of each package, or None for a package that hasn't been
+            released yet, keyed by package name.
+        branch_name (str): Name of the source branch, which decides how every package's version is bumped.
+
+    Returns:
+        dict[str, Version]: Next version of each package, keyed by package name.
+    """
+    return {
+        package: predict_version(
+            existing_tags=[],
+            known_latest=latest,
+            branch_name=branch_name,
+            breaking_chars=breaking_chars,
+            capitalize_first_is_breaking=capitalize_first_is_breaking,
+        )
+        for package, latest in latest_versions.items()
+    }
@@ -0,0 +1,375 @@
+"""Reads branches and tags straight from a repository's .git directory, without GitPython.
+
+Only the parts of the on-disk format needed to list tags and find the current branch are handled: HEAD, loose refs,
+packed-refs, linked worktrees (a .git file pointing at the worktree's git directory, which in turn names the shared
+directory in its commondir file) and loose tag objects. Annotated tags whose objects are packed are peeled by a single
+`git cat-file --batch-check` call.
+
+The tags of a remote can also be listed with a single `git ls-remote`, which transfers only ref names and SHAs, never
+objects. Shallow CI checkouts that were cloned without tags use this to find the versions released so far.
+"""
+
+import logging
+import os
+import pathlib
+import subprocess
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+
+from launch.profiling import GIT, phase, profiled
+
+logger = logging.getLogger(__name__)
+
+TAGS_PREFIX = "refs/tags/"
+HEADS_PREFIX = "refs/heads/"
+SYMBOLIC_REF_PREFIX = "ref: "
+# Annotated tags can point at other tags; git itself gives up well before this depth.
+MAX_PEEL_DEPTH = 10
+
+
+class NotAGitRepositoryException(Exception):
+    pass
+
+
+class RemoteRefsException(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class GitDirectories:
+    # Directory holding this working tree's HEAD, which is specific to a worktree.
+    git_dir: pathlib.Path
+    # Directory holding the refs, packed-refs and objects shared by every worktree of the repository.
+    common_dir: pathlib.Path
+
+
+@dataclass(frozen=True)
+class Head:
+    # Full name of the branch HEAD points at, such as refs/heads/main. None when HEAD is detached.
+    ref: str | None
+    # Commit HEAD resolves to. None on a branch that doesn't have any commits yet.
+    sha: str | None
+
+    @property
+    def branch_name(self) -> str | None:
+        if self.ref and self.ref.startswith(HEADS_PREFIX):
+            return self.ref[len(HEADS_PREFIX) :]
+        return None
+
+
+@dataclass(frozen=True)
+class TagRef:
+    # Name of the tag, without the refs/tags/ prefix.
+    name: str
+    # Object the tag ref points at, an annotated tag object or a commit.
+    sha: str
+    # Commit the tag ultimately points at.
+    commit: str
+
+
+def find_git_directories(repo_path: pathlib.Path) -> GitDirectories:
+    """Locates the git directories of a working tree, a linked worktree, or a bare repository.
+
+    Raises:
+        NotAGitRepositoryException: Raised if repo_path isn't the top of a git repository.
+    """
+    repo_path = pathlib.Path(repo_path)
+    dot_git = repo_path.joinpath(".git")
+    if dot_git.is_dir():
+        git_dir = dot_git
+    elif dot_git.is_file():
+        content = dot_git.read_text().strip()
+        if not content.startswith("gitdir:"):
+            raise NotAGitRepositoryException(
+                f"{dot_git} doesn't point at a git directory"
+            )
+        git_dir = repo_path.joinpath(content[len("gitdir:") :].strip())
+    elif (
+        repo_path.joinpath("HEAD").is_file() and repo_path.joinpath("objects").is_dir()
+    ):
+        git_dir = repo_path
+    else:
+        raise NotAGitRepositoryException(f"{repo_path} is not a git repository!")
+    if not git_dir.joinpath("HEAD").is_file():
+        raise NotAGitRepositoryException(f"{git_dir} is not a git directory!")
+
+    common_dir = git_dir
+    commondir_file = git_dir.joinpath("commondir")
+    if commondir_file.is_file():
+        common_dir = git_dir.joinpath(commondir_file.read_text().strip())
+    return GitDirectories(git_dir=git_dir.resolve(), common_dir=common_dir.resolve())
+
+
+def read_packed_refs(common_dir: pathlib.Path) -> tuple[dict[str, str], dict[str, str]]:
+    """Parses packed-refs.
+
+    Returns:
+        tuple[dict[str, str], dict[str, str]]: The SHA each packed ref points at, and the commit each packed annotated tag
+        peels to, both keyed by full ref name.
+    """
+    refs: dict[str, str] = {}
+    peeled: dict[str, str] = {}
+    tags_peeled = False
+    fully_peeled = False
+    try:
+        lines = common_dir.joinpath("packed-refs").read_text().splitlines()
+    except FileNotFoundError:
+        return refs, peeled
+
+    last_ref = None
+    for line in lines:
+        if line.startswith("#"):
+            # The header lists the traits git wrote the file with. With "peeled", every annotated tag under refs/tags/ has a
+            # peel line; "fully-peeled" extends that to refs outside refs/tags/.
+            traits = line.split()
+            tags_peeled = "peeled" in traits or "fully-peeled" in traits
+            fully_peeled = "fully-peeled" in traits
+            continue
+        if line.startswith("^"):
+            if last_ref is not None:
+                peeled[last_ref] = line[1:].strip()
+            continue
+        sha, _, name = line.partition(" ")
+        if name:
+            refs[name.strip()] = sha
+            last_ref = name.strip()
+
+    if tags_peeled:
+        # Every ref covered by the traits that doesn't have a peel line points directly at its commit.
+        for name, sha in refs.items():
+            if fully_peeled or name.startswith(TAGS_PREFIX):
+                peeled.setdefault(name, sha)
+    return refs, peeled
+
+
+def read_loose_refs(common_dir: pathlib.Path, prefix: str) -> dict[str, str]:
+    """Reads the loose refs under a prefix such as refs/tags/, keyed by full ref name. Symbolic refs are skipped."""
+    refs: dict[str, str] = {}
+    base = common_dir.joinpath(prefix)
+    for directory, _, file_names in os.walk(base):
+        for file_name in file_names:
+            path = pathlib.Path(directory, file_name)
+            name = path.relative_to(common_dir).as_posix()
+            try:
+                content = path.read_text().strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if content.startswith(SYMBOLIC_REF_PREFIX) or not content:
+                continue
+            refs[name] = content
+    return refs
+
+
+def resolve_ref(directories: GitDirectories, name: str) -> str | None:
+    """Resolves a single ref, following symbolic refs, to the SHA it points at. None if the ref doesn't exist."""
+    for _ in range(MAX_PEEL_DEPTH):
+        for directory in (directories.git_dir, directories.common_dir):
+            try:
+                content = directory.joinpath(name).read_text().strip()
+                break
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                continue
+        else:
+            packed, _ = read_packed_refs(directories.common_dir)
+            return packed.get(name)
+        if not content.startswith(SYMBOLIC_REF_PREFIX):
+            return content
+        name = content[len(SYMBOLIC_REF_PREFIX) :].strip()
+    return None
+
+
+def read_head(repo_path: pathlib.Path) -> Head:
+    directories = find_git_directories(repo_path=repo_path)
+    content = directories.git_dir.joinpath("HEAD").read_text().strip()
+    if content.startswith(SYMBOLIC_REF_PREFIX):
+        ref = content[len(SYMBOLIC_REF_PREFIX) :].strip()
+        return Head(ref=ref, sha=resolve_ref(directories=directories, name=ref))
+    return Head(ref=None, sha=content)
+
+
+def read_loose_object_header(common_dir: pathlib.Path, sha: str) -> bytes | None:
+    """Decompresses just enough of a loose object to read its header and, for tags, the object they point at. None if the
+    object isn't stored loose."""
+    path = common_dir.joinpath("objects", sha[:2], sha[2:])
+    try:
+        with open(path, "rb") as f:
+            decompressor = zlib.decompressobj()
+            data = b""
+            # Tag objects name their target on the line after the header, every other object type is settled by the header.
+            while b"\0" not in data or (
+                data.startswith(b"tag ") and b"\ntype " not in data
+            ):
+                chunk = f.read(4096)
+                if not chunk or len(data) > 65536:
+                    break
+                data += decompressor.decompress(chunk)
+            return data
+    except FileNotFoundError:
+        return None
+    except zlib.error as e:
+        logger.debug(f"Failed to read loose object {sha}: {e}")
+        return None
+
+
+def peel_loose_object(common_dir: pathlib.Path, sha: str) -> str | None:
+    """Follows annotated tag objects stored loose until reaching a commit. None if an object along the way is packed."""
+    for _ in range(MAX_PEEL_DEPTH):
+        data = read_loose_object_header(common_dir=common_dir, sha=sha)
+        if data is None:
+            return None
+        object_type = data.split(b" ", 1)[0]
+        if object_type != b"tag":
+            return sha
+        body = data.split(b"\0", 1)[1]
+        if not body.startswith(b"object "):
+            return None
+        sha = body[len(b"object ") :].split(b"\n", 1)[0].decode()
+    return None
+
+
+@profiled("git cat-file --batch-check", category=GIT)
+def peel_with_git(repo_path: pathlib.Path, shas: list[str]) -> dict[str, str]:
+    """Peels objects that aren't stored loose with a single git call."""
+    if not shas:
+        return {}
+    result = subprocess.run(
+        ["git", "cat-file", "--batch-check=%(objectname)"],
+        cwd=repo_path,
+        input="".join(f"{sha}^{{commit}}\n" for sha in shas),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    peeled = {}
+    for sha, line in zip(shas, result.stdout.splitlines()):
+        if not line.endswith("missing") and not line.endswith("ambiguous"):
+            peeled[sha] = line.strip()
+    return peeled
+
+
+@profiled("ref scan", category=GIT)
+def read_tag_refs(repo_path: pathlib.Path) -> list[TagRef]:
+    """Lists every tag in a repository along with the commit it points at, sorted by name.
+
+    Raises:
+        NotAGitRepositoryException: Raised if repo_path isn't the top of a git repository.
+    """
+    directories = find_git_directories(repo_path=repo_path)
+    packed, packed_peeled = read_packed_refs(directories.common_dir)
+    refs = {name: sha for name, sha in packed.items() if name.startswith(TAGS_PREFIX)}
+    loose = read_loose_refs(directories.common_dir, TAGS_PREFIX)
+    # Loose refs take precedence over packed ones of the same name.
+    refs.update(loose)
+
+    commits: dict[str, str] = {}
+    unresolved: dict[str, str] = {}
+    for name, sha in refs.items():
+        if name not in loose and name in packed_peeled:
+            commits[name] = packed_peeled[name]
+            continue
+        commit = peel_loose_object(common_dir=directories.common_dir, sha=sha)
+        if commit is None:
+            unresolved[name] = sha
+        else:
+            commits[name] = commit
+
+    if unresolved:
+        logger.debug(f"Peeling {len(unresolved)} packed tags with git")
+        peeled = peel_with_git(repo_path=repo_path, shas=list(set(unresolved.values())))
+        for name, sha in unresolved.items():
+            commits[name] = peeled.get(sha, sha)
+
+    return [
+        TagRef(name=name[len(TAGS_PREFIX) :], sha=refs[name], commit=commits[name])
+        for name in sorted(refs)
+    ]
+
+
+def index_tags_by_commit(tag_refs: list[TagRef]) -> dict[str, list[str]]:
+    """Builds a reverse index from each tagged commit to the names of its tags, sorted by name, so that finding the tags on
+    a commit is a single lookup rather than a scan over every tag."""
+    index: dict[str, list[str]] = defaultdict(list)
+    for tag in sorted(tag_refs, key=lambda tag: tag.name):
+        index[tag.commit].append(tag.name)
+    return dict(index)
+
+
+def run_git(repo_path: pathlib.Path, *args: str) -> str:
+    """Runs a git command that talks to a remote.
+
+    Raises:
+        RemoteRefsException: Raised if git failed, with git's own error message.
+    """
+    with phase(f"git {args[0]}", category=GIT):
+        result = subprocess.run(
+            ["git", *args], cwd=repo_path, capture_output=True, text=True
+        )
+    if result.returncode != 0:
+        raise RemoteRefsException(
+            f"git {args[0]} failed: {result.stderr.strip() or result.returncode}"
+        )
+    return result.stdout
+
+
+def read_remote_tag_refs(
+    repo_path: pathlib.Path, remote_name: str = "origin"
+) -> list[TagRef]:
+    """Lists the tags of a remote along with the commit each points at, sorted by name, without fetching anything.
+
+    Raises:
+        RemoteRefsException: Raised if the remote couldn't be listed.
+    """
+    refs: dict[str, str] = {}
+    peeled: dict[str, str] = {}
+    for line in run_git(repo_path, "ls-remote", "--tags", remote_name).splitlines():
+        sha, _, name = line.partition("\t")
+        if not name.startswith(TAGS_PREFIX):
+            continue
+        # Annotated tags are listed twice, the second time suffixed with ^{} and pointing at the commit.
+        if name.endswith("^{}"):
+            peeled[name[:-3]] = sha
+        else:
+            refs[name] = sha
+    logger.debug(f"Listed {len(refs)} tags on {remote_name}")
+    return [
+        TagRef(
+            name=name[len(TAGS_PREFIX) :],
+            sha=refs[name],
+            commit=peeled.get(name, refs[name]),
+        )
+        for name in sorted(refs)
+    ]
+
+
+def is_shallow_repository(repo_path: pathlib.Path) -> bool:
+    directories = find_git_directories(repo_path=repo_path)
+    return directories.common_dir.joinpath("shallow").is_file()
+
+
+@profiled("git cat-file -e", category=GIT)
+def has_commit(repo_path: pathlib.Path, sha: str) -> bool:
+    """Whether a commit's object is present in the local repository, which in a shallow clone it often isn't."""
+    result = subprocess.run(
+        ["git", "cat-file", "-e", f"{sha}^{{commit}}"],
+        cwd=repo_path,
+        capture_output=True,
+    )
+    return result.returncode == 0
+
+
+def fetch_tag_ref(
+    repo_path: pathlib.Path, name: str, remote_name: str = "origin"
+) -> None:
+    """Fetches a single tag from a remote, without any other tags. A shallow repository only receives the tagged commit
+    itself, not its history.
+
+    Raises:
+        RemoteRefsException: Raised if the tag couldn't be fetched.
+    """
+    ref = f"{TAGS_PREFIX}{name}"
+    args = ["fetch", "--no-tags", "--no-write-fetch-head"]
+    if is_shallow_repository(repo_path=repo_path):
+        args.append("--depth=1")
+    run_git(repo_path, *args, remote_name, f"+{ref}:{ref}")
+    logger.debug(f"Fetched tag {name} from {remote_name}")
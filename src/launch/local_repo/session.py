@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+import pathlib
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+from semver import Version
+
+from launch.profiling import GIT, profiled
+
+from .refs import (
+    TAGS_PREFIX,
+    Head,
+    NotAGitRepositoryException,
+    RemoteRefsException,
+    TagRef,
+    fetch_tag_ref,
+    find_git_directories,
+    has_commit,
+    index_tags_by_commit,
+    read_head,
+    read_remote_tag_refs,
+    read_tag_refs,
+    resolve_ref,
+)
+from .version_index import VersionIndex, load_version_index, update_version_index
+
+if TYPE_CHECKING:
+    from git import TagReference
+    from git.repo import Repo
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Where a session reads tags from: the local repository, or the remote it pushes to.
+TAG_SOURCES = ["local", "remote"]
+
+
+class RepositorySession:
+    """A local repository opened once for a sequence of operations, such as predicting, tagging and pushing a version.
+
+    HEAD, the tags, the version index and the tags of each package are read the first time they're needed and remembered
+    afterwards. Creating a tag through the session forgets the remembered tags, so later reads see it. The GitPython Repo is
+    only opened for operations that write to the repository.
+
+    With the remote tag source, tags are listed from the remote instead, for shallow checkouts that were cloned without
+    them. Tags needed locally, such as the one HEAD's version is compared against, are then fetched one at a time if
+    fetch_missing_tags is set.
+    """
+
+    def __init__(
+        self,
+        repo_path: pathlib.Path,
+        tag_source: str = "local",
+        remote_name: str = "origin",
+        fetch_missing_tags: bool = False,
+    ):
+        if tag_source not in TAG_SOURCES:
+            raise ValueError(
+                f"Unknown tag source {tag_source}, must be one of {TAG_SOURCES}"
+            )
+        self.repo_path = pathlib.Path(repo_path)
+        self.tag_source = tag_source
+        self.remote_name = remote_name
+        self.fetch_missing_tags = fetch_missing_tags
+        self._repo: Repo | None = None
+        self._head: Head | None = None
+        self._tag_refs: list[TagRef] | None = None
+        self._tag_index: dict[str, list[str]] | None = None
+        self._version_index: VersionIndex | None = None
+        self._package_tags: dict[str, list[tuple[Version, TagRef]]] | None = None
+
+    def _read(self, reader: Callable[[], T]) -> T:
+        try:
+            return reader()
+        except (NotAGitRepositoryException, RemoteRefsException) as e:
+            raise RuntimeError(
+                f"Failed to read from repository at {self.repo_path}: {e}"
+            ) from e
+
+    @property
+    def repo(self) -> Repo:
+        if self._repo is None:
+            from . import tags
+
+            self._repo = tags.acquire_repo(repo_path=self.repo_path)
+        return self._repo
+
+    def head(self) -> Head:
+        if self._head is None:
+            self._head = self._read(lambda: read_head(repo_path=self.repo_path))
+        return self._head
+
+    def tag_refs(self) -> list[TagRef]:
+        if self._tag_refs is None:
+            if self.tag_source == "remote":
+                self._tag_refs = self._read(
+                    lambda: read_remote_tag_refs(
+                        repo_path=self.repo_path, remote_name=self.remote_name
+                    )
+                )
+            else:
+                self._tag_refs = self._read(
+                    lambda: read_tag_refs(repo_path=self.repo_path)
+                )
+            logger.debug(
+                f"Read {len(self._tag_refs)} {self.tag_source} tags of {self.repo_path}"
+            )
+        return self._tag_refs
+
+    def tag_index(self) -> dict[str, list[str]]:
+        if self._tag_index is None:
+            self._tag_index = index_tags_by_commit(self.tag_refs())
+        return self._tag_index
+
+    def version_index(self) -> VersionIndex:
+        if self._version_index is None and self.tag_source == "remote":
+            # The index kept in .git only describes local tags, remote ones are parsed afresh.
+            self._version_index, _ = update_version_index(
+                VersionIndex(), {tag.name: tag.commit for tag in self.tag_refs()}
+            )
+        elif self._version_index is None:
+            self._version_index = self._read(
+                lambda: load_version_index(
+                    repo_path=self.repo_path, read_tags=self.tag_refs
+                )
+            )
+        return self._version_index
+
+    def package_tags(self) -> dict[str, list[tuple[Version, TagRef]]]:
+        if self._package_tags is None:
+            from . import tags
+
+            self._package_tags = tags.group_package_tags(self.tag_refs())
+        return self._package_tags
+
+    def ensure_tag(self, tag: TagRef) -> None:
+        """Makes a tag and the commit it points at available locally, fetching just that tag if fetch_missing_tags is set
+        and either is missing."""
+        if not self.fetch_missing_tags:
+            return
+        directories = self._read(lambda: find_git_directories(repo_path=self.repo_path))
+        if resolve_ref(
+            directories=directories, name=f"{TAGS_PREFIX}{tag.name}"
+        ) is not None and has_commit(repo_path=self.repo_path, sha=tag.commit):
+            return
+        self._read(
+            lambda: fetch_tag_ref(
+                repo_path=self.repo_path, name=tag.name, remote_name=self.remote_name
+            )
+        )
+
+    def invalidate_tags(self) -> None:
+        self._tag_refs = None
+        self._tag_index = None
+        self._version_index = None
+        self._package_tags = None
+
+    @profiled("git tag", category=GIT)
+    def create_tag(self, name: str) -> TagReference:
+        tag = self.repo.create_tag(name)
+        self.invalidate_tags()
+        return tag
@@ -1,11 +1,30 @@
+from __future__ import annotations
+
 import logging
 import pathlib
+import subprocess
+from collections import defaultdict
+from typing import TYPE_CHECKING
 
-from git import TagReference
-from git.objects.commit import Commit
-from git.repo import Repo
 from semver import Version
 
+from launch.profiling import GIT, profiled
+from launch.versions import (
+    DEFAULT_PACKAGE_TAG_SCHEME,
+    format_package_tag,
+    is_semantic_version,
+    parse_package_version,
+    parse_version,
+)
+
+from .refs import TagRef, is_shallow_repository
+from .session import RepositorySession
+
+if TYPE_CHECKING:
+    from git import TagReference
+    from git.objects.commit import Commit
+    from git.repo import Repo
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,6 +37,8 @@ class CommitTagNotSemanticVersionException(Exception):
 
 
 def acquire_repo(repo_path: pathlib.Path) -> Repo:
+    from git.repo import Repo
+
     try:
         return Repo(path=repo_path)
     except Exception as e:
@@ -26,71 +47,263 @@ def acquire_repo(repo_path: pathlib.Path) -> Repo:
         ) from e
 
 
-def read_tags(repo_path: pathlib.Path) -> list[str]:
-    repo_instance = acquire_repo(repo_path=repo_path)
-    all_tags = [tag.name for tag in repo_instance.tags]
+def read_tags(
+    repo_path: pathlib.Path, session: RepositorySession | None = None
+) -> list[str]:
+    session = session or RepositorySession(repo_path=repo_path)
+    all_tags = [tag.name for tag in session.tag_refs()]
     logger.debug(f"Discovered {len(all_tags)} tags")
     return all_tags
 
 
-def read_semantic_tags(repo_path: pathlib.Path) -> list[Version]:
-    all_tags = read_tags(repo_path=repo_path)
-    semver_tags: list[Version] = []
-    for tag in all_tags:
-        try:
-            parsed_tag = Version.parse(tag)
-            semver_tags.append(parsed_tag)
-        except ValueError:
-            logger.debug(f"Dropping {tag=}, does not conform to semantic version")
+def read_semantic_tags(
+    repo_path: pathlib.Path, session: RepositorySession | None = None
+) -> list[Version]:
+    """Semantic versions of every tag in the repository, lowest first, read from the version index in .git."""
+    session = session or RepositorySession(repo_path=repo_path)
+    semver_tags = session.version_index().versions()
     logger.debug(f"Narrowed to {len(semver_tags)} tags")
     return semver_tags
 
 
+def read_latest_semantic_tag(
+    repo_path: pathlib.Path, session: RepositorySession | None = None
+) -> Version | None:
+    """Highest semantic version tagged in the repository, or None if there isn't one. Constant time once the version index
+    in .git is up to date."""
+    session = session or RepositorySession(repo_path=repo_path)
+    latest = session.version_index().latest()
+    if (
+        latest is None
+        and session.tag_source == "local"
+        and is_shallow_repository(repo_path=repo_path)
+    ):
+        logger.warning(
+            f"{repo_path} is a shallow clone without version tags, read the tags from the remote instead to predict from the latest released version"
+        )
+    return latest
+
+
+def read_commit_tag_names(
+    repo_path: pathlib.Path,
+    commit: Commit | None = None,
+    session: RepositorySession | None = None,
+) -> list[str]:
+    """Names of the tags on a commit, or on HEAD if no commit is given, sorted by name."""
+    session = session or RepositorySession(repo_path=repo_path)
+    commit_sha = commit.hexsha if commit else session.head().sha
+    return session.tag_index().get(commit_sha, [])
+
+
 def read_version_tag(
-    repo_path: pathlib.Path, commit: Commit | None = None
+    repo_path: pathlib.Path,
+    commit: Commit | None = None,
+    session: RepositorySession | None = None,
 ) -> TagReference:
-    repo_instance = acquire_repo(repo_path=repo_path)
-    if not commit:
-        commit = repo_instance.head.object
-    for discovered_tag in reversed(sorted(repo_instance.tags, key=lambda x: x.name)):
-        if discovered_tag.commit == commit:
-            return discovered_tag
-    raise CommitNotTaggedException(f"{commit.hexsha if commit else 'HEAD'} is untagged")
+    from git import TagReference
+
+    session = session or RepositorySession(repo_path=repo_path)
+    tag_names = read_commit_tag_names(
+        repo_path=repo_path, commit=commit, session=session
+    )
+    if not tag_names:
+        raise CommitNotTaggedException(
+            f"{commit.hexsha if commit else 'HEAD'} is untagged"
+        )
+    if session.tag_source == "remote":
+        tag_refs = {tag.name: tag for tag in session.tag_refs()}
+        session.ensure_tag(tag_refs[tag_names[-1]])
+    return TagReference(repo=session.repo, path=f"refs/tags/{tag_names[-1]}")
 
 
 def tag_is_semantic(tag: TagReference) -> bool:
-    try:
-        Version.parse(tag.name)
-        return True
-    except:
-        return False
+    return is_semantic_version(tag.name)
 
 
 def read_semantic_version_tag(
-    repo_path: pathlib.Path, commit: Commit | None = None
+    repo_path: pathlib.Path,
+    commit: Commit | None = None,
+    session: RepositorySession | None = None,
 ) -> Version:
-    repo_instance = acquire_repo(repo_path=repo_path)
-    if not commit:
-        commit = repo_instance.head.object
-    applicable_tags = list(filter(lambda x: x.commit == commit, repo_instance.tags))
+    applicable_tags = read_commit_tag_names(
+        repo_path=repo_path, commit=commit, session=session
+    )
     if not len(applicable_tags):
         raise CommitNotTaggedException()
-    semantic_tags = list(filter(lambda x: tag_is_semantic(x), applicable_tags))
+    semantic_tags = list(filter(is_semantic_version, applicable_tags))
     if not len(semantic_tags):
         raise CommitTagNotSemanticVersionException()
-    return Version.parse(sorted(semantic_tags, key=lambda x: x.name)[-1].name)
+    return parse_version(semantic_tags[-1])
 
 
-def create_version_tag(repo_path: pathlib.Path, version: Version) -> TagReference:
-    repo_instance = acquire_repo(repo_path=repo_path)
-    new_tag = repo_instance.create_tag(str(version))
+def create_version_tag(
+    repo_path: pathlib.Path,
+    version: Version,
+    session: RepositorySession | None = None,
+) -> TagReference:
+    session = session or RepositorySession(repo_path=repo_path)
+    new_tag = session.create_tag(str(version))
     logger.info(f"Created {new_tag=}")
     return new_tag
 
 
+@profiled("git push", category=GIT)
 def push_version_tag(
-    repo_path: pathlib.Path, tag: TagReference, origin_name: str = "origin"
+    repo_path: pathlib.Path,
+    tag: TagReference,
+    origin_name: str = "origin",
+    session: RepositorySession | None = None,
 ):
-    repo_instance = acquire_repo(repo_path=repo_path)
-    repo_instance.remote(origin_name).push(tag.name)
+    session = session or RepositorySession(repo_path=repo_path)
+    session.repo.remote(origin_name).push(tag.name)
     logger.debug(f"Pushed {tag=} to {origin_name=}")
+
+
+@profiled("git push", category=GIT)
+def push_version_tags(
+    repo_path: pathlib.Path,
+    tags: list[TagReference],
+    origin_name: str = "origin",
+    session: RepositorySession | None = None,
+):
+    """Pushes several tags in a single atomic push, so either all of them reach the remote or none do."""
+    session = session or RepositorySession(repo_path=repo_path)
+    session.repo.remote(origin_name).push(
+        [f"refs/tags/{tag.name}" for tag in tags], atomic=True
+    )
+    logger.debug(f"Pushed {len(tags)} tags to {origin_name=}")
+
+
+def group_package_tags(
+    tag_refs: list[TagRef],
+) -> dict[str, list[tuple[Version, TagRef]]]:
+    """Groups the version tags of every package in a repository in a single pass over its tags. Tags that aren't of the
+    form `<package>/<version>` or `<package>-v<version>` are skipped.
+
+    Returns:
+        dict[str, list[tuple[Version, TagRef]]]: Each version of a package with the tag it came from, lowest version first,
+        keyed by package name.
+    """
+    grouped: dict[str, list[tuple[Version, TagRef]]] = defaultdict(list)
+    for tag in tag_refs:
+        parsed = parse_package_version(tag.name)
+        if parsed is None:
+            continue
+        package, version = parsed
+        grouped[package].append((version, tag))
+    for package_tags in grouped.values():
+        package_tags.sort(key=lambda item: item[0])
+    return dict(grouped)
+
+
+def read_package_versions(
+    repo_path: pathlib.Path, session: RepositorySession | None = None
+) -> dict[str, list[Version]]:
+    """Versions of every package tagged in the repository, lowest first, keyed by package name."""
+    session = session or RepositorySession(repo_path=repo_path)
+    return {
+        package: [version for version, _ in package_tags]
+        for package, package_tags in session.package_tags().items()
+    }
+
+
+def read_latest_package_versions(
+    repo_path: pathlib.Path,
+    packages: list[str],
+    session: RepositorySession | None = None,
+) -> dict[str, Version | None]:
+    """Highest version tagged for each of the packages, or None for a package that has never been tagged."""
+    session = session or RepositorySession(repo_path=repo_path)
+    package_tags = session.package_tags()
+    return {
+        package: package_tags[package][-1][0] if package in package_tags else None
+        for package in packages
+    }
+
+
+@profiled("git diff --name-only", category=GIT)
+def read_changed_paths(
+    repo_path: pathlib.Path, base: str, head: str, paths: list[str]
+) -> list[str]:
+    """Paths under any of `paths` that differ between two commits."""
+    result = subprocess.run(
+        ["git", "diff", "--name-only", "-z", base, head, "--", *paths],
+        cwd=repo_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return [path for path in result.stdout.split("\0") if path]
+
+
+def path_is_in_directory(path: str, directory: str) -> bool:
+    directory = directory.strip("/")
+    return (
+        directory in ("", ".") or path == directory or path.startswith(f"{directory}/")
+    )
+
+
+def read_changed_packages(
+    repo_path: pathlib.Path,
+    packages: dict[str, str],
+    session: RepositorySession | None = None,
+) -> list[str]:
+    """Finds the packages whose directories changed between their latest version tag and HEAD. A package that has never
+    been tagged counts as changed.
+
+    Args:
+        repo_path (pathlib.Path): Top of the repository.
+        packages (dict[str, str]): Directory of each package, relative to the top of the repository, keyed by package name.
+        session (RepositorySession | None, optional): Session to read the tags and HEAD through. Defaults to None, which
+            opens a new one.
+
+    Returns:
+        list[str]: Names of the changed packages, in the order they were given.
+    """
+    session = session or RepositorySession(repo_path=repo_path)
+    head = session.head().sha
+    package_tags = session.package_tags()
+    changed = set()
+    packages_by_base: dict[str, list[str]] = defaultdict(list)
+    for package in packages:
+        if package not in package_tags:
+            changed.add(package)
+            continue
+        _, latest_tag = package_tags[package][-1]
+        packages_by_base[latest_tag.commit].append(package)
+
+    # Packages released from the same commit, which is usually all of them after a combined apply, share a single diff.
+    for base, base_packages in packages_by_base.items():
+        if base == head:
+            continue
+        # A shallow checkout may not have the commit the packages were last tagged on.
+        session.ensure_tag(package_tags[base_packages[0]][-1][1])
+        changed_paths = read_changed_paths(
+            repo_path=repo_path,
+            base=base,
+            head=head,
+            paths=[packages[package] for package in base_packages],
+        )
+        for package in base_packages:
+            if any(
+                path_is_in_directory(path, packages[package]) for path in changed_paths
+            ):
+                changed.add(package)
+    logger.debug(f"{len(changed)} of {len(packages)} packages changed")
+    return [package for package in packages if package in changed]
+
+
+def create_package_version_tags(
+    repo_path: pathlib.Path,
+    versions: dict[str, Version],
+    scheme: str = DEFAULT_PACKAGE_TAG_SCHEME,
+    session: RepositorySession | None = None,
+) -> list[TagReference]:
+    """Creates a tag for the new version of each package, named according to `scheme`."""
+    session = session or RepositorySession(repo_path=repo_path)
+    new_tags = [
+        session.create_tag(format_package_tag(package, version, scheme=scheme))
+        for package, version in versions.items()
+    ]
+    logger.info(f"Created {new_tags=}")
+    return new_tags
@@ -0,0 +1,231 @@
+"""Persistent index of a repository's semantic version tags, kept at .git/launch/semver-index.json.
+
+Tags are almost only ever added, so re-parsing every tag name on every run is wasted work. The index stores each semantic
+version tag already parsed and sorted, together with the commit it points at. It is trusted for as long as the fingerprint of
+packed-refs and the refs/tags directories matches the one it was written with. When the fingerprint changes, only tags that
+are new or have moved are parsed, and the index is rewritten.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from semver import Version
+
+from launch.profiling import profiled
+from launch.versions import parse_versions
+
+from .refs import (
+    TAGS_PREFIX,
+    GitDirectories,
+    TagRef,
+    find_git_directories,
+    read_tag_refs,
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_INDEX_DIRECTORY = "launch"
+VERSION_INDEX_FILE_NAME = "semver-index.json"
+VERSION_INDEX_FORMAT = 1
+# Changes made within this window of the index being written may not have moved a timestamp on filesystems with coarse
+# timestamps, so an index written that soon after its refs last changed is checked against the refs again. Git treats its own
+# index the same way.
+RACY_WINDOW_NS = 2_000_000_000
+
+# A row is (major, minor, patch, prerelease, build, tag name, commit).
+Row = tuple[int, int, int, str | None, str | None, str, str]
+
+
+def row_version(row: Row) -> Version:
+    return Version(*row[:5])
+
+
+@dataclass
+class VersionIndex:
+    # Semantic version tags, sorted from the lowest version to the highest.
+    rows: list[Row] = field(default_factory=list)
+    # Names of tags that aren't semantic versions, kept so that they aren't parsed again.
+    non_semantic: set[str] = field(default_factory=set)
+    fingerprint: str | None = None
+    newest_change_ns: int = 0
+    written_at_ns: int = 0
+
+    def versions(self) -> list[Version]:
+        return [row_version(row) for row in self.rows]
+
+    def latest(self) -> Version | None:
+        return row_version(self.rows[-1]) if self.rows else None
+
+    def is_trusted(self, fingerprint: str, newest_change_ns: int) -> bool:
+        return (
+            self.fingerprint == fingerprint
+            and newest_change_ns < self.written_at_ns - RACY_WINDOW_NS
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "format": VERSION_INDEX_FORMAT,
+            "fingerprint": self.fingerprint,
+            "newest_change_ns": self.newest_change_ns,
+            "written_at_ns": self.written_at_ns,
+            "rows": self.rows,
+            "non_semantic": sorted(self.non_semantic),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "VersionIndex":
+        if data.get("format") != VERSION_INDEX_FORMAT:
+            raise ValueError(f"Unsupported version index format {data.get('format')}")
+        return cls(
+            rows=[tuple(row) for row in data["rows"]],
+            non_semantic=set(data["non_semantic"]),
+            fingerprint=data["fingerprint"],
+            newest_change_ns=data["newest_change_ns"],
+            written_at_ns=data["written_at_ns"],
+        )
+
+
+def version_index_path(directories: GitDirectories) -> pathlib.Path:
+    return directories.common_dir.joinpath(
+        VERSION_INDEX_DIRECTORY, VERSION_INDEX_FILE_NAME
+    )
+
+
+def refs_fingerprint(directories: GitDirectories) -> tuple[str, int]:
+    """Fingerprints the places tags are stored, from file metadata alone. Adding, moving or deleting a loose tag changes the
+    modification time of its directory, and packing or deleting tags rewrites packed-refs.
+
+    Returns:
+        tuple[str, int]: The fingerprint, and the most recent modification time that went into it, in nanoseconds.
+    """
+    parts = []
+    newest_change_ns = 0
+    packed_refs = directories.common_dir.joinpath("packed-refs")
+    try:
+        stat = packed_refs.stat()
+        parts.append(f"packed-refs:{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}")
+        newest_change_ns = stat.st_mtime_ns
+    except FileNotFoundError:
+        parts.append("packed-refs:")
+    tags_directory = directories.common_dir.joinpath(TAGS_PREFIX)
+    for directory, _, _ in os.walk(tags_directory):
+        stat = os.stat(directory)
+        relative = pathlib.Path(directory).relative_to(tags_directory).as_posix()
+        parts.append(f"{relative}:{stat.st_mtime_ns}")
+        newest_change_ns = max(newest_change_ns, stat.st_mtime_ns)
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest(), newest_change_ns
+
+
+def read_version_index_file(path: pathlib.Path) -> VersionIndex | None:
+    try:
+        return VersionIndex.from_json(json.loads(path.read_text()))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable version index at {path}: {e}")
+        return None
+
+
+def write_version_index_file(path: pathlib.Path, index: VersionIndex) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, prefix=f".{path.name}.", delete=False
+        ) as f:
+            json.dump(index.to_json(), f, separators=(",", ":"))
+        os.replace(f.name, path)
+    except OSError as e:
+        # The index only saves time, a read-only repository still works without it.
+        logger.debug(f"Failed to write version index to {path}: {e}")
+
+
+@profiled("version index update")
+def update_version_index(
+    index: VersionIndex, tags: dict[str, str]
+) -> tuple[VersionIndex, int]:
+    """Brings an index in line with the repository's current tags, parsing only tag names it hasn't seen before.
+
+    Args:
+        index (VersionIndex): Index to start from. Left unchanged.
+        tags (dict[str, str]): Commit of every tag in the repository, keyed by tag name.
+
+    Returns:
+        tuple[VersionIndex, int]: The updated index, and how many tag names had to be parsed.
+    """
+    rows = [row for row in index.rows if tags.get(row[5]) == row[6]]
+    known = {row[5] for row in rows}
+    non_semantic = index.non_semantic & tags.keys()
+    moved = {
+        row[5]: row for row in index.rows if row[5] in tags and row[5] not in known
+    }
+    new_names = [
+        name
+        for name in tags
+        if name not in known and name not in non_semantic and name not in moved
+    ]
+    versions = parse_versions(new_names)
+    for name in new_names:
+        if name not in versions:
+            logger.debug(f"Dropping tag={name!r}, does not conform to semantic version")
+            non_semantic.add(name)
+
+    for name, version in versions.items():
+        row = (
+            version.major,
+            version.minor,
+            version.patch,
+            version.prerelease,
+            version.build,
+            name,
+            tags[name],
+        )
+        bisect.insort(rows, row, key=row_version)
+    for name, row in moved.items():
+        # The tag was moved to another commit, its version is unchanged.
+        bisect.insort(rows, row[:6] + (tags[name],), key=row_version)
+    return VersionIndex(rows=rows, non_semantic=non_semantic), len(new_names)
+
+
+@profiled("version index")
+def load_version_index(
+    repo_path: pathlib.Path, read_tags: Callable[[], list[TagRef]] | None = None
+) -> VersionIndex:
+    """Returns the repository's semantic version index, reusing the one stored in .git when the tags haven't changed since it
+    was written and updating it incrementally when they have.
+
+    Args:
+        repo_path (pathlib.Path): Top of the repository.
+        read_tags (Callable[[], list[TagRef]] | None, optional): Lists the repository's tags when the index needs updating,
+            for callers that may have read them already. Defaults to None, which reads them from repo_path.
+
+    Raises:
+        NotAGitRepositoryException: Raised if repo_path isn't the top of a git repository.
+    """
+    directories = find_git_directories(repo_path=repo_path)
+    path = version_index_path(directories)
+    fingerprint, newest_change_ns = refs_fingerprint(directories)
+    index = read_version_index_file(path)
+    if index is not None and index.is_trusted(fingerprint, newest_change_ns):
+        logger.debug(f"Using version index at {path}")
+        return index
+
+    if read_tags is None:
+        tag_refs = read_tag_refs(repo_path=repo_path)
+    else:
+        tag_refs = read_tags()
+    tags = {tag.name: tag.commit for tag in tag_refs}
+    index, parsed = update_version_index(index or VersionIndex(), tags)
+    logger.debug(f"Parsed {parsed} new tag names into the version index")
+    index.fingerprint = fingerprint
+    index.newest_change_ns = newest_change_ns
+    index.written_at_ns = time.time_ns()
+    write_version_index_file(path, index)
+    return index
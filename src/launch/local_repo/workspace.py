@@ -0,0 +1,162 @@
+"""Predicts the next version of every repository cloned under a workspace directory at once.
+
+Each repository is handled in a separate worker process, so the work of reading refs and parsing tags is spread across every
+CPU core instead of being paid for one launch process at a time.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Iterator
+
+from .branch import get_current_branch_name
+from .predict import predict_version
+from .session import RepositorySession
+from .tags import read_latest_semantic_tag
+
+logger = logging.getLogger(__name__)
+
+# How many directories below the workspace root are searched for repositories. Repositories aren't searched for nested
+# repositories, and hidden directories are skipped.
+DEFAULT_DISCOVERY_DEPTH = 3
+# Workers are started from a clean server process instead of being forked from the CLI, whose background threads could
+# leave a lock held in the child. Windows has no forkserver, so it spawns them.
+WORKER_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+@dataclass
+class WorkspacePrediction:
+    # Path of the repository relative to the workspace root.
+    repository: str
+    source_branch: str | None = None
+    latest_version: str | None = None
+    predicted_version: str | None = None
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def discover_repositories(
+    root: pathlib.Path, max_depth: int = DEFAULT_DISCOVERY_DEPTH
+) -> list[pathlib.Path]:
+    """Finds the git working trees under a directory.
+
+    Args:
+        root (pathlib.Path): Directory to search.
+        max_depth (int, optional): How many directories below `root` to search. Defaults to DEFAULT_DISCOVERY_DEPTH.
+
+    Returns:
+        list[pathlib.Path]: Top of every repository found, sorted by path.
+    """
+    root = pathlib.Path(root)
+    repositories = []
+    for directory, subdirectories, file_names in os.walk(root):
+        path = pathlib.Path(directory)
+        if ".git" in subdirectories or ".git" in file_names:
+            repositories.append(path)
+            subdirectories.clear()
+        elif len(path.relative_to(root).parts) >= max_depth:
+            subdirectories.clear()
+        else:
+            subdirectories[:] = [
+                name for name in subdirectories if not name.startswith(".")
+            ]
+    logger.debug(f"Discovered {len(repositories)} repositories under {root}")
+    return sorted(repositories)
+
+
+def read_branch_map(path: pathlib.Path) -> dict[str, str]:
+    """Reads a JSON object naming the source branch to predict each repository's version from, keyed by the repository's
+    path relative to the workspace root.
+
+    Raises:
+        ValueError: Raised if the file doesn't hold a JSON object of strings.
+    """
+    branch_map = json.loads(pathlib.Path(path).read_text())
+    if not isinstance(branch_map, dict) or not all(
+        isinstance(key, str) and isinstance(value, str)
+        for key, value in branch_map.items()
+    ):
+        raise ValueError(
+            f"{path} must contain a JSON object mapping repository paths to branch names"
+        )
+    return branch_map
+
+
+def predict_repository(
+    root: pathlib.Path, repo_path: pathlib.Path, source_branch: str | None = None
+) -> WorkspacePrediction:
+    """Predicts the next version of a single repository. Runs in a worker process, so failures are reported in the result
+    rather than raised.
+
+    Args:
+        root (pathlib.Path): Workspace root the repository was found under.
+        repo_path (pathlib.Path): Top of the repository.
+        source_branch (str | None, optional): Branch to predict the version from. Defaults to None, which uses the
+            repository's current branch.
+    """
+    prediction = WorkspacePrediction(
+        repository=pathlib.Path(repo_path).relative_to(root).as_posix(),
+        source_branch=source_branch,
+    )
+    try:
+        session = RepositorySession(repo_path=repo_path)
+        if prediction.source_branch is None:
+            prediction.source_branch = get_current_branch_name(
+                repo_path=repo_path, session=session
+            )
+        latest_version = read_latest_semantic_tag(repo_path=repo_path, session=session)
+        prediction.latest_version = str(latest_version) if latest_version else None
+        prediction.predicted_version = str(
+            predict_version(
+                existing_tags=[],
+                known_latest=latest_version,
+                branch_name=prediction.source_branch,
+            )
+        )
+    except Exception as e:
+        prediction.error = str(e)
+    return prediction
+
+
+def predict_workspace(
+    root: pathlib.Path,
+    repositories: list[pathlib.Path],
+    branch_map: dict[str, str] | None = None,
+    max_workers: int | None = None,
+) -> Iterator[WorkspacePrediction]:
+    """Predicts the next version of many repositories on a pool of worker processes, yielding each result as soon as its
+    repository is done.
+
+    Args:
+        root (pathlib.Path): Workspace root the repositories were found under.
+        repositories (list[pathlib.Path]): Top of every repository to predict.
+        branch_map (dict[str, str] | None, optional): Source branch of each repository, keyed by its path relative to `root`.
+            Repositories missing from the map use their current branch. Defaults to None.
+        max_workers (int | None, optional): Number of worker processes. Defaults to None, which uses one per CPU core.
+    """
+    root = pathlib.Path(root)
+    branch_map = branch_map or {}
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+    ) as executor:
+        futures = [
+            executor.submit(
+                predict_repository,
+                root,
+                repo_path,
+                branch_map.get(pathlib.Path(repo_path).relative_to(root).as_posix()),
+            )
+            for repo_path in repositories
+        ]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,257 @@
+"""Opt-in profiling of a single CLI invocation, enabled with the global --profile flag.
+
+While enabled, instrumented functions record how long each phase of a command took, every HTTP request sent to GitHub is
+counted by endpoint, and git subprocesses and ref scans are timed. Nothing is recorded otherwise, and an instrumented
+function then costs a single global lookup per call.
+"""
+
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Iterator, Mapping, TypeVar
+from urllib.parse import urlsplit
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PHASE = "phase"
+GIT = "git"
+HTTP = "http"
+
+# Applied in order to the path of a request URL, so that requests for different repositories, teams and branches are
+# counted against the same endpoint.
+ENDPOINT_TEMPLATES = [
+    (re.compile(r"/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/orgs/[^/]+"), "/orgs/{org}"),
+    (re.compile(r"/teams/[^/]+"), "/teams/{team_slug}"),
+    (re.compile(r"/branches/[^/]+"), "/branches/{branch}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+]
+
+
+def endpoint_template(method: str, url: str) -> str:
+    """The method and templated path of a request, e.g. GET /repos/{owner}/{repo}/hooks."""
+    path = urlsplit(url).path or "/"
+    for pattern, replacement in ENDPOINT_TEMPLATES:
+        path = pattern.sub(replacement, path)
+    return f"{method} {path}"
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Profiler:
+    """Collects the spans recorded during one CLI invocation. Safe to record into from any thread."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.started = clock()
+        self.spans: list[Span] = []
+        self.thread_names: dict[int, str] = {}
+        # Lowest and highest X-RateLimit-Used seen in each rate limit window, keyed by the window's reset time.
+        self._rate_limit_used: dict[str, tuple[int, int]] = {}
+        self._rate_limit_remaining: int | None = None
+        self._rate_limit_limit: int | None = None
+
+    def now(self) -> float:
+        return self._clock()
+
+    def record(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> None:
+        thread = threading.current_thread()
+        span = Span(
+            name=name,
+            category=category,
+            start=start,
+            duration=end - start,
+            thread_id=thread.native_id or 0,
+            args=args,
+        )
+        with self._lock:
+            self.spans.append(span)
+            self.thread_names.setdefault(span.thread_id, thread.name)
+
+    def record_http(
+        self,
+        method: str,
+        url: str,
+        status_code: int,
+        start: float,
+        end: float,
+        headers: Mapping[str, str],
+    ) -> None:
+        """Records one request sent to GitHub, along with the rate limit GitHub reported in its response."""
+        self.record(
+            endpoint_template(method, url),
+            HTTP,
+            start,
+            end,
+            url=url,
+            status=status_code,
+        )
+        try:
+            used = int(headers["X-RateLimit-Used"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            limit = int(headers["X-RateLimit-Limit"])
+            reset = headers["X-RateLimit-Reset"]
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            lowest, highest = self._rate_limit_used.get(reset, (used, used))
+            self._rate_limit_used[reset] = (min(lowest, used), max(highest, used))
+            self._rate_limit_remaining = remaining
+            self._rate_limit_limit = limit
+
+    def rate_limit_consumed(self) -> int | None:
+        """Requests counted against the primary rate limit during this invocation, or None if GitHub never reported it."""
+        if not self._rate_limit_used:
+            return None
+        # The first response seen in a window already counts the request it answers.
+        return sum(
+            highest - lowest + 1 for lowest, highest in self._rate_limit_used.values()
+        )
+
+    def summary(self) -> str:
+        """A plain-text table of the time spent in each phase, HTTP endpoint and git operation."""
+        elapsed = self.now() - self.started
+        groups: dict[tuple[str, str], list[Span]] = defaultdict(list)
+        for span in self.spans:
+            groups[(span.category, span.name)].append(span)
+
+        lines = [f"Profile: {elapsed * 1000:.1f} ms wall time"]
+        for category, title in [
+            (PHASE, "Phase"),
+            (HTTP, "HTTP endpoint"),
+            (GIT, "Git"),
+        ]:
+            rows = sorted(
+                (
+                    (name, spans)
+                    for (span_category, name), spans in groups.items()
+                    if span_category == category
+                ),
+                key=lambda row: -sum(span.duration for span in row[1]),
+            )
+            if not rows:
+                continue
+            width = max(len(title), *(len(name) for name, _ in rows))
+            header = f"{title:<{width}}  {'Calls':>7}  {'Total ms':>10}  {'Max ms':>9}"
+            if category == HTTP:
+                header += f"  {'304':>6}  {'Errors':>6}"
+            lines += ["", header]
+            for name, spans in rows:
+                total = sum(span.duration for span in spans)
+                longest = max(span.duration for span in spans)
+                line = f"{name:<{width}}  {len(spans):>7}  {total * 1000:>10.1f}  {longest * 1000:>9.1f}"
+                if category == HTTP:
+                    not_modified = sum(span.args["status"] == 304 for span in spans)
+                    errors = sum(span.args["status"] >= 400 for span in spans)
+                    line += f"  {not_modified:>6}  {errors:>6}"
+                lines.append(line)
+
+        consumed = self.rate_limit_consumed()
+        if consumed is not None:
+            lines += [
+                "",
+                f"GitHub rate limit: {consumed} requests used, {self._rate_limit_remaining} of "
+                f"{self._rate_limit_limit} remaining",
+            ]
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """The recorded spans in the Trace Event Format read by chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": name},
+            }
+            for thread_id, name in self.thread_names.items()
+        ]
+        for span in self.spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start - self.started) * 1_000_000,
+                    "dur": span.duration * 1_000_000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": span.args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: pathlib.Path) -> None:
+        pathlib.Path(path).write_text(json.dumps(self.chrome_trace()))
+
+
+_profiler: Profiler | None = None
+
+
+def enable_profiling() -> Profiler:
+    """Starts recording for the rest of the process, or until disable_profiling() is called."""
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling() -> Profiler | None:
+    """Stops recording, and returns what was recorded so far."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def get_profiler() -> Profiler | None:
+    """The active profiler, or None when profiling isn't enabled."""
+    return _profiler
+
+
+@contextmanager
+def phase(name: str, category: str = PHASE, **args: Any) -> Iterator[None]:
+    """Records the time spent in the body of the with statement under `name`, when profiling is enabled."""
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    start = profiler.now()
+    try:
+        yield
+    finally:
+        profiler.record(name, category, start, profiler.now(), **args)
+
+
+def profiled(name: str, category: str = PHASE) -> Callable[[F], F]:
+    """Decorator recording every call of the decorated function as a phase named `name`, when profiling is enabled."""
+
+    def decorator(f: F) -> F:
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return f(*args, **kwargs)
+            with phase(name, category):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
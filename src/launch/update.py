@@ -1,13 +1,32 @@
+import json
 import logging
+import os
+import pathlib
+import tempfile
+import time
+from functools import cache
 
+import requests
 from semver import Version
 
 from launch import GITHUB_ORG_NAME, GITHUB_REPO_NAME, SEMANTIC_VERSION
-from launch.github.auth import get_anonymous_github_instance
-from launch.github.tags import get_repo_semantic_versions
+from launch.env import UPDATE_CHECK_FAILURE_TTL, UPDATE_CHECK_TTL, cache_directory
+from launch.github.tags import RECENT_VERSION_LIMIT, get_recent_semantic_versions
 
 logger = logging.getLogger(__name__)
 
+UPDATE_CACHE_FILE_NAME = "update-check.json"
+# Very short timeout to limit the amount of time we spend on this if there's problems on the GitHub side.
+UPDATE_CHECK_TIMEOUT = 1
+
+
+@cache
+def get_update_check_session() -> requests.Session:
+    """Session for the update check, kept apart from the shared session in launch.github.client. The check's anonymous
+    requests are neither paced nor retried by the shared rate limit scheduler, and a rate limited check can't make the
+    command's own requests wait for the anonymous rate limit to reset."""
+    return requests.Session()
+
 
 def latest_version(
     versions: list[Version], include_prerelease: bool = False
@@ -31,8 +50,79 @@ def latest_version(
         return max(greater_versions)
 
 
+def update_cache_path() -> pathlib.Path:
+    return cache_directory().joinpath(UPDATE_CACHE_FILE_NAME)
+
+
+def read_update_cache(now: float | None = None) -> list[Version] | None:
+    """Reads the result of a previous update check from the on-disk cache, if it hasn't expired yet. Successful and failed
+    checks expire after UPDATE_CHECK_TTL and UPDATE_CHECK_FAILURE_TTL seconds respectively.
+
+    Args:
+        now (float | None, optional): Current time as a UNIX timestamp. Defaults to the current system time.
+
+    Returns:
+        list[Version] | None: Versions recorded by the previous check (empty if that check failed), or None if there is no
+        usable cache entry and GitHub should be asked again.
+    """
+    if now is None:
+        now = time.time()
+    try:
+        cached = json.loads(update_cache_path().read_text())
+        checked_at = float(cached["checked_at"])
+        succeeded = bool(cached["succeeded"])
+        versions = [Version.parse(v) for v in cached["versions"]]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable update check cache: {e}")
+        return None
+
+    ttl = UPDATE_CHECK_TTL if succeeded else UPDATE_CHECK_FAILURE_TTL
+    age = now - checked_at
+    if not 0 <= age < ttl:
+        logger.debug(f"Update check cache expired {age - ttl:.0f}s ago")
+        return None
+    logger.debug(f"Using update check cache from {age:.0f}s ago ({succeeded=})")
+    return versions
+
+
+def write_update_cache(
+    versions: list[Version], succeeded: bool, now: float | None = None
+) -> None:
+    """Records the result of an update check in the on-disk cache. Only the newest release and the newest prerelease are kept,
+    which is all that latest_version needs to answer either setting of include_prerelease. The file is written to a temporary
+    path and atomically moved into place, so concurrent CLI processes never observe a partially-written cache.
+
+    Args:
+        versions (list[Version]): Versions that were discovered by the update check.
+        succeeded (bool): Whether the update check succeeded. Failures are cached so that an outage isn't retried on every run.
+        now (float | None, optional): Current time as a UNIX timestamp. Defaults to the current system time.
+    """
+    if now is None:
+        now = time.time()
+    newest_release = max((v for v in versions if v.prerelease is None), default=None)
+    newest_any = max(versions, default=None)
+    payload = {
+        "checked_at": now,
+        "succeeded": succeeded,
+        "versions": sorted({str(v) for v in (newest_release, newest_any) if v}),
+    }
+    cache_path = update_cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            mode="w", dir=cache_path.parent, prefix=f".{cache_path.name}.", delete=False
+        ) as temporary_file:
+            json.dump(payload, temporary_file)
+        os.replace(temporary_file.name, cache_path)
+    except Exception as e:
+        logger.debug(f"Failed to write update check cache to {cache_path}: {e}")
+
+
 def check_for_updates(include_prerelease: bool = False) -> Version | None:
-    """Checks the repository where this tool lives to see if any new versions are available.
+    """Checks the repository where this tool lives to see if any new versions are available. Results are cached on disk,
+    see read_update_cache for details.
 
     Args:
         include_prerelease (bool, optional): Include prerelease versions in the version search. Defaults to False.
@@ -40,15 +130,22 @@ def check_for_updates(include_prerelease: bool = False) -> Version | None:
     Returns:
         Version | None: If there's an update available, returns a Version, otherwise None.
     """
-    try:
-        # Very short timeout to limit the amount of time we spend on this if there's problems on the GitHub side.
-        g = get_anonymous_github_instance(timeout=1)
-        repo = g.get_repo(full_name_or_id=f"{GITHUB_ORG_NAME}/{GITHUB_REPO_NAME}")
-        available_versions = get_repo_semantic_versions(repo=repo)
-        return latest_version(
-            versions=available_versions, include_prerelease=include_prerelease
-        )
-    except Exception as e:
-        # If anything goes wrong, we'll just skip the update check and log to debug
-        logger.debug(f"Failure during check_for_updates: {e}")
-        pass
+    available_versions = read_update_cache()
+    if available_versions is None:
+        try:
+            # Only the most recent releases are fetched, so the cost of this doesn't grow with our release history.
+            available_versions = get_recent_semantic_versions(
+                full_name=f"{GITHUB_ORG_NAME}/{GITHUB_REPO_NAME}",
+                session=get_update_check_session(),
+                limit=RECENT_VERSION_LIMIT,
+                timeout=UPDATE_CHECK_TIMEOUT,
+            )
+            write_update_cache(versions=available_versions, succeeded=True)
+        except Exception as e:
+            # If anything goes wrong, we'll just skip the update check and log to debug
+            logger.debug(f"Failure during check_for_updates: {e}")
+            write_update_cache(versions=[], succeeded=False)
+            return None
+    return latest_version(
+        versions=available_versions, include_prerelease=include_prerelease
+    )
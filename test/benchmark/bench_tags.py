@@ -0,0 +1,249 @@
+"""Benchmarks the tag reading and versioning hot paths against synthetic repositories with 100, 10k and 100k tags, and the
+cold start of the CLI.
+
+Run with `python -m test.benchmark.bench_tags --output results.json`. Not collected by pytest. Results are written as JSON so
+that two runs, such as before and after a change, can be compared with `--compare baseline.json`, which exits with status 1
+when any benchmark's fastest run got slower than `--threshold` times the baseline's. The fastest run is compared, rather than
+the median, because it's the least affected by whatever else the machine is doing.
+
+Each in-process benchmark is run `--repeat` times against a fresh RepositorySession, so nothing read by one run is reused
+by the next. The "cold" variants also delete the version index in .git and clear the parsed version cache first.
+"""
+
+import argparse
+import datetime
+import json
+import pathlib
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable
+
+from launch.local_repo import predict, tags
+from launch.local_repo.refs import find_git_directories
+from launch.local_repo.session import RepositorySession
+from launch.local_repo.version_index import version_index_path
+from launch.versions import parse_version
+
+from .repos import make_tagged_repo
+
+RESULTS_FORMAT = 1
+DEFAULT_TAG_COUNTS = [100, 10_000, 100_000]
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 1.25
+# Differences smaller than this are timer noise, however large the ratio.
+MIN_REGRESSION_SECONDS = 0.001
+SOURCE_BRANCH = "feature/benchmark"
+
+
+def measure(
+    function: Callable[[], object],
+    repeat: int,
+    setup: Callable[[], None] | None = None,
+) -> dict[str, float]:
+    # One untimed run first, so that imports and other one-off costs aren't counted against the first repetition.
+    if setup:
+        setup()
+    function()
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def clear_version_index(repo_path: pathlib.Path) -> Callable[[], None]:
+    def setup():
+        version_index_path(find_git_directories(repo_path=repo_path)).unlink(
+            missing_ok=True
+        )
+        parse_version.cache_clear()
+
+    return setup
+
+
+def run_cli(*args: str) -> None:
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from launch.cli.entrypoint import cli; cli()",
+            *args,
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+def repository_benchmarks(
+    repo_path: pathlib.Path,
+) -> dict[str, tuple[Callable[[], object], Callable[[], None] | None]]:
+    def session() -> RepositorySession:
+        return RepositorySession(repo_path=repo_path)
+
+    versions = tags.read_semantic_tags(repo_path=repo_path)
+    latest = versions[-1]
+    return {
+        "read_tags": (lambda: tags.read_tags(repo_path, session=session()), None),
+        "read_semantic_tags[cold]": (
+            lambda: tags.read_semantic_tags(repo_path, session=session()),
+            clear_version_index(repo_path),
+        ),
+        "read_semantic_tags[warm]": (
+            lambda: tags.read_semantic_tags(repo_path, session=session()),
+            None,
+        ),
+        "read_version_tag": (
+            lambda: tags.read_version_tag(repo_path, session=session()),
+            None,
+        ),
+        "read_semantic_version_tag": (
+            lambda: tags.read_semantic_version_tag(repo_path, session=session()),
+            None,
+        ),
+        "predict_version[existing_tags]": (
+            lambda: predict.predict_version(
+                existing_tags=versions, branch_name=SOURCE_BRANCH
+            ),
+            None,
+        ),
+        "predict_version[known_latest]": (
+            lambda: predict.predict_version(
+                existing_tags=[], known_latest=latest, branch_name=SOURCE_BRANCH
+            ),
+            None,
+        ),
+        "cli:version predict": (
+            lambda: run_cli(
+                "github",
+                "version",
+                "predict",
+                "--repo-path",
+                str(repo_path),
+                "--source-branch",
+                SOURCE_BRANCH,
+            ),
+            None,
+        ),
+    }
+
+
+def run_benchmarks(
+    workdir: pathlib.Path, tag_counts: list[int], repeat: int
+) -> list[dict]:
+    results = []
+
+    def record(name: str, tag_count: int | None, timings: dict[str, float]):
+        results.append(
+            {"benchmark": name, "tags": tag_count, "repeat": repeat, **timings}
+        )
+        print(
+            f"{name:<35} {str(tag_count or '-'):>7} tags "
+            f"{timings['median'] * 1000:10.2f} ms median",
+            file=sys.stderr,
+        )
+
+    record("cli:--help", None, measure(lambda: run_cli("--help"), repeat))
+    for tag_count in tag_counts:
+        print(f"Preparing a repository with {tag_count} tags", file=sys.stderr)
+        repo_path = make_tagged_repo(workdir.joinpath(f"tags-{tag_count}"), tag_count)
+        for name, (function, setup) in repository_benchmarks(repo_path).items():
+            record(name, tag_count, measure(function, repeat, setup=setup))
+    return results
+
+
+def current_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=pathlib.Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> bool:
+    """Prints how each benchmark's fastest run compares to a baseline run. Returns whether none regressed past the threshold by
+    more than MIN_REGRESSION_SECONDS."""
+    baseline_timings = {
+        (result["benchmark"], result["tags"]): result["min"]
+        for result in baseline["results"]
+    }
+    passed = True
+    for result in results:
+        key = (result["benchmark"], result["tags"])
+        if key not in baseline_timings:
+            continue
+        ratio = result["min"] / baseline_timings[key]
+        regressed = (
+            ratio > threshold
+            and result["min"] - baseline_timings[key] > MIN_REGRESSION_SECONDS
+        )
+        passed = passed and not regressed
+        print(
+            f"{result['benchmark']:<35} {str(result['tags'] or '-'):>7} tags "
+            f"{ratio:6.2f}x{'  REGRESSED' if regressed else ''}"
+        )
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--tags",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=DEFAULT_TAG_COUNTS,
+        help="Comma-separated numbers of tags in the synthetic repositories.",
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        "--workdir",
+        type=pathlib.Path,
+        help="Directory the synthetic repositories are kept in, and reused from on later runs. Defaults to a temporary directory.",
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="Write results here.")
+    parser.add_argument("--compare", type=pathlib.Path, help="Baseline results.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    workdir = args.workdir or pathlib.Path(tempfile.mkdtemp(prefix="launch-bench-"))
+    try:
+        results = run_benchmarks(workdir, tag_counts=args.tags, repeat=args.repeat)
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    document = {
+        "format": RESULTS_FORMAT,
+        "commit": current_commit(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+    else:
+        print(json.dumps(document, indent=2))
+
+    if args.compare and not compare(
+        results, json.loads(args.compare.read_text()), threshold=args.threshold
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Micro-benchmark for launch.versions against calling Version.parse on every tag name.
+
+Run with `python -m test.benchmark.bench_versions`. Not collected by pytest.
+"""
+
+import argparse
+import time
+
+from semver import Version
+
+from launch import versions
+
+from .repos import make_tag_names
+
+
+def parse_with_exceptions(names: list[str]) -> list[Version]:
+    parsed = []
+    for name in names:
+        try:
+            parsed.append(Version.parse(name))
+        except ValueError:
+            pass
+    return parsed
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--semantic-ratio", type=float, default=0.6)
+    args = parser.parse_args()
+
+    names = make_tag_names(args.count, args.semantic_ratio)
+    print(f"{args.count} tag names, {args.semantic_ratio:.0%} semantic versions")
+
+    baseline = timed("Version.parse with try/except", parse_with_exceptions, names)
+    versions.parse_version.cache_clear()
+    screened = timed("parse_versions (cold cache)", versions.parse_versions, names)
+    timed("parse_versions (warm cache)", versions.parse_versions, names)
+    screened = list(screened.values())
+    assert screened == baseline
+
+    timed("sorted(versions)[-1]", lambda v: sorted(v)[-1], screened)
+    timed("latest_version", versions.latest_version, screened)
+    timed("top_versions(k=10)", versions.top_versions, screened, 10)
+
+
+if __name__ == "__main__":
+    main()
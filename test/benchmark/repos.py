@@ -0,0 +1,91 @@
+"""Generates synthetic repositories with many tags for the benchmarks.
+
+Repositories are written with a single `git fast-import` stream, one empty commit per tag, so that even 100k tags take only
+a few seconds to create. A tenth of the tags are annotated and the refs are packed afterwards, as they would be in a
+long-lived repository.
+"""
+
+import os
+import pathlib
+import random
+import subprocess
+import time
+
+GIT_IDENTITY = "Launch Benchmark <launch-benchmark@example.com>"
+# The refs of a generated repository are backdated by this many seconds, so that the version index written by the first
+# benchmark isn't distrusted for having been written just after the refs changed.
+REFS_AGE_SECONDS = 60 * 60
+
+
+def make_tag_names(
+    count: int, semantic_ratio: float = 0.75, seed: int = 0
+) -> list[str]:
+    """Unique tag names, ending with the highest release. semantic_ratio of them are versions, a fifth of which are
+    prereleases, and the rest are junk: by default about 60% releases, 15% prereleases and 25% junk.
+    """
+    rng = random.Random(seed)
+    names = []
+    for i in range(count - 1):
+        roll = rng.random()
+        version = f"{i // 10000}.{i // 100 % 100}.{i % 100}"
+        if roll < semantic_ratio * 0.8:
+            names.append(version)
+        elif roll < semantic_ratio:
+            names.append(f"{version}-rc.{rng.randrange(5)}")
+        else:
+            names.append(rng.choice(["release/", "deploy-", "v", "build-"]) + str(i))
+    names.append(f"{count // 10000 + 1}.0.0")
+    return names
+
+
+def fast_import_stream(tag_names: list[str]) -> str:
+    lines = []
+    for mark, name in enumerate(tag_names, start=1):
+        lines += [
+            "commit refs/heads/main",
+            f"mark :{mark}",
+            f"committer {GIT_IDENTITY} {mark} +0000",
+            f"data {len(name)}",
+            name,
+        ]
+        if mark > 1:
+            lines.append(f"from :{mark - 1}")
+        lines.append("")
+        if mark % 10 == 0:
+            lines += [
+                f"tag {name}",
+                f"from :{mark}",
+                f"tagger {GIT_IDENTITY} {mark} +0000",
+                f"data {len(name)}",
+                name,
+            ]
+        else:
+            lines += [f"reset refs/tags/{name}", f"from :{mark}", ""]
+    return "\n".join(lines) + "\n"
+
+
+def make_tagged_repo(path: pathlib.Path, tag_count: int) -> pathlib.Path:
+    """Creates a repository at `path` with `tag_count` tags, one per commit, HEAD carrying the highest release. An existing
+    repository at `path` is reused."""
+    path = pathlib.Path(path)
+    if path.joinpath(".git", "packed-refs").is_file():
+        return path
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(
+        ["git", "init", "--quiet", "--initial-branch=main"], cwd=path, check=True
+    )
+    subprocess.run(
+        ["git", "fast-import", "--quiet"],
+        cwd=path,
+        input=fast_import_stream(make_tag_names(tag_count)),
+        text=True,
+        check=True,
+    )
+    subprocess.run(["git", "pack-refs", "--all"], cwd=path, check=True)
+    subprocess.run(["git", "checkout", "--quiet", "main"], cwd=path, check=True)
+    backdated = time.time() - REFS_AGE_SECONDS
+    git_dir = path.joinpath(".git")
+    for directory, _, _ in os.walk(git_dir.joinpath("refs", "tags")):
+        os.utime(directory, (backdated, backdated))
+    os.utime(git_dir.joinpath("packed-refs"), (backdated, backdated))
+    return path
@@ -4,6 +4,13 @@ import pytest
 from click import testing as click_testing
 from git.repo import Repo
 
+from launch.github import auth, client
+from launch.github.ratelimit import get_rate_limit_scheduler
+
+from .loadtest.server import StandInServer, StandInState, start_stand_in
+
+pytest_plugins = ["test.request_budget"]
+
 
 @pytest.fixture
 def cli_runner():
@@ -28,6 +35,14 @@ def set_environment_variables():
     os.environ.update(old_environment)
 
 
+@pytest.fixture(scope="function", autouse=True)
+def isolated_cache_directory(tmp_path_factory, monkeypatch):
+    """Keeps on-disk caches written during tests out of the user's real cache directory, and out of other tests."""
+    cache_home = tmp_path_factory.mktemp("xdg_cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    yield cache_home.joinpath("launch-cli")
+
+
 @pytest.fixture(scope="function")
 def example_github_repo(tmp_path):
     temp_repo = Repo.init(path=tmp_path, initial_branch="main")
@@ -36,3 +51,30 @@ def example_github_repo(tmp_path):
     temp_repo.index.commit("Added test.txt")
     temp_repo.create_tag("0.1.0")
     yield temp_repo
+
+
+@pytest.fixture(scope="function")
+def github_stand_in(monkeypatch):
+    """Starts a GitHub stand-in from test.loadtest.server serving the given state, and points launch.github at it for the
+    rest of the test."""
+    servers: list[StandInServer] = []
+
+    def start(state: StandInState) -> StandInServer:
+        server = start_stand_in(state)
+        servers.append(server)
+        monkeypatch.setattr(auth, "GITHUB_API_URL", server.url)
+        monkeypatch.setattr(client, "GITHUB_API_URL", server.url)
+        # Pacing and write spacing only slow the test down, they don't change which requests are made.
+        monkeypatch.setattr(auth, "GITHUB_SECONDS_BETWEEN_WRITES", 0)
+        monkeypatch.setattr(
+            get_rate_limit_scheduler(), "requests_per_second", 1_000_000
+        )
+        auth.shared_github_instance.cache_clear()
+        return server
+
+    yield start
+
+    auth.shared_github_instance.cache_clear()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,203 @@
+"""Load test for the bulk GitHub commands, run against the local GitHub stand-in from test.loadtest.server.
+
+Each scenario runs the CLI in a fresh process against an organization of `--repositories` repositories and reports its
+wall time, throughput in repositories and requests per second, the p50 and p99 latency of the requests as the stand-in
+served them, and the peak resident memory of the CLI process. Scenarios run in order against the same stand-in, so the
+second set-default run finds every repository already configured by the first.
+
+Run with `python -m test.loadtest.harness --repositories 2000 --latency-ms 40 --output results.json`. Not collected by
+pytest.
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import time
+
+from .server import StandInConfig, StandInServer, generate_state, start_stand_in
+
+ORGANIZATION = "loadtest"
+HOOK_URL = "https://hooks.example.com/loadtest"
+SCENARIOS: dict[str, list[str]] = {
+    "access set-default --dry-run": [
+        "github",
+        "access",
+        "set-default",
+        "--all",
+        "--dry-run",
+    ],
+    "access set-default": ["github", "access", "set-default", "--all"],
+    "access set-default (already applied)": [
+        "github",
+        "access",
+        "set-default",
+        "--all",
+    ],
+    "hooks create": ["github", "hooks", "create", "--all", "--url", HOOK_URL],
+}
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def cli_environment(
+    server: StandInServer,
+    cache_home: pathlib.Path,
+    cache: bool,
+    requests_per_second: int | None,
+) -> dict[str, str]:
+    environment = {
+        **os.environ,
+        "GITHUB_TOKEN": "loadtest-token",
+        "LAUNCH_CLI_GITHUB_API_URL": server.url,
+        "LAUNCH_CLI_GITHUB_CACHE": str(cache).lower(),
+        "LAUNCH_CLI_UPDATE_CHECK": "false",
+        "XDG_CACHE_HOME": str(cache_home),
+    }
+    if requests_per_second:
+        environment["LAUNCH_CLI_GITHUB_REQUESTS_PER_SECOND"] = str(requests_per_second)
+    return environment
+
+
+def run_scenario(
+    server: StandInServer,
+    name: str,
+    args: list[str],
+    environment: dict[str, str],
+    repository_count: int,
+    max_workers: int,
+) -> dict:
+    """Runs one CLI command against the stand-in and measures it."""
+    server.reset_stats()
+    command = [
+        sys.executable,
+        "-c",
+        "from launch.cli.entrypoint import cli; cli()",
+        *args,
+        "--organization",
+        ORGANIZATION,
+        "--max-workers",
+        str(max_workers),
+    ]
+    with tempfile.TemporaryFile() as output:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            command, env=environment, stdout=output, stderr=subprocess.STDOUT
+        )
+        # wait4 reports the resource usage of this one process, rather than of every child together.
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        output.seek(0)
+        output_tail = output.read()[-2000:].decode(errors="replace")
+
+    with server.stats_lock:
+        latencies = list(server.latencies)
+        request_counts = dict(server.request_counts)
+    return {
+        "scenario": name,
+        "command": args,
+        "exit_code": process.returncode,
+        "repositories": repository_count,
+        "seconds": elapsed,
+        "repositories_per_second": repository_count / elapsed,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_p50_ms": (percentile(latencies, 0.50) or 0) * 1000,
+        "latency_p99_ms": (percentile(latencies, 0.99) or 0) * 1000,
+        # ru_maxrss is in kilobytes on Linux.
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+        "requests_by_route": request_counts,
+        "output_tail": output_tail if process.returncode else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--repositories", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--latency-jitter-ms", type=float, default=10)
+    parser.add_argument("--rate-limit", type=int, default=StandInConfig.rate_limit)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument(
+        "--requests-per-second",
+        type=int,
+        help="Overrides the CLI's request pacing, which otherwise caps every scenario at its default rate.",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=list(SCENARIOS),
+        help="Scenario to run, may be repeated. Defaults to every scenario.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Leave the on-disk response cache enabled, as it is by default for users.",
+    )
+    parser.add_argument("--output", type=pathlib.Path, help="Write results here.")
+    args = parser.parse_args()
+
+    server = start_stand_in(
+        generate_state(organization=ORGANIZATION, repository_count=args.repositories),
+        config=StandInConfig(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            rate_limit=args.rate_limit,
+        ),
+    )
+    results = []
+    with tempfile.TemporaryDirectory(prefix="launch-loadtest-") as cache_home:
+        environment = cli_environment(
+            server,
+            cache_home=pathlib.Path(cache_home),
+            cache=args.cache,
+            requests_per_second=args.requests_per_second,
+        )
+        for name in args.scenario or list(SCENARIOS):
+            result = run_scenario(
+                server,
+                name=name,
+                args=SCENARIOS[name],
+                environment=environment,
+                repository_count=args.repositories,
+                max_workers=args.max_workers,
+            )
+            results.append(result)
+            print(
+                f"{name:<38} exit={result['exit_code']} {result['seconds']:8.2f}s "
+                f"{result['repositories_per_second']:8.1f} repos/s {result['requests']:7d} requests "
+                f"p50={result['latency_p50_ms']:.1f}ms p99={result['latency_p99_ms']:.1f}ms "
+                f"rss={result['peak_rss_mb']:.0f}MB",
+                file=sys.stderr,
+            )
+    server.shutdown()
+
+    document = {
+        "repositories": args.repositories,
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.latency_jitter_ms,
+        "max_workers": args.max_workers,
+        "requests_per_second": args.requests_per_second,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+    else:
+        print(json.dumps(document, indent=2))
+    if any(result["exit_code"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
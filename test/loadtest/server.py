@@ -0,0 +1,708 @@
+"""Local stand-in for the parts of the GitHub REST API that launch uses, for load testing the bulk commands against an
+organization of thousands of repositories without touching GitHub.
+
+Covered: organizations and their repositories, teams with their repository permissions, repositories, branches and branch
+protection, webhooks, tags, releases and /rate_limit. Listings are paginated with Link headers the way GitHub does, every
+response carries X-RateLimit-* headers drawn from a per-token budget, GET responses carry an ETag and honor If-None-Match,
+and a configurable latency is added to every request. GraphQL isn't covered.
+
+Run standalone with `python -m test.loadtest.server --repositories 5000 --latency-ms 50`, then point the CLI at it with
+LAUNCH_CLI_GITHUB_API_URL.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from launch.github.access import (
+    PLATFORM_ADMIN_TEAM_SLUG,
+    PLATFORM_TEAM_SLUG,
+    REPO_PREFIX_ADMIN_TEAM_SLUG,
+)
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+TEAM_SLUGS = list(
+    dict.fromkeys(
+        [
+            PLATFORM_TEAM_SLUG,
+            PLATFORM_ADMIN_TEAM_SLUG,
+            *REPO_PREFIX_ADMIN_TEAM_SLUG.values(),
+        ]
+    )
+)
+# Most repositories are named so that they have a domain-specific administrative team, the last prefix matches none.
+REPOSITORY_PREFIXES = [*REPO_PREFIX_ADMIN_TEAM_SLUG, "misc-"]
+PERMISSION_LEVELS = {
+    "pull": ["pull"],
+    "triage": ["pull", "triage"],
+    "push": ["pull", "triage", "push"],
+    "maintain": ["pull", "triage", "push", "maintain"],
+    "admin": ["pull", "triage", "push", "maintain", "admin"],
+}
+
+
+class StandInError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class StandInConfig:
+    # Added to every request, in milliseconds, plus up to latency_jitter_ms of random extra.
+    latency_ms: float = 0
+    latency_jitter_ms: float = 0
+    # Requests each token may make per rate limit window. Requests beyond it are answered 403 until the window resets.
+    rate_limit: int = 1_000_000
+    rate_limit_window_seconds: int = 3600
+
+
+@dataclass
+class StandInState:
+    """The organizations, teams, repositories and everything in them that the stand-in serves, guarded by one lock."""
+
+    organizations: dict[str, dict] = field(default_factory=dict)
+    repositories: dict[str, dict] = field(default_factory=dict)
+    teams: dict[tuple[str, str], dict] = field(default_factory=dict)
+    # Permission level of a team on a repository, keyed by (organization, team slug) and then by the repository's full name.
+    team_permissions: dict[tuple[str, str], dict[str, str]] = field(
+        default_factory=dict
+    )
+    protections: dict[tuple[str, str], dict] = field(default_factory=dict)
+    hooks: dict[str, list[dict]] = field(default_factory=dict)
+    tags: dict[str, list[str]] = field(default_factory=dict)
+    next_id: int = 1
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+
+def generate_state(
+    organization: str = "loadtest",
+    repository_count: int = 1000,
+    tags_per_repository: int = 5,
+    seed: int = 0,
+) -> StandInState:
+    """Builds an organization whose repositories are in every state the bulk commands deal with: some already configured,
+    some partly and some not at all.
+
+    Args:
+        organization (str, optional): Login of the organization. Defaults to "loadtest".
+        repository_count (int, optional): Number of repositories. Defaults to 1000.
+        tags_per_repository (int, optional): Number of version tags in each repository. Defaults to 5.
+        seed (int, optional): Seed for the random choices. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    state = StandInState()
+    state.organizations[organization] = {"login": organization, "id": state.new_id()}
+    for slug in TEAM_SLUGS:
+        state.teams[(organization, slug)] = {
+            "id": state.new_id(),
+            "slug": slug,
+            "name": slug,
+        }
+        state.team_permissions[(organization, slug)] = {}
+    for index in range(repository_count):
+        name = (
+            f"{REPOSITORY_PREFIXES[index % len(REPOSITORY_PREFIXES)]}repo-{index:05d}"
+        )
+        full_name = f"{organization}/{name}"
+        state.repositories[full_name] = {
+            "id": state.new_id(),
+            "name": name,
+            "full_name": full_name,
+            "owner": organization,
+            "archived": rng.random() < 0.02,
+            "default_branch": "main",
+        }
+        state.tags[full_name] = [f"1.{minor}.0" for minor in range(tags_per_repository)]
+        state.hooks[full_name] = []
+        roll = rng.random()
+        if roll < 0.5:
+            # Already configured, nothing to change.
+            state.team_permissions[(organization, PLATFORM_TEAM_SLUG)][
+                full_name
+            ] = "maintain"
+            state.team_permissions[(organization, PLATFORM_ADMIN_TEAM_SLUG)][
+                full_name
+            ] = "admin"
+            state.protections[(full_name, "main")] = protection_from_payload(
+                {
+                    "enforce_admins": False,
+                    "required_linear_history": True,
+                    "allow_force_pushes": False,
+                    "block_creations": True,
+                    "required_conversation_resolution": False,
+                    "lock_branch": False,
+                    "allow_fork_syncing": True,
+                    "required_pull_request_reviews": {
+                        "dismiss_stale_reviews": False,
+                        "require_code_owner_reviews": True,
+                        "required_approving_review_count": 2,
+                        "require_last_push_approval": True,
+                    },
+                }
+            )
+        elif roll < 0.8:
+            state.team_permissions[(organization, PLATFORM_TEAM_SLUG)][
+                full_name
+            ] = "push"
+    return state
+
+
+ACTOR_REVIEW_FIELDS = ("dismissal_restrictions", "bypass_pull_request_allowances")
+
+
+def actors_from_payload(actors: dict | None) -> dict | None:
+    """Turns the login and slug lists of a protection PUT into the user, team and app objects GitHub reports."""
+    if actors is None:
+        return None
+    return {
+        "users": [{"login": login} for login in actors.get("users", [])],
+        "teams": [{"slug": slug} for slug in actors.get("teams", [])],
+        "apps": [{"slug": slug} for slug in actors.get("apps", [])],
+    }
+
+
+def protection_from_payload(payload: dict) -> dict:
+    """Turns the body of a protection PUT into the shape GitHub reports protection in, where settings are objects."""
+    protection = {}
+    for name, value in payload.items():
+        if name == "required_pull_request_reviews":
+            protection[name] = (
+                {
+                    field: (
+                        actors_from_payload(setting)
+                        if field in ACTOR_REVIEW_FIELDS
+                        else setting
+                    )
+                    for field, setting in value.items()
+                }
+                if value
+                else None
+            )
+        elif name == "restrictions":
+            protection[name] = actors_from_payload(value)
+        elif name == "required_status_checks":
+            protection[name] = value
+        else:
+            protection[name] = {"enabled": value}
+    return {name: value for name, value in protection.items() if value is not None}
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Bulk commands open many connections at once, the default backlog of 5 refuses some of them.
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        state: StandInState,
+        config: StandInConfig | None = None,
+    ):
+        super().__init__(address, StandInHandler)
+        self.state = state
+        self.config = config or StandInConfig()
+        self.rate_limits: dict[str, tuple[int, float]] = {}
+        self.stats_lock = threading.Lock()
+        self.request_counts: dict[str, int] = {}
+        self.latencies: list[float] = []
+        self.request_log: list[tuple[str, str]] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def take_rate_limit(self, token: str) -> tuple[int, int, int]:
+        """Counts a request against a token's budget.
+
+        Returns:
+            tuple[int, int, int]: Requests used and remaining in the window, and when the window resets, in epoch seconds.
+        """
+        with self.stats_lock:
+            now = time.time()
+            used, reset = self.rate_limits.get(
+                token, (0, now + self.config.rate_limit_window_seconds)
+            )
+            if now >= reset:
+                used, reset = 0, now + self.config.rate_limit_window_seconds
+            used += 1
+            self.rate_limits[token] = (used, reset)
+        return used, max(self.config.rate_limit - used, 0), int(reset)
+
+    def record(self, route: str, method: str, path: str, seconds: float) -> None:
+        with self.stats_lock:
+            self.request_counts[route] = self.request_counts.get(route, 0) + 1
+            self.latencies.append(seconds)
+            self.request_log.append((method, path))
+
+    def reset_stats(self) -> None:
+        with self.stats_lock:
+            self.request_counts = {}
+            self.latencies = []
+            self.request_log = []
+
+
+Route = tuple[str, re.Pattern, Callable[..., Any]]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    # Request handling
+
+    def handle_request(self, method: str) -> None:
+        start = time.perf_counter()
+        split = urlsplit(self.path)
+        self.query = {
+            name: values[-1] for name, values in parse_qs(split.query).items()
+        }
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = json.loads(self.rfile.read(length)) if length else None
+
+        route_name = "unknown"
+        config = self.server.config
+        if config.latency_ms or config.latency_jitter_ms:
+            time.sleep(
+                (config.latency_ms + random.random() * config.latency_jitter_ms) / 1000
+            )
+        # PyGithub sends "token ..." and github_request "Bearer ...", GitHub counts both against the same budget.
+        token = self.headers.get("Authorization", "anonymous").split()[-1]
+        used, remaining, reset = self.server.take_rate_limit(token)
+        self.rate_limit_headers = {
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Used": str(used),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Resource": "core",
+        }
+        try:
+            if used > config.rate_limit:
+                raise StandInError(403, "API rate limit exceeded")
+            for route_method, pattern, handler in ROUTES:
+                match = pattern.fullmatch(split.path)
+                if route_method == method and match:
+                    route_name = f"{method} {pattern.pattern}"
+                    with self.server.state.lock:
+                        result = handler(
+                            self,
+                            *(unquote(group) for group in match.groups()),
+                        )
+                    self.send_result(method, result)
+                    break
+            else:
+                raise StandInError(404, "Not Found")
+        except StandInError as e:
+            self.send_json(e.status, {"message": str(e)})
+        self.server.record(route_name, method, split.path, time.perf_counter() - start)
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_PATCH(self):
+        self.handle_request("PATCH")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+    # Responses
+
+    def send_result(self, method: str, result: Any) -> None:
+        if result is None:
+            self.send_json(204, None)
+        elif isinstance(result, tuple):
+            status, body, *headers = result
+            self.send_json(status, body, headers=headers[0] if headers else None)
+        else:
+            self.send_json(201 if method == "POST" else 200, result)
+
+    def send_json(
+        self, status: int, body: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        content = b"" if body is None else json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        if (
+            status == 200
+            and self.command == "GET"
+            and self.headers.get("If-None-Match") == etag
+        ):
+            status, content = 304, b""
+        self.send_response(status)
+        if content:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        if status in (200, 304) and self.command == "GET":
+            self.send_header("ETag", etag)
+        for name, value in {**self.rate_limit_headers, **(headers or {})}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def paginate(self, items: list) -> tuple[int, list, dict[str, str]]:
+        per_page = min(int(self.query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = int(self.query.get("page", 1))
+        start = (page - 1) * per_page
+        links = []
+        base = f"{self.server.url}{urlsplit(self.path).path}"
+        last_page = max((len(items) + per_page - 1) // per_page, 1)
+        if page < last_page:
+            links.append(f'<{base}?per_page={per_page}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}?per_page={per_page}&page={last_page}>; rel="last"')
+        return (
+            200,
+            items[start : start + per_page],
+            {"Link": ", ".join(links)} if links else {},
+        )
+
+    # Representations
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state
+
+    def organization_json(self, login: str) -> dict:
+        organization = self.state.organizations.get(login)
+        if organization is None:
+            raise StandInError(404, "Not Found")
+        return {
+            **organization,
+            "url": f"{self.server.url}/orgs/{login}",
+            "repos_url": f"{self.server.url}/orgs/{login}/repos",
+        }
+
+    def repository_json(self, full_name: str, permission: str | None = None) -> dict:
+        repository = self.state.repositories.get(full_name)
+        if repository is None:
+            raise StandInError(404, "Not Found")
+        url = f"{self.server.url}/repos/{full_name}"
+        body = {
+            "id": repository["id"],
+            "name": repository["name"],
+            "full_name": full_name,
+            "owner": {"login": repository["owner"], "type": "Organization"},
+            "private": True,
+            "archived": repository["archived"],
+            "default_branch": repository["default_branch"],
+            "url": url,
+            "html_url": f"https://github.example/{full_name}",
+            "hooks_url": f"{url}/hooks",
+            "tags_url": f"{url}/tags",
+        }
+        if permission is not None:
+            body["permissions"] = {
+                level: level in PERMISSION_LEVELS[permission]
+                for level in PERMISSION_LEVELS
+            }
+        return body
+
+    def team_json(self, organization: str, slug: str) -> dict:
+        team = self.state.teams.get((organization, slug))
+        if team is None:
+            raise StandInError(404, "Not Found")
+        return {
+            **team,
+            "url": f"{self.server.url}/orgs/{organization}/teams/{slug}",
+            "repositories_url": f"{self.server.url}/orgs/{organization}/teams/{slug}/repos",
+        }
+
+    def hook_json(self, full_name: str, hook: dict) -> dict:
+        return {
+            **hook,
+            "url": f"{self.server.url}/repos/{full_name}/hooks/{hook['id']}",
+        }
+
+    # Endpoints
+
+    def get_rate_limit(self):
+        core = {
+            "limit": int(self.rate_limit_headers["X-RateLimit-Limit"]),
+            "remaining": int(self.rate_limit_headers["X-RateLimit-Remaining"]),
+            "used": int(self.rate_limit_headers["X-RateLimit-Used"]),
+            "reset": int(self.rate_limit_headers["X-RateLimit-Reset"]),
+        }
+        return {"resources": {"core": core}, "rate": core}
+
+    def get_organization(self, login):
+        return self.organization_json(login)
+
+    def list_organization_repositories(self, login):
+        self.organization_json(login)
+        return self.paginate(
+            [
+                self.repository_json(full_name)
+                for full_name, repository in self.state.repositories.items()
+                if repository["owner"] == login
+            ]
+        )
+
+    def get_team(self, organization, slug):
+        return self.team_json(organization, slug)
+
+    def list_team_repositories(self, organization, slug):
+        self.team_json(organization, slug)
+        permissions = self.state.team_permissions[(organization, slug)]
+        return self.paginate(
+            [
+                self.repository_json(full_name, permission=permission)
+                for full_name, permission in permissions.items()
+            ]
+        )
+
+    def get_team_repository(self, organization, slug, owner, name):
+        self.team_json(organization, slug)
+        permission = self.state.team_permissions[(organization, slug)].get(
+            f"{owner}/{name}"
+        )
+        if permission is None:
+            raise StandInError(404, "Not Found")
+        return self.repository_json(f"{owner}/{name}", permission=permission)
+
+    def put_team_repository(self, organization, slug, owner, name):
+        self.team_json(organization, slug)
+        self.repository_json(f"{owner}/{name}")
+        permission = (self.body or {}).get("permission", "push")
+        if permission not in PERMISSION_LEVELS:
+            raise StandInError(422, f"Unknown permission {permission}")
+        self.state.team_permissions[(organization, slug)][
+            f"{owner}/{name}"
+        ] = permission
+        return None
+
+    def get_repository(self, owner, name):
+        return self.repository_json(f"{owner}/{name}")
+
+    def list_branches(self, owner, name):
+        repository = self.repository_json(f"{owner}/{name}")
+        return self.paginate(
+            [self.branch_json(repository, repository["default_branch"])]
+        )
+
+    def branch_json(self, repository: dict, branch: str) -> dict:
+        if branch != repository["default_branch"]:
+            raise StandInError(404, "Branch not found")
+        return {
+            "name": branch,
+            "commit": {
+                "sha": "0" * 40,
+                "url": f"{repository['url']}/commits/{'0' * 40}",
+            },
+            "protected": (repository["full_name"], branch) in self.state.protections,
+        }
+
+    def get_branch(self, owner, name, branch):
+        return self.branch_json(self.repository_json(f"{owner}/{name}"), branch)
+
+    def get_protection(self, owner, name, branch):
+        self.get_branch(owner, name, branch)
+        protection = self.state.protections.get((f"{owner}/{name}", branch))
+        if protection is None:
+            raise StandInError(404, "Branch not protected")
+        return protection
+
+    def put_protection(self, owner, name, branch):
+        self.get_branch(owner, name, branch)
+        protection = protection_from_payload(self.body or {})
+        self.state.protections[(f"{owner}/{name}", branch)] = protection
+        return protection
+
+    def patch_review_protection(self, owner, name, branch):
+        protection = self.get_protection(owner, name, branch)
+        reviews = protection.setdefault("required_pull_request_reviews", {})
+        reviews.update(self.body or {})
+        return reviews
+
+    def list_hooks(self, owner, name):
+        full_name = f"{owner}/{name}"
+        self.repository_json(full_name)
+        return self.paginate(
+            [self.hook_json(full_name, hook) for hook in self.state.hooks[full_name]]
+        )
+
+    def create_hook(self, owner, name):
+        full_name = f"{owner}/{name}"
+        self.repository_json(full_name)
+        body = self.body or {}
+        hook = {
+            "id": self.state.new_id(),
+            "type": "Repository",
+            "name": body.get("name", "web"),
+            "active": body.get("active", True),
+            "events": body.get("events", ["push"]),
+            "config": body.get("config", {}),
+        }
+        self.state.hooks[full_name].append(hook)
+        return self.hook_json(full_name, hook)
+
+    def edit_hook(self, owner, name, hook_id):
+        full_name = f"{owner}/{name}"
+        self.repository_json(full_name)
+        for hook in self.state.hooks[full_name]:
+            if hook["id"] == int(hook_id):
+                hook.update(
+                    {
+                        key: value
+                        for key, value in (self.body or {}).items()
+                        if key in ("name", "active", "events", "config")
+                    }
+                )
+                return self.hook_json(full_name, hook)
+        raise StandInError(404, "Not Found")
+
+    def list_tags(self, owner, name):
+        full_name = f"{owner}/{name}"
+        repository = self.repository_json(full_name)
+        return self.paginate(
+            [
+                {
+                    "name": tag,
+                    "commit": {
+                        "sha": "0" * 40,
+                        "url": f"{repository['url']}/commits/{'0' * 40}",
+                    },
+                }
+                for tag in reversed(self.state.tags[full_name])
+            ]
+        )
+
+    def list_releases(self, owner, name):
+        full_name = f"{owner}/{name}"
+        self.repository_json(full_name)
+        return self.paginate(
+            [
+                {"id": index, "tag_name": tag, "name": tag, "draft": False}
+                for index, tag in enumerate(reversed(self.state.tags[full_name]))
+            ]
+        )
+
+
+SEGMENT = r"([^/]+)"
+ROUTES: list[Route] = [
+    (method, re.compile(pattern), handler)
+    for method, pattern, handler in [
+        ("GET", r"/rate_limit", StandInHandler.get_rate_limit),
+        ("GET", rf"/orgs/{SEGMENT}", StandInHandler.get_organization),
+        (
+            "GET",
+            rf"/orgs/{SEGMENT}/repos",
+            StandInHandler.list_organization_repositories,
+        ),
+        ("GET", rf"/orgs/{SEGMENT}/teams/{SEGMENT}", StandInHandler.get_team),
+        (
+            "GET",
+            rf"/orgs/{SEGMENT}/teams/{SEGMENT}/repos",
+            StandInHandler.list_team_repositories,
+        ),
+        (
+            "GET",
+            rf"/orgs/{SEGMENT}/teams/{SEGMENT}/repos/{SEGMENT}/{SEGMENT}",
+            StandInHandler.get_team_repository,
+        ),
+        (
+            "PUT",
+            rf"/orgs/{SEGMENT}/teams/{SEGMENT}/repos/{SEGMENT}/{SEGMENT}",
+            StandInHandler.put_team_repository,
+        ),
+        ("GET", rf"/repos/{SEGMENT}/{SEGMENT}", StandInHandler.get_repository),
+        ("GET", rf"/repos/{SEGMENT}/{SEGMENT}/branches", StandInHandler.list_branches),
+        (
+            "GET",
+            rf"/repos/{SEGMENT}/{SEGMENT}/branches/{SEGMENT}",
+            StandInHandler.get_branch,
+        ),
+        (
+            "GET",
+            rf"/repos/{SEGMENT}/{SEGMENT}/branches/{SEGMENT}/protection",
+            StandInHandler.get_protection,
+        ),
+        (
+            "PUT",
+            rf"/repos/{SEGMENT}/{SEGMENT}/branches/{SEGMENT}/protection",
+            StandInHandler.put_protection,
+        ),
+        (
+            "PATCH",
+            rf"/repos/{SEGMENT}/{SEGMENT}/branches/{SEGMENT}/protection/required_pull_request_reviews",
+            StandInHandler.patch_review_protection,
+        ),
+        ("GET", rf"/repos/{SEGMENT}/{SEGMENT}/hooks", StandInHandler.list_hooks),
+        ("POST", rf"/repos/{SEGMENT}/{SEGMENT}/hooks", StandInHandler.create_hook),
+        (
+            "PATCH",
+            rf"/repos/{SEGMENT}/{SEGMENT}/hooks/{SEGMENT}",
+            StandInHandler.edit_hook,
+        ),
+        ("GET", rf"/repos/{SEGMENT}/{SEGMENT}/tags", StandInHandler.list_tags),
+        ("GET", rf"/repos/{SEGMENT}/{SEGMENT}/releases", StandInHandler.list_releases),
+    ]
+]
+
+
+def start_stand_in(
+    state: StandInState,
+    config: StandInConfig | None = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> StandInServer:
+    """Starts a stand-in server on a background thread. Port 0 picks a free port, the server's url says which."""
+    server = StandInServer((host, port), state=state, config=config)
+    threading.Thread(
+        target=server.serve_forever, name="github-stand-in", daemon=True
+    ).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--organization", default="loadtest")
+    parser.add_argument("--repositories", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", type=int, default=StandInConfig.rate_limit)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        (args.host, args.port),
+        state=generate_state(
+            organization=args.organization, repository_count=args.repositories
+        ),
+        config=StandInConfig(
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            rate_limit=args.rate_limit,
+        ),
+    )
+    print(
+        f"Serving {args.repositories} repositories in {args.organization} at {server.url}"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Pytest plugin that counts the GitHub API requests a command makes, so that tests can hold it to a budget.
+
+The `github_requests` fixture points launch.github at a local GitHub stand-in from test.loadtest.server, through the
+`github_stand_in` fixture, for the duration of a test and records every request the stand-in receives. Tests either assert on the counts themselves or declare a budget
+with the `request_budget` marker, which is checked once the test has finished:
+
+    @pytest.mark.request_budget(total=30, per_repository=4)
+    def test_something(cli_runner, github_requests):
+        ...
+
+Requests are attributed to a repository by the /repos/{owner}/{repo} part of their path, so lookups of teams' permissions
+on a repository count against it too. Everything else, such as organization and team lookups, only counts towards the
+total.
+"""
+
+import re
+from collections import Counter
+
+import pytest
+
+from .loadtest.server import StandInServer, generate_state
+
+STAND_IN_ORGANIZATION = "loadtest"
+STAND_IN_REPOSITORIES = 8
+REPOSITORY_PATH = re.compile(r"/repos/([^/]+/[^/]+)")
+
+
+class RequestLog:
+    """The requests a GitHub stand-in has received since the log was created or last reset."""
+
+    def __init__(self, server: StandInServer):
+        self.server = server
+        self.organization = STAND_IN_ORGANIZATION
+
+    @property
+    def requests(self) -> list[tuple[str, str]]:
+        """Method and path of each request, in the order they were received."""
+        with self.server.stats_lock:
+            return list(self.server.request_log)
+
+    @property
+    def repository_names(self) -> list[str]:
+        with self.server.state.lock:
+            return sorted(
+                repository["name"]
+                for repository in self.server.state.repositories.values()
+            )
+
+    def reset(self) -> None:
+        self.server.reset_stats()
+
+    def per_repository(self) -> Counter[str]:
+        """Number of requests made about each repository, keyed by full name."""
+        counts: Counter[str] = Counter()
+        for _, path in self.requests:
+            match = REPOSITORY_PATH.search(path)
+            if match:
+                counts[match.group(1)] += 1
+        return counts
+
+    def assert_within(
+        self, total: int | None = None, per_repository: int | None = None
+    ) -> None:
+        """Fails the test if more than `total` requests were made, or more than `per_repository` about any one repository.
+        The failure lists the requests, so that the extra ones are easy to spot."""
+        requests = self.requests
+        if total is not None and len(requests) > total:
+            pytest.fail(
+                f"Made {len(requests)} GitHub requests, more than the budget of {total}:\n"
+                + "\n".join(f"  {method} {path}" for method, path in requests)
+            )
+        if per_repository is not None:
+            over_budget = {
+                name: count
+                for name, count in self.per_repository().items()
+                if count > per_repository
+            }
+            if over_budget:
+                name = max(over_budget, key=over_budget.__getitem__)
+                pytest.fail(
+                    f"Made up to {over_budget[name]} GitHub requests about a single repository, more than the budget of "
+                    f"{per_repository}. Requests about {name}:\n"
+                    + "\n".join(
+                        f"  {method} {path}"
+                        for method, path in requests
+                        if REPOSITORY_PATH.search(path)
+                        and REPOSITORY_PATH.search(path).group(1) == name
+                    )
+                )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "request_budget(total=None, per_repository=None): fail the test if the github_requests fixture recorded more "
+        "GitHub requests than this, in total or about any one repository.",
+    )
+
+
+@pytest.fixture
+def github_requests(github_stand_in):
+    server = github_stand_in(
+        generate_state(
+            organization=STAND_IN_ORGANIZATION,
+            repository_count=STAND_IN_REPOSITORIES,
+        )
+    )
+    yield RequestLog(server)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    outcome = yield
+    marker = item.get_closest_marker("request_budget")
+    # A test that already failed is reported as it is, whatever it cost.
+    if marker is None or outcome.excinfo is not None:
+        return
+    try:
+        log = item.funcargs.get("github_requests")
+        if log is None:
+            pytest.fail("The request_budget marker needs the github_requests fixture")
+        log.assert_within(**marker.kwargs)
+    except pytest.fail.Exception as e:
+        # Raising out of an old-style wrapper works everywhere, but pluggy 1.1 and later can fail the test without a
+        # teardown warning.
+        if not hasattr(outcome, "force_exception"):
+            raise
+        outcome.force_exception(e)
@@ -1,9 +1,8 @@
+import json
 import logging
-import re
 from contextlib import ExitStack as does_not_raise
 
 import pytest
-import requests
 import responses
 
 from launch.github import access
@@ -52,91 +51,201 @@ def test_grant_admin_dry_run(mocker):
 def test_configure_default_branch_protection_warns_on_default_branch_name(
     mocker, caplog
 ):
-    mocked_default_branch = mocker.MagicMock()
-    mocked_default_branch.name = "not-main"
-
     repo = mocker.MagicMock()
-    repo.get_branch = mocker.MagicMock(return_value=mocked_default_branch)
+    repo.default_branch = "not-main"
+    mocker.patch.object(access, "read_branch_protection", return_value=None)
 
     with caplog.at_level(logging.WARNING):
         access.configure_default_branch_protection(repository=repo, dry_run=True)
         assert len(caplog.records) > 0
-        assert mocked_default_branch.name in caplog.text
+        assert "not-main" in caplog.text
+
+
+def compliant_protection(**overrides) -> dict:
+    protection = {
+        "required_status_checks": {
+            "strict": True,
+            "contexts": ["build"],
+            "checks": [{"context": "build", "app_id": 15368}],
+        },
+        "restrictions": {
+            "users": [{"login": "octocat"}],
+            "teams": [{"slug": "platform"}],
+            "apps": [],
+        },
+        "required_pull_request_reviews": {
+            "dismiss_stale_reviews": False,
+            "require_code_owner_reviews": True,
+            "required_approving_review_count": 2,
+            "require_last_push_approval": True,
+        },
+    }
+    for name in access.DEFAULT_BRANCH_PROTECTION:
+        if name not in access.REVIEW_PROTECTION_FIELDS:
+            protection[name] = {"enabled": access.DEFAULT_BRANCH_PROTECTION[name]}
+    for name, value in overrides.items():
+        if name in access.REVIEW_PROTECTION_FIELDS:
+            protection["required_pull_request_reviews"][name] = value
+        else:
+            protection[name] = {"enabled": value}
+    return protection
+
+
+def test_diff_branch_protection():
+    assert access.diff_branch_protection(compliant_protection()) == {}
+    assert access.diff_branch_protection(
+        compliant_protection(require_last_push_approval=False, enforce_admins=True)
+    ) == {"require_last_push_approval": (False, True), "enforce_admins": (True, False)}
+    assert access.diff_branch_protection(None) == {
+        name: (None, expected)
+        for name, expected in access.DEFAULT_BRANCH_PROTECTION.items()
+    }
+
+
+def test_build_branch_protection_payload_keeps_checks_and_restrictions():
+    payload = access.build_branch_protection_payload(
+        compliant_protection(required_approving_review_count=1)
+    )
+    assert payload["required_status_checks"] == {
+        "strict": True,
+        "checks": [{"context": "build", "app_id": 15368}],
+    }
+    assert payload["restrictions"] == {
+        "users": ["octocat"],
+        "teams": ["platform"],
+        "apps": [],
+    }
+    assert (
+        payload["required_pull_request_reviews"]["required_approving_review_count"] == 2
+    )
+    assert payload["required_pull_request_reviews"]["require_last_push_approval"]
+    assert payload["enforce_admins"] is False
+    assert "dismissal_restrictions" not in payload["required_pull_request_reviews"]
+
+    reviews = compliant_protection()["required_pull_request_reviews"]
+    reviews["dismissal_restrictions"] = {
+        "url": "https://api.github.com/repos/example/repo/branches/main/protection/dismissal_restrictions",
+        "users": [{"login": "octocat"}],
+        "teams": [],
+        "apps": [],
+    }
+    reviews["bypass_pull_request_allowances"] = {
+        "users": [],
+        "teams": [{"slug": "release-managers"}],
+        "apps": [{"slug": "renovate"}],
+    }
+    payload = access.build_branch_protection_payload(
+        {"required_pull_request_reviews": reviews}
+    )
+    assert payload["required_pull_request_reviews"]["dismissal_restrictions"] == {
+        "users": ["octocat"],
+        "teams": [],
+        "apps": [],
+    }
+    assert payload["required_pull_request_reviews"][
+        "bypass_pull_request_allowances"
+    ] == {"users": [], "teams": ["release-managers"], "apps": ["renovate"]}
+
+    unprotected = access.build_branch_protection_payload(None)
+    assert unprotected["required_status_checks"] is None
+    assert unprotected["restrictions"] is None
+
+
+def test_configure_default_branch_protection_skips_compliant_branch(mocker):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="main")
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            "https://api.github.com/repos/example/repo/branches/main/protection",
+            json=compliant_protection(),
+        )
+        access.configure_default_branch_protection(repository=repo, dry_run=False)
+        assert len(rsps.calls) == 1
 
 
 def test_configure_default_branch_protection(mocker):
-    mocked_default_branch = mocker.MagicMock()
-    mocked_default_branch.name = "main"
-
-    repo = mocker.MagicMock()
-    repo.get_branch = mocker.MagicMock(return_value=mocked_default_branch)
-
-    with mocker.patch.context_manager(
-        access, "set_require_approval_of_most_recent_reviewable_push"
-    ):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="release/v1")
+    url = "https://api.github.com/repos/example/repo/branches/release%2Fv1/protection"
+    with responses.RequestsMock() as rsps:
+        rsps.get(url, status=404, json={"message": "Branch not protected"})
+        rsps.put(url, json={})
         access.configure_default_branch_protection(repository=repo, dry_run=False)
-        access.set_require_approval_of_most_recent_reviewable_push.assert_called_once()
-
-    mocked_default_branch.edit_protection.assert_called_once()
-    mocked_default_branch.edit_required_pull_request_reviews.assert_called_once()
-    mocked_default_branch.edit_protection.assert_called_once()
-
-
-def test_configure_default_branch_protection_dry_run(mocker):
-    mocked_default_branch = mocker.MagicMock()
-    mocked_default_branch.name = "main"
-
-    repo = mocker.MagicMock()
-    repo.get_branch = mocker.MagicMock(return_value=mocked_default_branch)
-
-    with mocker.patch.context_manager(
-        access, "set_require_approval_of_most_recent_reviewable_push"
-    ):
+        assert [call.request.method for call in rsps.calls] == ["GET", "PUT"]
+        payload = json.loads(rsps.calls[1].request.body)
+    assert payload["required_pull_request_reviews"]["require_last_push_approval"]
+    assert payload["required_linear_history"] is True
+
+
+def test_configure_default_branch_protection_dry_run(mocker, caplog):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="main")
+    mocker.patch.object(
+        access,
+        "read_branch_protection",
+        return_value=compliant_protection(required_approving_review_count=1),
+    )
+    mocked_write = mocker.patch.object(access, "write_branch_protection")
+
+    with caplog.at_level(logging.INFO):
         access.configure_default_branch_protection(repository=repo, dry_run=True)
-        access.set_require_approval_of_most_recent_reviewable_push.assert_not_called()
-
-    mocked_default_branch.edit_protection.assert_not_called()
-    mocked_default_branch.edit_required_pull_request_reviews.assert_not_called()
-    mocked_default_branch.edit_protection.assert_not_called()
 
+    mocked_write.assert_not_called()
+    assert "required_approving_review_count: 1 -> 2" in caplog.text
 
-@pytest.mark.parametrize(
-    "bad_status_codes", [400, 401, 402, 403, 404, 405, 500, 501, 502, 503, 504]
-)
-def test_set_require_approval_of_most_recent_reviewable_push_not_ok_raises(
-    mocker, bad_status_codes
-):
-    organization = mocker.MagicMock()
-    repository = mocker.MagicMock()
-    branch = mocker.MagicMock()
 
+def test_configure_default_branch_protection_from_snapshot(mocker):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="main")
+    url = "https://api.github.com/repos/example/repo/branches/main/protection"
+    snapshot = access.ProtectionSnapshot()
+    snapshot.set(
+        full_name="example/repo",
+        branch_name="main",
+        protection=access.flatten_branch_protection(compliant_protection()),
+    )
     with responses.RequestsMock() as rsps:
-        rsps.add(
-            responses.PATCH,
-            re.compile(".+"),
-            body="",
-            status=bad_status_codes,
-            content_type="application/json",
+        access.configure_default_branch_protection(
+            repository=repo, dry_run=False, protection_snapshot=snapshot
         )
-        with pytest.raises(RuntimeError):
-            access.set_require_approval_of_most_recent_reviewable_push(
-                organization=organization, repository=repository, branch=branch
-            )
+        assert len(rsps.calls) == 0
 
-
-def test_set_require_approval_of_most_recent_reviewable_push_request_exception_raises(
-    mocker,
-):
-    organization = mocker.MagicMock()
-    repository = mocker.MagicMock()
-    branch = mocker.MagicMock()
-
-    mocker.patch.object(requests, "patch", side_effect=OSError)
-
-    with pytest.raises(RuntimeError):
-        access.set_require_approval_of_most_recent_reviewable_push(
-            organization=organization, repository=repository, branch=branch
+    snapshot.set(
+        full_name="example/repo",
+        branch_name="main",
+        protection=access.flatten_branch_protection(None),
+    )
+    with responses.RequestsMock() as rsps:
+        # The protection is still read before writing it, to carry over its status checks.
+        rsps.get(url, json={**compliant_protection(), "lock_branch": {"enabled": True}})
+        rsps.put(url, json={})
+        access.configure_default_branch_protection(
+            repository=repo, dry_run=False, protection_snapshot=snapshot
         )
+        assert [call.request.method for call in rsps.calls] == ["GET", "PUT"]
+
+
+def test_configure_default_branch_protection_ignores_snapshot_of_other_branch(mocker):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="trunk")
+    snapshot = access.ProtectionSnapshot()
+    snapshot.set(
+        full_name="example/repo",
+        branch_name="main",
+        protection=access.flatten_branch_protection(compliant_protection()),
+    )
+    mocked_read = mocker.patch.object(
+        access, "read_branch_protection", return_value=compliant_protection()
+    )
+    access.configure_default_branch_protection(
+        repository=repo, dry_run=True, protection_snapshot=snapshot
+    )
+    mocked_read.assert_called_once_with(repository=repo, branch_name="trunk")
+
+
+def test_configure_default_branch_protection_raises_on_failed_write(mocker):
+    repo = mocker.MagicMock(full_name="example/repo", default_branch="main")
+    url = "https://api.github.com/repos/example/repo/branches/main/protection"
+    with responses.RequestsMock() as rsps:
+        rsps.get(url, json=compliant_protection(lock_branch=True))
+        rsps.put(url, status=422, json={"message": "Validation Failed"})
+        with pytest.raises(RuntimeError):
+            access.configure_default_branch_protection(repository=repo, dry_run=False)
 
 
 @pytest.mark.parametrize(
@@ -167,3 +276,142 @@ def test_select_administrative_team(repo_name, expected_slug, raises, mocker):
         )
         organization.get_team_by_slug.assert_called_with(expected_slug)
         assert result is not None
+
+
+def test_select_administrative_team_uses_resolved_teams(mocker):
+    organization = mocker.MagicMock()
+    repository = mocker.MagicMock()
+    repository.name = "tf-cloud-wrapper_module-example"
+    terraform_team = mocker.MagicMock()
+
+    result = access.select_administrative_team(
+        repository=repository,
+        organization=organization,
+        teams={"terraform-administrators": terraform_team},
+    )
+    assert result is terraform_team
+    organization.get_team_by_slug.assert_not_called()
+
+
+def test_resolve_teams_looks_up_each_team_once(mocker):
+    organization = mocker.MagicMock()
+    teams = access.resolve_teams(
+        organization=organization,
+        slugs=["platform", "terraform-administrators", "terraform-administrators"],
+    )
+    assert list(teams) == ["platform", "terraform-administrators"]
+    assert organization.get_team_by_slug.call_count == 2
+
+
+@pytest.mark.parametrize("has_specific_admin_team", [True, False])
+def test_apply_default_access(has_specific_admin_team, mocker):
+    mocked_grant_maintain = mocker.patch.object(access, "grant_maintain")
+    mocked_grant_admin = mocker.patch.object(access, "grant_admin")
+    mocked_configure = mocker.patch.object(
+        access, "configure_default_branch_protection"
+    )
+    repository = mocker.MagicMock()
+
+    access.apply_default_access(
+        repository=repository,
+        platform_team=mocker.MagicMock(),
+        platform_admin_team=mocker.MagicMock(),
+        specific_admin_team=mocker.MagicMock() if has_specific_admin_team else None,
+        dry_run=True,
+    )
+    mocked_grant_maintain.assert_called_once()
+    assert mocked_grant_admin.call_count == (2 if has_specific_admin_team else 1)
+    mocked_configure.assert_called_once_with(
+        repository=repository, dry_run=True, protection_snapshot=None
+    )
+
+
+def make_team(mocker, slug, repositories):
+    team = mocker.MagicMock()
+    team.slug = slug
+    listed = []
+    for full_name, permissions in repositories.items():
+        repository = mocker.MagicMock()
+        repository.full_name = full_name
+        repository.permissions = mocker.MagicMock(**permissions)
+        listed.append(repository)
+    team.get_repos = mocker.MagicMock(return_value=listed)
+    return team
+
+
+def test_permission_snapshot_from_teams(mocker):
+    maintain = {
+        "triage": True,
+        "push": True,
+        "pull": True,
+        "maintain": True,
+        "admin": False,
+    }
+    team = make_team(mocker, "platform", {"org/repo": maintain})
+    other_team = make_team(mocker, "other", {})
+    repository = mocker.MagicMock(full_name="org/repo")
+
+    snapshot = access.PermissionSnapshot.from_teams([team, other_team])
+
+    team.get_repos.assert_called_once()
+    assert snapshot.covers(team)
+    assert snapshot.get(team, repository).maintain
+    assert snapshot.get(other_team, repository) is None
+    assert not snapshot.covers(mocker.MagicMock(slug="unknown"))
+
+
+@pytest.mark.parametrize(
+    "grant, permissions, expect_update",
+    [
+        (
+            access.grant_maintain,
+            {
+                "triage": True,
+                "push": True,
+                "pull": True,
+                "maintain": True,
+                "admin": False,
+            },
+            False,
+        ),
+        (
+            access.grant_admin,
+            {
+                "triage": True,
+                "push": True,
+                "pull": True,
+                "maintain": True,
+                "admin": False,
+            },
+            True,
+        ),
+        (access.grant_maintain, None, True),
+    ],
+)
+def test_grant_reads_from_snapshot(grant, permissions, expect_update, mocker):
+    team = make_team(
+        mocker, "platform", {"org/repo": permissions} if permissions else {}
+    )
+    repository = mocker.MagicMock(full_name="org/repo")
+    snapshot = access.PermissionSnapshot.from_teams([team])
+
+    grant(team, repository, dry_run=False, snapshot=snapshot)
+
+    team.get_repo_permission.assert_not_called()
+    assert team.set_repo_permission.called == expect_update
+
+    # The snapshot is kept up to date, so granting again doesn't write anything.
+    team.set_repo_permission.reset_mock()
+    grant(team, repository, dry_run=False, snapshot=snapshot)
+    team.set_repo_permission.assert_not_called()
+
+
+def test_grant_falls_back_to_api_for_teams_outside_snapshot(mocker):
+    team = mocker.MagicMock(slug="elsewhere")
+    team.get_repo_permission = mocker.MagicMock(return_value=None)
+    repository = mocker.MagicMock(full_name="org/repo")
+
+    access.grant_admin(
+        team, repository, dry_run=True, snapshot=access.PermissionSnapshot()
+    )
+    team.get_repo_permission.assert_called_once()
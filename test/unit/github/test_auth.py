@@ -19,3 +19,13 @@ def test_github_headers():
     auth.github_headers.cache_clear()
     result = auth.github_headers()
     assert result.get("Authorization") == "Bearer ghp_test_value"
+
+
+def test_shared_github_instance_uses_configured_api_url(mocker):
+    mocker.patch.object(auth, "GITHUB_API_URL", "http://127.0.0.1:8080")
+    auth.shared_github_instance.cache_clear()
+    try:
+        g = auth.shared_github_instance(token=None, timeout=10, per_page=30)
+        assert g.requester.base_url == "http://127.0.0.1:8080"
+    finally:
+        auth.shared_github_instance.cache_clear()
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from launch.github import bulk
+
+
+@pytest.fixture
+def mocked_repositories(mocker):
+    repositories = []
+    for name, archived in [
+        ("tf-aws-module-one", False),
+        ("tf-aws-module-two", False),
+        ("tf-azure-module", False),
+        ("caf-component-platform", False),
+        ("tf-aws-module-archived", True),
+    ]:
+        repository = mocker.MagicMock()
+        repository.name = name
+        repository.archived = archived
+        repositories.append(repository)
+    yield repositories
+
+
+@pytest.mark.parametrize(
+    "names, prefix, name_pattern, include_archived, expected_names",
+    [
+        (
+            None,
+            None,
+            None,
+            False,
+            [
+                "tf-aws-module-one",
+                "tf-aws-module-two",
+                "tf-azure-module",
+                "caf-component-platform",
+            ],
+        ),
+        (
+            None,
+            "tf-aws-",
+            None,
+            True,
+            ["tf-aws-module-one", "tf-aws-module-two", "tf-aws-module-archived"],
+        ),
+        (None, None, "tf-*-module", False, ["tf-azure-module"]),
+        (None, "tf-", "*-two", False, ["tf-aws-module-two"]),
+        (
+            ["caf-component-platform", "tf-aws-module-archived", "nonexistent"],
+            None,
+            None,
+            False,
+            ["caf-component-platform"],
+        ),
+    ],
+)
+def test_filter_repositories(
+    mocked_repositories, names, prefix, name_pattern, include_archived, expected_names
+):
+    selected = bulk.filter_repositories(
+        repositories=mocked_repositories,
+        names=names,
+        prefix=prefix,
+        name_pattern=name_pattern,
+        include_archived=include_archived,
+    )
+    assert [r.name for r in selected] == expected_names
+
+
+def test_run_bulk_records_failures_in_order(mocked_repositories):
+    def action(repository):
+        if repository.name.startswith("caf-"):
+            raise RuntimeError("Not allowed")
+
+    results = bulk.run_bulk(repositories=mocked_repositories, action=action)
+    assert [r.repository_name for r in results] == [r.name for r in mocked_repositories]
+    assert [r.succeeded for r in results] == [True, True, True, False, True]
+    assert results[3].error == "Not allowed"
+
+
+def test_run_bulk_bounds_concurrency(mocked_repositories):
+    lock = threading.Lock()
+    running = 0
+    most_running = 0
+
+    def action(repository):
+        nonlocal running, most_running
+        with lock:
+            running += 1
+            most_running = max(most_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    bulk.run_bulk(repositories=mocked_repositories, action=action, max_workers=2)
+    assert most_running == 2
@@ -0,0 +1,106 @@
+import stat
+
+import pytest
+import requests
+import responses
+
+from launch.cli import entrypoint
+from launch.github import cache
+from launch.github.client import GitHubAdapter
+from launch.github.ratelimit import RateLimitScheduler
+
+URL = "https://api.github.com/repos/example/example"
+
+
+@pytest.fixture
+def response_cache(isolated_cache_directory):
+    yield cache.get_response_cache()
+
+
+@pytest.fixture
+def session():
+    session = requests.Session()
+    session.mount(
+        "https://",
+        GitHubAdapter(
+            scheduler=RateLimitScheduler(requests_per_second=1000, burst=1000)
+        ),
+    )
+    yield session
+
+
+def cached_response(url: str, body: bytes = b"{}") -> cache.CachedResponse:
+    return cache.CachedResponse(
+        url=url,
+        etag='"abc"',
+        last_modified=None,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+        body=body,
+    )
+
+
+def test_cache_key_depends_on_identity_and_representation():
+    key = cache.ResponseCache.cache_key(URL, "Bearer one", "application/json")
+    assert key == cache.ResponseCache.cache_key(URL, "Bearer one", "application/json")
+    assert key != cache.ResponseCache.cache_key(URL, "Bearer two", "application/json")
+    assert key != cache.ResponseCache.cache_key(URL, None, "application/json")
+    assert key != cache.ResponseCache.cache_key(URL, "Bearer one", "text/plain")
+    assert "one" not in key
+
+
+def test_cache_round_trip(response_cache):
+    response_cache.put("key", cached_response(URL, b'{"name": "example"}'))
+    cached = response_cache.get("key")
+    assert cached.body == b'{"name": "example"}'
+    assert cached.conditional_headers() == {"If-None-Match": '"abc"'}
+    assert "Content-Encoding" not in cached.headers
+    assert response_cache.get("missing") is None
+
+
+def test_cache_is_only_readable_by_the_current_user(tmp_path):
+    path = tmp_path.joinpath("launch", "responses.sqlite3")
+    cache.ResponseCache(path=path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+
+
+def test_cache_evicts_least_recently_used(isolated_cache_directory):
+    response_cache = cache.ResponseCache(
+        path=isolated_cache_directory.joinpath("lru.sqlite3"), max_entries=2
+    )
+    response_cache.put("one", cached_response(URL))
+    response_cache.put("two", cached_response(URL))
+    response_cache.get("one")
+    response_cache.put("three", cached_response(URL))
+    assert len(response_cache) == 2
+    assert response_cache.get("two") is None
+    assert response_cache.get("one") is not None
+
+
+def test_adapter_revalidates_cached_responses(response_cache, session):
+    with responses.RequestsMock() as rsps:
+        rsps.get(URL, json={"name": "example"}, headers={"ETag": '"abc"'})
+        rsps.get(URL, status=304, headers={"X-RateLimit-Remaining": "4999"})
+        first = session.get(URL, headers={"Authorization": "Bearer one"})
+        second = session.get(URL, headers={"Authorization": "Bearer one"})
+        assert "If-None-Match" not in rsps.calls[0].request.headers
+        assert rsps.calls[1].request.headers["If-None-Match"] == '"abc"'
+
+    assert first.json() == second.json() == {"name": "example"}
+    assert second.status_code == 200
+    assert second.headers["X-RateLimit-Remaining"] == "4999"
+
+
+def test_adapter_does_not_share_responses_between_identities(response_cache, session):
+    with responses.RequestsMock() as rsps:
+        rsps.get(URL, json={"name": "example"}, headers={"ETag": '"abc"'})
+        rsps.get(URL, json={"name": "example"}, headers={"ETag": '"abc"'})
+        session.get(URL, headers={"Authorization": "Bearer one"})
+        session.get(URL, headers={"Authorization": "Bearer two"})
+        assert "If-None-Match" not in rsps.calls[1].request.headers
+
+
+def test_no_cache_flag_disables_cache(cli_runner, mocker):
+    mocker.patch.object(cache, "_enabled", True)
+    cli_runner.invoke(entrypoint.cli, ["--no-cache"])
+    assert cache.get_response_cache() is None
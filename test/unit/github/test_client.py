@@ -0,0 +1,85 @@
+import re
+
+import responses
+
+from launch import profiling
+from launch.github import auth, client
+
+
+def test_get_http_session_is_shared():
+    assert client.get_http_session() is client.get_http_session()
+
+
+def test_get_http_session_pool_size():
+    adapter = client.get_http_session().get_adapter("https://api.github.com")
+    assert adapter._pool_maxsize == client.GITHUB_POOL_SIZE
+    assert adapter._pool_connections == client.GITHUB_POOL_SIZE
+
+
+def test_get_github_instance_is_shared():
+    assert auth.get_github_instance() is auth.get_github_instance()
+    assert auth.get_github_instance() is not auth.get_anonymous_github_instance()
+    assert auth.get_anonymous_github_instance(
+        per_page=100
+    ) is not auth.get_anonymous_github_instance(per_page=30)
+
+
+def test_pygithub_uses_shared_session(mocker):
+    session_request = mocker.spy(client.get_http_session(), "request")
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            re.compile(r"https://api\.github\.com(:443)?/repos/example/example"),
+            json={"name": "example", "full_name": "example/example"},
+        )
+        repo = auth.get_github_instance().get_repo("example/example")
+    assert repo.name == "example"
+    session_request.assert_called_once()
+    assert session_request.call_args.args[0] == "GET"
+
+
+def test_github_request_relative_path(mocker):
+    with responses.RequestsMock() as rsps:
+        rsps.patch("https://api.github.com/repos/example/example", json={})
+        response = client.github_request(
+            method="PATCH",
+            path="/repos/example/example",
+            headers=auth.github_headers(),
+            json={"archived": False},
+        )
+        assert rsps.calls[0].request.headers["Authorization"] == "Bearer ghp_test_value"
+    assert response.ok
+
+
+def test_github_request_absolute_url():
+    with responses.RequestsMock() as rsps:
+        rsps.get("https://example.com/elsewhere", json={})
+        response = client.github_request(
+            method="GET", path="https://example.com/elsewhere", headers={}
+        )
+    assert response.ok
+
+
+def test_requests_are_recorded_when_profiling():
+    profiler = profiling.enable_profiling()
+    try:
+        with responses.RequestsMock() as rsps:
+            rsps.get(
+                "https://api.github.com/repos/example/example/hooks",
+                json=[],
+                headers={
+                    "X-RateLimit-Used": "7",
+                    "X-RateLimit-Remaining": "4993",
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Reset": "1700000000",
+                },
+            )
+            client.github_request(
+                method="GET", path="/repos/example/example/hooks", headers={}
+            )
+    finally:
+        profiling.disable_profiling()
+    http_spans = [span for span in profiler.spans if span.category == profiling.HTTP]
+    assert [(span.name, span.args["status"]) for span in http_spans] == [
+        ("GET /repos/{owner}/{repo}/hooks", 200)
+    ]
+    assert profiler.rate_limit_consumed() == 1
@@ -0,0 +1,238 @@
+import json
+
+import pytest
+import responses
+
+from launch.github import access, graphql
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+
+def protection_rule_node(pattern: str) -> dict:
+    return {
+        "pattern": pattern,
+        "isAdminEnforced": False,
+        "requiresApprovingReviews": True,
+        "requiredApprovingReviewCount": 2,
+        "requiresCodeOwnerReviews": True,
+        "dismissesStaleReviews": False,
+        "requireLastPushApproval": True,
+        "requiresLinearHistory": True,
+        "allowsForcePushes": False,
+        "blocksCreations": True,
+        "requiresConversationResolution": False,
+        "lockBranch": False,
+        "lockAllowsFetchAndMerge": True,
+    }
+
+
+def repositories_page(names: list[str], end_cursor: str | None) -> dict:
+    return {
+        "data": {
+            "organization": {
+                "repositories": {
+                    "pageInfo": {
+                        "hasNextPage": end_cursor is not None,
+                        "endCursor": end_cursor,
+                    },
+                    "nodes": [
+                        {
+                            "name": name,
+                            "nameWithOwner": f"example/{name}",
+                            "isArchived": False,
+                            "defaultBranchRef": {"name": "main"},
+                            "branchProtectionRules": {
+                                "nodes": [protection_rule_node("main")]
+                            },
+                        }
+                        for name in names
+                    ],
+                }
+            }
+        }
+    }
+
+
+def test_get_repository_states_follows_cursor():
+    with responses.RequestsMock() as rsps:
+        rsps.post(GRAPHQL_URL, json=repositories_page(["one", "two"], "cursor-1"))
+        rsps.post(GRAPHQL_URL, json=repositories_page(["three"], None))
+        states = graphql.get_repository_states(organization="example")
+        assert len(rsps.calls) == 2
+        second_request = json.loads(rsps.calls[1].request.body)
+        assert second_request["variables"]["cursor"] == "cursor-1"
+        assert second_request["variables"]["pageSize"] == graphql.GRAPHQL_PAGE_SIZE
+
+    assert [state.full_name for state in states] == [
+        "example/one",
+        "example/two",
+        "example/three",
+    ]
+    protection = states[0].default_branch_protection
+    assert protection.required_approving_review_count == 2
+    assert protection.require_last_push_approval
+
+
+def test_repository_state_without_default_branch():
+    state = graphql.RepositoryState.from_node(
+        {
+            "name": "empty",
+            "nameWithOwner": "example/empty",
+            "isArchived": True,
+            "defaultBranchRef": None,
+            "branchProtectionRules": {"nodes": [protection_rule_node("release/*")]},
+        }
+    )
+    assert state.default_branch is None
+    assert state.default_branch_protection is None
+
+
+def test_branch_protection_rule_flattens_like_rest_protection():
+    rule = graphql.BranchProtectionRule.from_node(protection_rule_node("main"))
+    flattened = rule.flatten()
+    assert list(flattened) == list(access.DEFAULT_BRANCH_PROTECTION)
+    assert flattened["required_approving_review_count"] == 2
+    assert flattened["allow_fork_syncing"] is True
+
+    without_reviews = graphql.BranchProtectionRule.from_node(
+        {**protection_rule_node("main"), "requiresApprovingReviews": False}
+    ).flatten()
+    assert all(
+        without_reviews[name] is None for name in access.REVIEW_PROTECTION_FIELDS
+    )
+
+
+def test_get_protection_snapshot():
+    page = repositories_page(["protected", "unprotected", "many-rules"], None)
+    nodes = page["data"]["organization"]["repositories"]["nodes"]
+    nodes[1]["branchProtectionRules"] = {
+        "pageInfo": {"hasNextPage": False},
+        "nodes": [],
+    }
+    nodes[2]["branchProtectionRules"] = {
+        "pageInfo": {"hasNextPage": True},
+        "nodes": [protection_rule_node("release/*")],
+    }
+    with responses.RequestsMock() as rsps:
+        rsps.post(GRAPHQL_URL, json=page)
+        snapshot = graphql.get_protection_snapshot(organization="example")
+
+    protected = snapshot.get(full_name="example/protected", branch_name="main")
+    assert protected["required_approving_review_count"] == 2
+    assert snapshot.get(full_name="example/unprotected", branch_name="main") == {
+        name: None for name in access.DEFAULT_BRANCH_PROTECTION
+    }
+    # Its default branch's rule may be among those that weren't read.
+    assert snapshot.get(full_name="example/many-rules", branch_name="main") is None
+
+
+@pytest.mark.parametrize(
+    "patterns, default_branch, expected_pattern",
+    [
+        (["main"], "main", "main"),
+        (["ma*"], "main", "ma*"),
+        (["release/*", "m[a-z]in"], "main", "m[a-z]in"),
+        (["*", "main"], "main", "main"),
+        (["*"], "release/1.0", None),
+        (["release/*"], "release/1.0", "release/*"),
+        (["*", "m*"], "main", None),
+        (["develop"], "main", None),
+    ],
+)
+def test_default_branch_protection_matches_wildcard_rules(
+    patterns, default_branch, expected_pattern
+):
+    state = graphql.RepositoryState(
+        name="repo",
+        full_name="example/repo",
+        archived=False,
+        default_branch=default_branch,
+        branch_protection_rules=[
+            graphql.BranchProtectionRule.from_node(protection_rule_node(pattern))
+            for pattern in patterns
+        ],
+    )
+    rule = state.default_branch_protection
+    assert (rule and rule.pattern) == expected_pattern
+
+
+def test_get_protection_snapshot_matches_wildcard_rules():
+    page = repositories_page(["wildcard", "ambiguous"], None)
+    nodes = page["data"]["organization"]["repositories"]["nodes"]
+    nodes[0]["branchProtectionRules"]["nodes"] = [protection_rule_node("ma*")]
+    nodes[1]["branchProtectionRules"]["nodes"] = [
+        protection_rule_node("*"),
+        protection_rule_node("m*"),
+    ]
+    with responses.RequestsMock() as rsps:
+        rsps.post(GRAPHQL_URL, json=page)
+        snapshot = graphql.get_protection_snapshot(organization="example")
+
+    wildcard = snapshot.get(full_name="example/wildcard", branch_name="main")
+    assert wildcard["required_approving_review_count"] == 2
+    # GitHub applies the oldest of the matching rules, which the API doesn't report.
+    assert snapshot.get(full_name="example/ambiguous", branch_name="main") is None
+
+
+def test_get_permission_snapshot(mocker):
+    page = {
+        "data": {
+            "organization": {
+                "team": {
+                    "repositories": {
+                        "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        "edges": [
+                            {
+                                "permission": "MAINTAIN",
+                                "node": {"nameWithOwner": "example/one"},
+                            }
+                        ],
+                    }
+                }
+            }
+        }
+    }
+    with responses.RequestsMock() as rsps:
+        rsps.post(GRAPHQL_URL, json=page)
+        rsps.post(
+            GRAPHQL_URL,
+            json={
+                "data": {
+                    "organization": {
+                        "team": {
+                            "repositories": {
+                                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                                "edges": [],
+                            }
+                        }
+                    }
+                }
+            },
+        )
+        snapshot = graphql.get_permission_snapshot(
+            organization="example", team_slugs=["platform", "empty", "platform"]
+        )
+        assert len(rsps.calls) == 2
+
+    platform = mocker.MagicMock(slug="platform")
+    empty = mocker.MagicMock(slug="empty")
+    repository = mocker.MagicMock(full_name="example/one")
+    assert snapshot.get(platform, repository).maintain
+    assert not snapshot.get(platform, repository).admin
+    assert snapshot.covers(empty)
+    assert snapshot.get(empty, repository) is None
+
+
+@pytest.mark.parametrize(
+    "status, body",
+    [
+        (200, {"errors": [{"message": "Could not resolve to an Organization"}]}),
+        (200, {"data": {"organization": None}}),
+        (502, {"message": "Bad gateway"}),
+    ],
+)
+def test_graphql_errors_raise(status, body):
+    with responses.RequestsMock() as rsps:
+        rsps.post(GRAPHQL_URL, status=status, json=body)
+        with pytest.raises(graphql.GraphQLException):
+            graphql.get_repository_states(organization="example")
@@ -1,3 +1,5 @@
+import pytest
+
 from launch.github import hooks
 
 
@@ -33,3 +35,93 @@ def test_create_hook_dry_run(mocker):
         dry_run=True,
     )
     repo.create_hook.assert_not_called()
+
+
+def make_hook(mocker, url, events, active=True, content_type="json"):
+    hook = mocker.MagicMock()
+    hook.config = {
+        "url": url,
+        "content_type": content_type,
+        "insecure_ssl": "0",
+        "secret": "********",
+    }
+    hook.events = events
+    hook.active = active
+    return hook
+
+
+@pytest.mark.parametrize(
+    "existing_events, existing_active, expect_edit",
+    [
+        (["pull_request", "push"], True, False),
+        (["push"], True, True),
+        (["push", "pull_request"], False, True),
+    ],
+)
+def test_create_hook_reconciles_existing_hook(
+    existing_events, existing_active, expect_edit, mocker
+):
+    repo = mocker.MagicMock()
+    hook = make_hook(
+        mocker, "https://launch-test-webhook.url", existing_events, existing_active
+    )
+    other_hook = make_hook(mocker, "https://elsewhere.url", ["push"])
+    repo.get_hooks.return_value = [other_hook, hook]
+
+    hooks.create_hook(
+        repo=repo,
+        name="web",
+        config={
+            "url": "https://launch-test-webhook.url",
+            "content_type": "json",
+            "secret": None,
+            "insecure_ssl": 0,
+        },
+        events=["push", "pull_request"],
+        active=True,
+        dry_run=False,
+    )
+    repo.create_hook.assert_not_called()
+    other_hook.edit.assert_not_called()
+    assert hook.edit.called == expect_edit
+
+
+def test_create_hook_updates_matching_hook_when_secret_is_supplied(mocker):
+    repo = mocker.MagicMock()
+    hook = make_hook(mocker, "https://launch-test-webhook.url", ["push"])
+    repo.get_hooks.return_value = [hook]
+    config = {
+        "url": "https://launch-test-webhook.url",
+        "content_type": "json",
+        "secret": "rotated",
+        "insecure_ssl": "0",
+    }
+
+    hooks.create_hook(
+        repo=repo,
+        name="web",
+        config=config,
+        events=["push"],
+        active=True,
+        dry_run=False,
+    )
+    hook.edit.assert_called_once_with(
+        name="web", config=config, events=["push"], active=True
+    )
+
+
+def test_create_hook_dry_run_does_not_update(mocker):
+    repo = mocker.MagicMock()
+    hook = make_hook(mocker, "https://launch-test-webhook.url", ["push"], False)
+    repo.get_hooks.return_value = [hook]
+
+    hooks.create_hook(
+        repo=repo,
+        name="web",
+        config={"url": "https://launch-test-webhook.url"},
+        events=["push"],
+        active=True,
+        dry_run=True,
+    )
+    hook.edit.assert_not_called()
+    repo.create_hook.assert_not_called()
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from launch.github import pagination
+
+
+def test_prefetch_yields_every_item_in_order():
+    assert list(pagination.prefetch(range(250), buffer_size=100)) == list(range(250))
+
+
+def test_prefetch_reraises_errors():
+    def failing():
+        yield 1
+        raise RuntimeError("page failed")
+
+    items = pagination.prefetch(failing(), buffer_size=10)
+    assert next(items) == 1
+    with pytest.raises(RuntimeError, match="page failed"):
+        next(items)
+
+
+def test_prefetch_stops_producer_when_closed():
+    produced = []
+    finished = threading.Event()
+
+    def endless():
+        try:
+            for i in range(10_000):
+                produced.append(i)
+                yield i
+        finally:
+            finished.set()
+
+    items = pagination.prefetch(endless(), buffer_size=5)
+    assert next(items) == 0
+    items.close()
+    assert finished.wait(timeout=5)
+    assert len(produced) < 10_000
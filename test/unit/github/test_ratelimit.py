@@ -0,0 +1,222 @@
+import pytest
+import requests
+import responses
+
+from launch.github import bulk, ratelimit
+from launch.github.client import GitHubAdapter
+from launch.github.ratelimit import RateLimitScheduler
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    yield FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock):
+    yield RateLimitScheduler(
+        requests_per_second=1,
+        burst=2,
+        max_concurrency=8,
+        max_retries=3,
+        backoff_base=1,
+        backoff_cap=10,
+        clock=clock,
+        wall_clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+def rate_limit_headers(remaining: int, reset: float) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Used": str(5000 - remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+    }
+
+
+def test_token_bucket_paces_after_burst(scheduler, clock):
+    for _ in range(3):
+        scheduler.acquire()
+        scheduler.release()
+    assert clock.sleeps == [1]
+
+
+def test_waits_for_primary_rate_limit_reset(scheduler, clock):
+    scheduler.record_response(200, rate_limit_headers(0, clock.now + 30))
+    scheduler.acquire()
+    scheduler.release()
+    assert clock.sleeps == [30]
+
+
+def test_budget_tracks_headers(scheduler, clock):
+    assert scheduler.budget().remaining is None
+    assert scheduler.has_budget(100)
+    scheduler.record_response(200, rate_limit_headers(50, clock.now + 60))
+    budget = scheduler.budget()
+    assert (budget.limit, budget.remaining, budget.used) == (5000, 50, 4950)
+    assert not scheduler.has_budget(100)
+    assert scheduler.has_budget(50)
+    clock.now += 60
+    assert scheduler.has_budget(100)
+
+
+def test_anonymous_rate_limit_does_not_hold_up_authenticated_requests(scheduler, clock):
+    scheduler.record_response(403, rate_limit_headers(0, clock.now + 3000), "")
+    assert not scheduler.has_budget(100)
+    assert scheduler.has_budget(100, authorization="Bearer ghp_test_value")
+    scheduler.acquire(authorization="Bearer ghp_test_value")
+    scheduler.release()
+    assert clock.sleeps == []
+
+
+def test_budgets_are_kept_per_resource(scheduler, clock):
+    authorization = "Bearer ghp_test_value"
+    scheduler.record_response(
+        200, rate_limit_headers(4000, clock.now + 60), authorization=authorization
+    )
+    scheduler.record_response(
+        200,
+        {**rate_limit_headers(3, clock.now + 60), "X-RateLimit-Resource": "graphql"},
+        authorization=authorization,
+    )
+    assert scheduler.budget(authorization=authorization).remaining == 4000
+    assert (
+        scheduler.budget(authorization=authorization, resource="graphql").remaining == 3
+    )
+    assert scheduler.has_budget(100, authorization=authorization)
+
+
+def test_rate_limit_identity():
+    assert ratelimit.rate_limit_identity("token abc") == ratelimit.rate_limit_identity(
+        "Bearer abc"
+    )
+    assert ratelimit.rate_limit_identity("Bearer abc") != ratelimit.rate_limit_identity(
+        "Bearer def"
+    )
+    assert "abc" not in ratelimit.rate_limit_identity("Bearer abc")
+    assert ratelimit.rate_limit_identity(None) == "anonymous"
+
+
+@pytest.mark.parametrize(
+    "url, resource",
+    [
+        ("https://api.github.com/repos/example/example", "core"),
+        ("https://api.github.com/graphql", "graphql"),
+        ("https://api.github.com/search/code?q=launch", "search"),
+    ],
+)
+def test_request_resource(url, resource):
+    assert ratelimit.request_resource(url) == resource
+
+
+def test_secondary_rate_limit_reduces_concurrency(scheduler):
+    secondary = {"Retry-After": "60"}
+    scheduler.record_response(403, secondary, "")
+    assert scheduler.concurrency_limit == 4
+    scheduler.record_response(429, {}, "You have exceeded a secondary rate limit")
+    assert scheduler.concurrency_limit == 2
+    for _ in range(20):
+        scheduler.record_response(200, {})
+    assert scheduler.concurrency_limit == 3
+
+
+def test_primary_rate_limit_is_not_secondary(scheduler, clock):
+    scheduler.record_response(403, rate_limit_headers(0, clock.now + 30), "")
+    assert scheduler.concurrency_limit == 8
+
+
+@pytest.mark.parametrize(
+    "method, status_code, headers, body, attempt, expected",
+    [
+        ("GET", 200, {}, "", 0, None),
+        ("GET", 404, {}, "", 0, None),
+        ("GET", 403, {}, "Resource not accessible", 0, None),
+        ("GET", 403, {"Retry-After": "7"}, "", 0, 7),
+        ("PUT", 429, {"Retry-After": "7"}, "", 0, 7),
+        ("GET", 403, {"Retry-After": "7"}, "", 3, None),
+        ("POST", 403, {"Retry-After": "7"}, "", 0, None),
+        ("PATCH", 502, {}, "", 0, None),
+        ("GET", 403, rate_limit_headers(0, 1030), "", 0, 30),
+    ],
+)
+def test_retry_delay(scheduler, method, status_code, headers, body, attempt, expected):
+    assert (
+        scheduler.retry_delay(
+            method=method,
+            status_code=status_code,
+            headers=headers,
+            body=body,
+            attempt=attempt,
+        )
+        == expected
+    )
+
+
+def test_retry_delay_backoff_is_jittered_and_capped(scheduler):
+    for attempt in range(3):
+        delay = scheduler.retry_delay(
+            method="GET", status_code=503, headers={}, body="", attempt=attempt
+        )
+        assert 0 <= delay <= min(10, 2**attempt)
+
+
+def test_adapter_retries_rate_limited_requests(scheduler, clock):
+    session = requests.Session()
+    session.mount("https://", GitHubAdapter(scheduler=scheduler))
+    url = "https://api.github.com/repos/example/example"
+    with responses.RequestsMock() as rsps:
+        rsps.get(url, status=403, headers={"Retry-After": "5"}, body="")
+        rsps.get(url, status=200, json={"name": "example"})
+        response = session.get(url)
+        assert len(rsps.calls) == 2
+    assert response.status_code == 200
+    assert 5 in clock.sleeps
+
+
+def test_adapter_does_not_retry_writes(scheduler):
+    session = requests.Session()
+    session.mount("https://", GitHubAdapter(scheduler=scheduler))
+    url = "https://api.github.com/repos/example/example/hooks"
+    with responses.RequestsMock() as rsps:
+        rsps.post(url, status=403, headers={"Retry-After": "5"}, body="")
+        response = session.post(url, json={})
+        assert len(rsps.calls) == 1
+    assert response.status_code == 403
+
+
+def test_run_bulk_stops_when_budget_is_exhausted(scheduler, clock, mocker):
+    mocker.patch.object(bulk, "get_rate_limit_scheduler", return_value=scheduler)
+    repositories = []
+    for name in ["one", "two"]:
+        repository = mocker.MagicMock()
+        repository.name = name
+        repositories.append(repository)
+
+    def action(repository):
+        # PyGithub's requests for the same token count against the same budget.
+        scheduler.record_response(
+            200,
+            rate_limit_headers(10, clock.now + 60),
+            authorization="token ghp_test_value",
+        )
+
+    results = bulk.run_bulk(
+        repositories=repositories, action=action, max_workers=1, rate_limit_reserve=50
+    )
+    assert [r.succeeded for r in results] == [True, False]
+    assert "rate limit" in results[1].error
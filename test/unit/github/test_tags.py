@@ -1,9 +1,13 @@
 import logging
+import re
 
 import pytest
+import requests
+import responses
 from semver import Version
 
 from launch.github import tags
+from launch.github.auth import get_anonymous_github_instance
 
 
 @pytest.fixture
@@ -30,7 +34,7 @@ def test_get_repo_tags_includes_non_semantic_versions(mocked_tags, caplog, mocke
 
     mocked_repo = mocker.MagicMock()
     mocked_repo.name = "mocked_repo"
-    mocked_repo.get_tags.return_value = mocked_tags
+    mocker.patch.object(tags, "paginate", return_value=iter(mocked_tags))
 
     with caplog.at_level(logging.DEBUG):
         returned_tags = tags.get_repo_tags(repo=mocked_repo)
@@ -46,7 +50,7 @@ def test_get_repo_semantic_versions_drops_non_semantic(mocked_tags, caplog, mock
 
     mocked_repo = mocker.MagicMock()
     mocked_repo.name = "mocked_repo"
-    mocked_repo.get_tags.return_value = input_tags
+    mocker.patch.object(tags, "paginate", return_value=iter(input_tags))
 
     with caplog.at_level(logging.DEBUG):
         returned_tags = tags.get_repo_semantic_versions(repo=mocked_repo)
@@ -57,3 +61,140 @@ def test_get_repo_semantic_versions_drops_non_semantic(mocked_tags, caplog, mock
             in caplog.text
         )
         assert all([r in expected_tags for r in returned_tags])
+
+
+def tags_page(names: list[str]) -> list[dict]:
+    return [
+        {
+            "name": name,
+            "commit": {
+                "sha": "0" * 40,
+                "url": "https://api.github.com/repos/example/example/commits/0",
+            },
+        }
+        for name in names
+    ]
+
+
+RELEASES_URL = "https://api.github.com/repos/example/example/releases"
+
+
+def releases_page(tag_names: list[str], drafts: list[str] = ()) -> list[dict]:
+    return [{"tag_name": name, "draft": name in drafts} for name in tag_names]
+
+
+def test_get_recent_semantic_versions_uses_releases():
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            RELEASES_URL,
+            json=releases_page(
+                ["1.3.0", "1.2.4-alpha", "not-a-version", "1.2.3"], drafts=["1.3.0"]
+            ),
+        )
+        versions = tags.get_recent_semantic_versions(
+            full_name="example/example", session=requests.Session()
+        )
+        assert len(rsps.calls) == 1
+    assert versions == [Version(1, 2, 4, "alpha"), Version(1, 2, 3)]
+
+
+def test_get_recent_semantic_versions_respects_limit():
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            RELEASES_URL,
+            json=releases_page([f"1.0.{patch}" for patch in range(10, 0, -1)]),
+            headers={"Link": f'<{RELEASES_URL}?per_page=3&page=2>; rel="next"'},
+            match=[responses.matchers.query_param_matcher({"per_page": "3"})],
+        )
+        versions = tags.get_recent_semantic_versions(
+            full_name="example/example", session=requests.Session(), limit=3
+        )
+        assert len(rsps.calls) == 1
+    assert versions == [Version(1, 0, 10), Version(1, 0, 9), Version(1, 0, 8)]
+
+
+def test_get_recent_semantic_versions_falls_back_to_tags():
+    refs_url = "https://api.github.com/repos/example/example/git/matching-refs/tags/"
+    with responses.RequestsMock() as rsps:
+        rsps.get(RELEASES_URL, json=[])
+        rsps.get(
+            refs_url,
+            json=[
+                {"ref": f"refs/tags/{name}"} for name in ["1.2.3", "foo", "1.2.3-alpha"]
+            ],
+        )
+        versions = tags.get_recent_semantic_versions(
+            full_name="example/example", session=requests.Session()
+        )
+    assert versions == [Version(1, 2, 3), Version(1, 2, 3, "alpha")]
+
+
+def test_get_recent_semantic_versions_keeps_highest_tags():
+    # Listed by name, 10.0.0 comes before 9.0.0, so the first tags by name miss the newest version.
+    refs_url = "https://api.github.com/repos/example/example/git/matching-refs/tags/"
+    names = ["1.0.0", "10.0.0", "2.0.0", "9.0.0", "9.1.0"]
+    with responses.RequestsMock() as rsps:
+        rsps.get(RELEASES_URL, json=[])
+        rsps.get(
+            refs_url,
+            json=[{"ref": f"refs/tags/{name}"} for name in names[:3]],
+            headers={"Link": f'<{refs_url}?page=2>; rel="next"'},
+        )
+        rsps.get(
+            f"{refs_url}?page=2",
+            json=[{"ref": f"refs/tags/{name}"} for name in names[3:]],
+            match=[responses.matchers.query_param_matcher({"page": "2"})],
+        )
+        versions = tags.get_recent_semantic_versions(
+            full_name="example/example", session=requests.Session(), limit=2
+        )
+    assert versions == [Version(10, 0, 0), Version(9, 1, 0)]
+
+
+def test_get_recent_semantic_versions_raises_on_error():
+    with responses.RequestsMock() as rsps:
+        rsps.get(RELEASES_URL, status=404, json={"message": "Not Found"})
+        with pytest.raises(requests.HTTPError):
+            tags.get_recent_semantic_versions(
+                full_name="example/example", session=requests.Session()
+            )
+
+
+def test_iter_repo_tags_streams_pages_with_page_size():
+    url = re.compile(r"https://api\.github\.com(:443)?/repos/example/example/tags")
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            re.compile(r"https://api\.github\.com(:443)?/repos/example/example$"),
+            json={
+                "name": "example",
+                "full_name": "example/example",
+                "url": "https://api.github.com/repos/example/example",
+            },
+        )
+        rsps.get(
+            url,
+            json=tags_page(["3.0.0", "2.0.0"]),
+            headers={
+                "Link": '<https://api.github.com/repos/example/example/tags?per_page=2&page=2>; rel="next"'
+            },
+            match=[responses.matchers.query_param_matcher({"per_page": "2"})],
+        )
+        rsps.get(
+            url,
+            json=tags_page(["1.0.0"]),
+            match=[
+                responses.matchers.query_param_matcher({"per_page": "2", "page": "2"})
+            ],
+        )
+        repo = get_anonymous_github_instance().get_repo("example/example")
+
+        names = [tag.name for tag in tags.iter_repo_tags(repo=repo, per_page=2)]
+        assert names == ["3.0.0", "2.0.0", "1.0.0"]
+        assert len(rsps.calls) == 3
+
+        limited = [
+            tag.name for tag in tags.iter_repo_tags(repo=repo, per_page=2, limit=2)
+        ]
+        assert limited == ["3.0.0", "2.0.0"]
+        # The limit is reached on the first page, so the second page isn't requested.
+        assert len(rsps.calls) == 4
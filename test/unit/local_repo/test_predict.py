@@ -5,8 +5,10 @@ import pytest
 from semver import Version
 
 from launch.local_repo.predict import (
+    DEFAULT_VERSION,
     InvalidBranchNameException,
     latest_tag,
+    predict_package_versions,
     predict_version,
     split_delimiter,
 )
@@ -71,3 +73,19 @@ def test_predict(branch_name: str, expected_version: Version, raises):
             existing_tags=existing_tags, branch_name=branch_name
         )
         assert new_version == expected_version
+
+
+def test_predict_uses_known_latest():
+    assert predict_version(
+        existing_tags=[],
+        branch_name="feature/thing",
+        known_latest=Version(2, 3, 4),
+    ) == Version(2, 4, 0)
+
+
+def test_predict_package_versions():
+    predicted = predict_package_versions(
+        latest_versions={"api": Version(1, 2, 3), "web": None},
+        branch_name="feature/foo",
+    )
+    assert predicted == {"api": Version(1, 3, 0), "web": DEFAULT_VERSION}
@@ -0,0 +1,176 @@
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from launch.local_repo import refs
+from launch.local_repo.branch import get_current_branch_name
+
+
+def git(repo_path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo_path, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def tagged_repo(example_github_repo, monkeypatch):
+    for variable in ["GIT_AUTHOR", "GIT_COMMITTER"]:
+        monkeypatch.setenv(f"{variable}_NAME", "Launch Test")
+        monkeypatch.setenv(f"{variable}_EMAIL", "launch-test@example.com")
+    repo_path = pathlib.Path(example_github_repo.working_dir)
+    example_github_repo.create_tag("1.0.0", message="Annotated release")
+    example_github_repo.create_tag("release/2.0.0")
+    yield repo_path
+
+
+def expected_tags(repo_path) -> dict[str, str]:
+    output = git(
+        repo_path,
+        "for-each-ref",
+        "--format=%(refname:strip=2) %(*objectname) %(objectname)",
+        "refs/tags",
+    )
+    tags = {}
+    for line in output.splitlines():
+        parts = line.split()
+        tags[parts[0]] = parts[1] if len(parts) == 3 else parts[-1]
+    return tags
+
+
+def as_dict(tag_refs: list[refs.TagRef]) -> dict[str, str]:
+    return {tag.name: tag.commit for tag in tag_refs}
+
+
+def test_read_tag_refs_loose(tagged_repo):
+    tag_refs = refs.read_tag_refs(repo_path=tagged_repo)
+    assert [tag.name for tag in tag_refs] == ["0.1.0", "1.0.0", "release/2.0.0"]
+    assert as_dict(tag_refs) == expected_tags(tagged_repo)
+    annotated = next(tag for tag in tag_refs if tag.name == "1.0.0")
+    assert annotated.sha != annotated.commit
+
+
+def test_read_tag_refs_packed(tagged_repo):
+    git(tagged_repo, "pack-refs", "--all")
+    assert not tagged_repo.joinpath(".git", "refs", "tags", "1.0.0").exists()
+    assert as_dict(refs.read_tag_refs(repo_path=tagged_repo)) == expected_tags(
+        tagged_repo
+    )
+
+
+def test_read_tag_refs_loose_overrides_packed(tagged_repo):
+    git(tagged_repo, "pack-refs", "--all")
+    tagged_repo.joinpath("new.txt").write_text("new")
+    git(tagged_repo, "add", "new.txt")
+    git(tagged_repo, "commit", "-m", "new")
+    git(tagged_repo, "tag", "-f", "0.1.0")
+    tags = as_dict(refs.read_tag_refs(repo_path=tagged_repo))
+    assert tags["0.1.0"] == git(tagged_repo, "rev-parse", "HEAD")
+
+
+def test_read_tag_refs_packed_objects_fall_back_to_git(tagged_repo):
+    git(tagged_repo, "repack", "-a", "-d")
+    git(tagged_repo, "prune-packed")
+    assert as_dict(refs.read_tag_refs(repo_path=tagged_repo)) == expected_tags(
+        tagged_repo
+    )
+
+
+def test_worktree(tagged_repo, tmp_path_factory):
+    worktree_path = tmp_path_factory.mktemp("worktrees").joinpath("feature")
+    git(tagged_repo, "worktree", "add", "-b", "feature/thing", str(worktree_path))
+    head = refs.read_head(repo_path=worktree_path)
+    assert head.branch_name == "feature/thing"
+    assert head.sha == git(tagged_repo, "rev-parse", "HEAD")
+    assert get_current_branch_name(repo_path=worktree_path) == "feature/thing"
+    assert as_dict(refs.read_tag_refs(repo_path=worktree_path)) == expected_tags(
+        tagged_repo
+    )
+
+
+def test_read_head_packed_branch(tagged_repo):
+    git(tagged_repo, "pack-refs", "--all")
+    assert refs.read_head(repo_path=tagged_repo) == refs.Head(
+        ref="refs/heads/main", sha=git(tagged_repo, "rev-parse", "HEAD")
+    )
+
+
+def test_detached_head(tagged_repo):
+    git(tagged_repo, "checkout", "--detach")
+    head = refs.read_head(repo_path=tagged_repo)
+    assert head.ref is None
+    assert head.branch_name is None
+    with pytest.raises(RuntimeError):
+        get_current_branch_name(repo_path=tagged_repo)
+
+
+def test_not_a_repository(tmp_path):
+    with pytest.raises(refs.NotAGitRepositoryException):
+        refs.read_tag_refs(repo_path=tmp_path)
+
+
+def test_reading_refs_does_not_import_gitpython(tagged_repo):
+    script = (
+        "import sys\n"
+        "from launch.local_repo.branch import get_current_branch_name\n"
+        "from launch.local_repo.tags import read_semantic_tags\n"
+        f"read_semantic_tags({str(tagged_repo)!r})\n"
+        f"get_current_branch_name({str(tagged_repo)!r})\n"
+        "print('git' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_index_tags_by_commit():
+    index = refs.index_tags_by_commit(
+        [
+            refs.TagRef(name="b", sha="1", commit="c1"),
+            refs.TagRef(name="a", sha="2", commit="c1"),
+            refs.TagRef(name="c", sha="3", commit="c2"),
+        ]
+    )
+    assert index == {"c1": ["a", "b"], "c2": ["c"]}
+
+
+@pytest.fixture
+def shallow_clone(tagged_repo, tmp_path_factory):
+    # A commit after the tags, so that a clone of depth 1 doesn't contain any tagged commit.
+    tagged_repo.joinpath("later.txt").write_text("later")
+    git(tagged_repo, "add", "later.txt")
+    git(tagged_repo, "commit", "-m", "Added later.txt")
+    clone_path = tmp_path_factory.mktemp("clone")
+    subprocess.run(
+        ["git", "clone", "--depth=1", "--no-tags", tagged_repo.as_uri(), clone_path],
+        capture_output=True,
+        check=True,
+    )
+    yield clone_path
+
+
+def test_read_remote_tag_refs(tagged_repo, shallow_clone):
+    assert refs.read_tag_refs(repo_path=shallow_clone) == []
+    remote_tags = refs.read_remote_tag_refs(repo_path=shallow_clone)
+    assert [tag.name for tag in remote_tags] == ["0.1.0", "1.0.0", "release/2.0.0"]
+    assert as_dict(remote_tags) == expected_tags(tagged_repo)
+    annotated = next(tag for tag in remote_tags if tag.name == "1.0.0")
+    assert annotated.sha != annotated.commit
+
+
+def test_read_remote_tag_refs_unknown_remote(shallow_clone):
+    with pytest.raises(refs.RemoteRefsException):
+        refs.read_remote_tag_refs(repo_path=shallow_clone, remote_name="missing")
+
+
+def test_fetch_tag_ref_into_shallow_clone(tagged_repo, shallow_clone):
+    assert refs.is_shallow_repository(repo_path=shallow_clone)
+    commit = expected_tags(tagged_repo)["1.0.0"]
+    assert not refs.has_commit(repo_path=shallow_clone, sha=commit)
+
+    refs.fetch_tag_ref(repo_path=shallow_clone, name="1.0.0")
+    assert refs.has_commit(repo_path=shallow_clone, sha=commit)
+    assert as_dict(refs.read_tag_refs(repo_path=shallow_clone)) == {"1.0.0": commit}
+    assert refs.is_shallow_repository(repo_path=shallow_clone)
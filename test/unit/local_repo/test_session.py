@@ -0,0 +1,93 @@
+import logging
+import pathlib
+import subprocess
+
+import pytest
+from semver import Version
+
+from launch.local_repo import session as session_module
+from launch.local_repo import tags
+from launch.local_repo.branch import get_current_branch_name
+from launch.local_repo.session import RepositorySession
+
+
+def test_session_reads_refs_once(example_github_repo, mocker):
+    read_tag_refs = mocker.spy(session_module, "read_tag_refs")
+    read_head = mocker.spy(session_module, "read_head")
+    session = RepositorySession(repo_path=example_github_repo.working_dir)
+    repo_path = example_github_repo.working_dir
+
+    assert get_current_branch_name(repo_path=repo_path, session=session) == "main"
+    assert tags.read_tags(repo_path=repo_path, session=session) == ["0.1.0"]
+    assert tags.read_semantic_tags(repo_path=repo_path, session=session) == [
+        Version(0, 1, 0)
+    ]
+    assert tags.read_semantic_version_tag(
+        repo_path=repo_path, session=session
+    ) == Version(0, 1, 0)
+
+    read_tag_refs.assert_called_once()
+    read_head.assert_called_once()
+
+
+def test_session_sees_tags_it_creates(example_github_repo, mocker):
+    acquire_repo = mocker.spy(tags, "acquire_repo")
+    session = RepositorySession(repo_path=example_github_repo.working_dir)
+    repo_path = example_github_repo.working_dir
+    assert tags.read_latest_semantic_tag(repo_path=repo_path, session=session) == (
+        Version(0, 1, 0)
+    )
+
+    new_tag = tags.create_version_tag(
+        repo_path=repo_path, version=Version(0, 2, 0), session=session
+    )
+    assert tags.read_latest_semantic_tag(repo_path=repo_path, session=session) == (
+        Version(0, 2, 0)
+    )
+    assert tags.read_version_tag(repo_path=repo_path, session=session) == new_tag
+    acquire_repo.assert_called_once()
+
+
+@pytest.fixture
+def shallow_clone(example_github_repo, tmp_path_factory):
+    origin = pathlib.Path(example_github_repo.working_dir)
+    origin.joinpath("api").mkdir()
+    origin.joinpath("api", "main.py").write_text("api")
+    example_github_repo.index.add("api/main.py")
+    example_github_repo.index.commit("Added api")
+    example_github_repo.create_tag("1.0.0")
+    example_github_repo.create_tag("api/1.0.0")
+    origin.joinpath("api", "main.py").write_text("api, changed")
+    example_github_repo.index.add("api/main.py")
+    example_github_repo.index.commit("Changed api")
+
+    clone_path = tmp_path_factory.mktemp("clone")
+    subprocess.run(
+        ["git", "clone", "--depth=1", "--no-tags", origin.as_uri(), clone_path],
+        capture_output=True,
+        check=True,
+    )
+    yield clone_path
+
+
+def test_session_reads_remote_tags(shallow_clone, caplog):
+    with caplog.at_level(logging.WARNING):
+        assert tags.read_latest_semantic_tag(repo_path=shallow_clone) is None
+        assert "shallow clone without version tags" in caplog.text
+
+    session = RepositorySession(repo_path=shallow_clone, tag_source="remote")
+    assert tags.read_latest_semantic_tag(
+        repo_path=shallow_clone, session=session
+    ) == Version(1, 0, 0)
+    # Listing the remote's tags doesn't fetch them.
+    assert tags.read_tags(repo_path=shallow_clone) == []
+
+
+def test_session_fetches_missing_tags(shallow_clone):
+    session = RepositorySession(
+        repo_path=shallow_clone, tag_source="remote", fetch_missing_tags=True
+    )
+    assert tags.read_changed_packages(
+        repo_path=shallow_clone, packages={"api": "api"}, session=session
+    ) == ["api"]
+    assert tags.read_tags(repo_path=shallow_clone) == ["api/1.0.0"]
@@ -4,16 +4,22 @@ import pytest
 from git.repo import Repo
 from semver import Version
 
-from launch.local_repo import tags  # Used for mocking only
+from launch.local_repo import session, tags  # Used for mocking only
 from launch.local_repo.tags import (
     CommitNotTaggedException,
     CommitTagNotSemanticVersionException,
     acquire_repo,
+    create_package_version_tags,
     create_version_tag,
     push_version_tag,
+    push_version_tags,
+    read_changed_packages,
+    read_latest_package_versions,
+    read_package_versions,
     read_semantic_tags,
     read_semantic_version_tag,
     read_tags,
+    read_version_tag,
     tag_is_semantic,
 )
 
@@ -121,3 +127,99 @@ def test_read_semantic_version_tag_not_semver(example_github_repo):
     example_github_repo.create_tag("not_semantic_versioned")
     with pytest.raises(CommitTagNotSemanticVersionException):
         read_semantic_version_tag(repo_path=example_github_repo.working_dir)
+
+
+def test_read_version_tag(example_github_repo):
+    example_github_repo.create_tag("0.2.0")
+    tag = read_version_tag(repo_path=example_github_repo.working_dir)
+    assert tag.name == "0.2.0"
+    assert tag.commit == example_github_repo.head.object
+
+
+def test_read_version_tag_untagged(example_github_repo):
+    pathlib.Path(example_github_repo.working_dir).joinpath("new.txt").write_text(
+        "hello world"
+    )
+    example_github_repo.index.add("new.txt")
+    example_github_repo.index.commit("Added new.txt")
+    with pytest.raises(CommitNotTaggedException):
+        read_version_tag(repo_path=example_github_repo.working_dir)
+
+
+def test_read_semantic_version_tag_reads_refs_once(example_github_repo, mocker):
+    for patch in range(1, 20):
+        example_github_repo.create_tag(f"0.1.{patch}")
+    read_tag_refs = mocker.spy(session, "read_tag_refs")
+    tag_version = read_semantic_version_tag(repo_path=example_github_repo.working_dir)
+    # Names are compared as strings, matching how tags have always been ordered here.
+    assert tag_version == Version(major=0, minor=1, patch=9)
+    read_tag_refs.assert_called_once()
+
+
+def commit_file(repo: Repo, path: str, content: str):
+    file_path = pathlib.Path(repo.working_dir).joinpath(path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(content)
+    repo.index.add(path)
+    repo.index.commit(f"Changed {path}")
+
+
+def test_read_package_versions_groups_prefixed_tags(example_github_repo):
+    for name in ["api/1.0.0", "api/1.2.0", "api-v1.1.0", "web/0.1.0", "web/notes"]:
+        example_github_repo.create_tag(name)
+    session_ = session.RepositorySession(repo_path=example_github_repo.working_dir)
+    assert read_package_versions(
+        repo_path=example_github_repo.working_dir, session=session_
+    ) == {
+        "api": [Version(1, 0, 0), Version(1, 1, 0), Version(1, 2, 0)],
+        "web": [Version(0, 1, 0)],
+    }
+    assert read_latest_package_versions(
+        repo_path=example_github_repo.working_dir,
+        packages=["api", "db"],
+        session=session_,
+    ) == {"api": Version(1, 2, 0), "db": None}
+    # Plain semantic version tags aren't affected by package tags.
+    assert read_semantic_tags(repo_path=example_github_repo.working_dir) == [
+        Version(0, 1, 0)
+    ]
+
+
+def test_read_changed_packages(example_github_repo, mocker):
+    commit_file(example_github_repo, "api/main.py", "api")
+    commit_file(example_github_repo, "web/index.html", "web")
+    example_github_repo.create_tag("api/1.0.0")
+    example_github_repo.create_tag("web-v1.0.0")
+    commit_file(example_github_repo, "api/main.py", "api, changed")
+    commit_file(example_github_repo, "README.md", "readme")
+
+    diff = mocker.spy(tags, "read_changed_paths")
+    changed = read_changed_packages(
+        repo_path=example_github_repo.working_dir,
+        packages={"web": "web", "api": "api", "db": "db"},
+    )
+    # db has never been tagged, and api and web share the diff from the commit they were both tagged on.
+    assert changed == ["api", "db"]
+    assert diff.call_count == 1
+
+
+def test_create_and_push_package_version_tags(example_github_repo, mocker):
+    session_ = session.RepositorySession(repo_path=example_github_repo.working_dir)
+    new_tags = create_package_version_tags(
+        repo_path=example_github_repo.working_dir,
+        versions={"api": Version(1, 0, 0), "web": Version(0, 2, 0)},
+        scheme="dash",
+        session=session_,
+    )
+    assert [tag.name for tag in new_tags] == ["api-v1.0.0", "web-v0.2.0"]
+    assert read_package_versions(
+        repo_path=example_github_repo.working_dir, session=session_
+    ) == {"api": [Version(1, 0, 0)], "web": [Version(0, 2, 0)]}
+
+    repo_mock = mocker.MagicMock()
+    mocker.patch.object(tags, "acquire_repo", return_value=repo_mock)
+    push_version_tags(repo_path=example_github_repo.working_dir, tags=new_tags)
+    repo_mock.remote.assert_called_once_with("origin")
+    repo_mock.remote.return_value.push.assert_called_once_with(
+        ["refs/tags/api-v1.0.0", "refs/tags/web-v0.2.0"], atomic=True
+    )
@@ -0,0 +1,83 @@
+import json
+import pathlib
+
+import pytest
+from semver import Version
+
+from launch.local_repo import version_index
+from launch.local_repo.refs import find_git_directories
+from launch.local_repo.tags import read_latest_semantic_tag, read_semantic_tags
+
+
+@pytest.fixture
+def repo_path(example_github_repo):
+    example_github_repo.create_tag("0.10.0")
+    example_github_repo.create_tag("0.2.0-rc.1")
+    example_github_repo.create_tag("not-semantic")
+    yield pathlib.Path(example_github_repo.working_dir)
+
+
+@pytest.fixture
+def trust_immediately(mocker):
+    # Lets a freshly written index be trusted without waiting out the racy timestamp window.
+    mocker.patch.object(version_index, "RACY_WINDOW_NS", -(10**12))
+
+
+def index_path(repo_path) -> pathlib.Path:
+    return version_index.version_index_path(find_git_directories(repo_path))
+
+
+def test_load_version_index_sorts_versions(repo_path):
+    index = version_index.load_version_index(repo_path=repo_path)
+    assert index.versions() == [
+        Version(0, 1, 0),
+        Version(0, 2, 0, "rc.1"),
+        Version(0, 10, 0),
+    ]
+    assert index.latest() == Version(0, 10, 0)
+    assert index.non_semantic == {"not-semantic"}
+    assert index_path(repo_path).is_file()
+
+
+def test_trusted_index_skips_reading_refs(repo_path, trust_immediately, mocker):
+    version_index.load_version_index(repo_path=repo_path)
+    read_tag_refs = mocker.spy(version_index, "read_tag_refs")
+    assert read_latest_semantic_tag(repo_path=repo_path) == Version(0, 10, 0)
+    read_tag_refs.assert_not_called()
+
+
+def test_new_tags_invalidate_index(repo_path, example_github_repo, trust_immediately):
+    version_index.load_version_index(repo_path=repo_path)
+    example_github_repo.create_tag("1.0.0")
+    assert read_latest_semantic_tag(repo_path=repo_path) == Version(1, 0, 0)
+    assert Version(1, 0, 0) in read_semantic_tags(repo_path=repo_path)
+
+
+def test_update_version_index_only_parses_new_tags():
+    index, parsed = version_index.update_version_index(
+        version_index.VersionIndex(),
+        {"1.0.0": "a", "0.9.0": "b", "nope": "c"},
+    )
+    assert parsed == 3
+
+    updated, parsed = version_index.update_version_index(
+        index, {"1.0.0": "d", "0.9.0": "b", "nope": "c", "1.1.0": "e"}
+    )
+    assert parsed == 1
+    assert [(row[5], row[6]) for row in updated.rows] == [
+        ("0.9.0", "b"),
+        ("1.0.0", "d"),
+        ("1.1.0", "e"),
+    ]
+
+    removed, parsed = version_index.update_version_index(updated, {"0.9.0": "b"})
+    assert parsed == 0
+    assert removed.latest() == Version(0, 9, 0)
+    assert removed.non_semantic == set()
+
+
+def test_unreadable_index_is_rebuilt(repo_path):
+    version_index.load_version_index(repo_path=repo_path)
+    index_path(repo_path).write_text("{not json")
+    assert read_latest_semantic_tag(repo_path=repo_path) == Version(0, 10, 0)
+    assert json.loads(index_path(repo_path).read_text())["format"] == 1
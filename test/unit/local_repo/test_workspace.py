@@ -0,0 +1,77 @@
+import json
+import pathlib
+
+import pytest
+from git.repo import Repo
+
+from launch.local_repo.workspace import (
+    discover_repositories,
+    predict_repository,
+    predict_workspace,
+    read_branch_map,
+)
+
+
+def make_repo(path: pathlib.Path, branch: str = "main", tag: str | None = None) -> Repo:
+    repo = Repo.init(path=path, initial_branch=branch, mkdir=True)
+    path.joinpath("test.txt").write_text("Sample file")
+    repo.index.add("test.txt")
+    repo.index.commit("Added test.txt")
+    if tag:
+        repo.create_tag(tag)
+    return repo
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    make_repo(tmp_path.joinpath("alpha"), branch="feature/one", tag="1.2.3")
+    make_repo(tmp_path.joinpath("group", "beta"), tag="0.4.0")
+    make_repo(tmp_path.joinpath("group", "beta", "vendored"))
+    make_repo(tmp_path.joinpath(".hidden", "gamma"))
+    make_repo(tmp_path.joinpath("a", "b", "c", "too-deep"))
+    tmp_path.joinpath("not-a-repo").mkdir()
+    yield tmp_path
+
+
+def test_discover_repositories(workspace):
+    assert discover_repositories(root=workspace) == [
+        workspace.joinpath("alpha"),
+        workspace.joinpath("group", "beta"),
+    ]
+    assert workspace.joinpath("a", "b", "c", "too-deep") in discover_repositories(
+        root=workspace, max_depth=4
+    )
+
+
+def test_read_branch_map(tmp_path):
+    path = tmp_path.joinpath("branches.json")
+    path.write_text(json.dumps({"group/beta": "fix/bar"}))
+    assert read_branch_map(path) == {"group/beta": "fix/bar"}
+
+    path.write_text(json.dumps(["fix/bar"]))
+    with pytest.raises(ValueError):
+        read_branch_map(path)
+
+
+def test_predict_repository_reports_failures(workspace):
+    prediction = predict_repository(
+        root=workspace, repo_path=workspace.joinpath("group", "beta")
+    )
+    assert prediction.source_branch == "main"
+    assert prediction.latest_version == "0.4.0"
+    assert prediction.predicted_version is None
+    assert "did not contain expected delimiter" in prediction.error
+
+
+def test_predict_workspace(workspace):
+    predictions = predict_workspace(
+        root=workspace,
+        repositories=discover_repositories(root=workspace),
+        branch_map={"group/beta": "fix/bar"},
+        max_workers=2,
+    )
+    by_repository = {prediction.repository: prediction for prediction in predictions}
+    assert by_repository["alpha"].predicted_version == "1.3.0"
+    assert by_repository["group/beta"].source_branch == "fix/bar"
+    assert by_repository["group/beta"].predicted_version == "0.4.1"
+    assert all(prediction.succeeded for prediction in by_repository.values())
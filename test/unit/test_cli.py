@@ -1,11 +1,59 @@
+import json
 import pathlib
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
 
 import pytest
+from git.repo import Repo
+from github.GithubException import UnknownObjectException
+from semver import Version
 
+from launch import update
 from launch.cli import entrypoint
 from launch.cli.github.access.commands import set_default
 from launch.cli.github.hooks.commands import create
-from launch.cli.github.version.commands import apply, predict
+from launch.cli.github.version.commands import apply, predict, predict_workspace
+from launch.github import access
+
+HEAVY_MODULES = ["github", "git", "semver", "requests"]
+# Cumulative time, in microseconds, that `launch --help` may spend importing the launch package and everything it pulls in.
+# It takes about a third of this today, and importing PyGithub eagerly would cost more than the whole budget on its own.
+# Interpreter startup isn't counted, as it depends on what else is installed.
+HELP_IMPORT_BUDGET_US = 200_000
+
+
+def run_cli_help_in_subprocess(*args: str) -> subprocess.CompletedProcess:
+    script = (
+        "import sys\n"
+        "from launch.cli.entrypoint import cli\n"
+        "try:\n"
+        f"    cli({list(args) + ['--help']!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print('heavy:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_cli_help_import_budget():
+    result = run_cli_help_in_subprocess()
+    # Lines look like "import time:  self [us] | cumulative | imported package", top-level imports aren't indented.
+    launch_import_time = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith(" launch"):
+            launch_import_time += int(cumulative)
+    assert 0 < launch_import_time < HELP_IMPORT_BUDGET_US
 
 
 def test_cli_help(cli_runner):
@@ -14,18 +62,247 @@ def test_cli_help(cli_runner):
     assert not result.exception
 
 
+@pytest.mark.parametrize(
+    "subcommand, imported",
+    [
+        ([], ""),
+        (["github"], ""),
+        (["github", "access"], ""),
+        (["github", "hooks"], ""),
+        # Listing the version commands loads their module, which works with semver versions throughout.
+        (["github", "version"], "semver"),
+    ],
+)
+def test_cli_help_does_not_import_heavy_modules(subcommand, imported):
+    result = run_cli_help_in_subprocess(*subcommand)
+    assert result.stdout.splitlines()[-1] == f"heavy:{imported}"
+
+
 def test_github_access_command_help(cli_runner):
     result = cli_runner.invoke(set_default, "--help")
     assert "set-default" in result.output
     assert not result.exception
 
 
+@pytest.fixture
+def mocked_organization(mocker):
+    organization = mocker.MagicMock()
+    repositories = []
+    for name in ["tf-aws-module", "caf-component", "other-repo", "archived-repo"]:
+        repository = mocker.MagicMock()
+        repository.name = name
+        repository.archived = name == "archived-repo"
+        repositories.append(repository)
+    organization.get_repos.return_value = repositories
+
+    def get_repo(name):
+        for repository in repositories:
+            if repository.name == name:
+                return repository
+        raise UnknownObjectException(404, {"message": "Not Found"}, {})
+
+    organization.get_repo.side_effect = get_repo
+    mocked_instance = mocker.MagicMock()
+    mocked_instance.get_organization.return_value = organization
+    mocker.patch(
+        "launch.cli.github.access.commands.get_github_instance",
+        return_value=mocked_instance,
+    )
+    yield organization
+
+
+def test_github_access_set_default_requires_a_target(cli_runner, mocked_organization):
+    result = cli_runner.invoke(set_default, [])
+    assert result.exit_code == 2
+    assert "is required" in result.output
+
+
+def test_github_access_set_default_rejects_mixed_targets(
+    cli_runner, mocked_organization
+):
+    result = cli_runner.invoke(set_default, ["--repository-name", "foo", "--all"])
+    assert result.exit_code == 2
+    assert "can't be combined" in result.output
+
+
+def test_github_access_set_default_all(cli_runner, mocked_organization, mocker):
+    mocked_apply = mocker.patch(
+        "launch.cli.github.access.commands.apply_default_access"
+    )
+    result = cli_runner.invoke(set_default, ["--all", "--dry-run"])
+    assert result.exit_code == 0
+    assert mocked_apply.call_count == 3
+    assert "3 succeeded, 0 failed" in result.output
+    # Teams are resolved once up front, not per repository.
+    assert mocked_organization.get_team_by_slug.call_count == len(
+        {"platform", "platform-administrators"}
+        | set(access.REPO_PREFIX_ADMIN_TEAM_SLUG.values())
+    )
+
+
+def test_github_access_set_default_all_with_graphql(
+    cli_runner, mocked_organization, mocker
+):
+    mocked_apply = mocker.patch(
+        "launch.cli.github.access.commands.apply_default_access"
+    )
+    mocked_snapshot = mocker.patch(
+        "launch.github.graphql.get_permission_snapshot",
+    )
+    mocked_protection_snapshot = mocker.patch(
+        "launch.github.graphql.get_protection_snapshot",
+    )
+    mocked_organization.login = "example"
+    result = cli_runner.invoke(set_default, ["--all", "--graphql", "--dry-run"])
+    assert result.exit_code == 0
+    mocked_snapshot.assert_called_once()
+    assert mocked_snapshot.call_args.kwargs["organization"] == "example"
+    mocked_protection_snapshot.assert_called_once_with(organization="example")
+    assert all(
+        call.kwargs["protection_snapshot"] is mocked_protection_snapshot.return_value
+        for call in mocked_apply.call_args_list
+    )
+
+
+def test_github_access_set_default_from_stdin(cli_runner, mocked_organization, mocker):
+    def apply_default_access(repository, **kwargs):
+        if repository.name == "caf-component":
+            raise RuntimeError("Permission denied")
+
+    mocker.patch(
+        "launch.cli.github.access.commands.apply_default_access",
+        side_effect=apply_default_access,
+    )
+    result = cli_runner.invoke(
+        set_default,
+        ["--from-stdin"],
+        input="tf-aws-module\n# comment\n\ncaf-component\nmissing-repo\narchived-repo\n",
+    )
+    assert result.exit_code == 1
+    assert "tf-aws-module: OK" in result.output
+    assert "caf-component: FAILED: Permission denied" in result.output
+    assert "missing-repo: FAILED: repository not found" in result.output
+    assert "archived-repo: FAILED: repository is archived" in result.output
+    assert "1 succeeded, 3 failed" in result.output
+    # Only the named repositories are looked up, the organization isn't listed.
+    mocked_organization.get_repos.assert_not_called()
+
+
+def test_github_access_set_default_single_repository(
+    cli_runner, mocked_organization, mocker
+):
+    mocked_apply = mocker.patch(
+        "launch.cli.github.access.commands.apply_default_access"
+    )
+    mocked_organization.get_repo.side_effect = lambda name: next(
+        r for r in mocked_organization.get_repos.return_value if r.name == name
+    )
+    result = cli_runner.invoke(set_default, ["--repository-name", "other-repo"])
+    assert result.exit_code == 0
+    assert "Couldn't match a domain-specific administrative team" in result.output
+    mocked_apply.assert_called_once()
+    mocked_organization.get_repos.assert_not_called()
+
+
+# Requests made once per bulk command, whatever the number of repositories: the organization, the four teams and their
+# repository listings, and the organization's repository listing.
+BULK_ACCESS_OVERHEAD_REQUESTS = 10
+
+
+@pytest.mark.request_budget(total=BULK_ACCESS_OVERHEAD_REQUESTS + 8, per_repository=1)
+def test_github_access_set_default_all_request_budget(cli_runner, github_requests):
+    result = cli_runner.invoke(
+        set_default,
+        ["--organization", github_requests.organization, "--all", "--dry-run"],
+    )
+    assert result.exit_code == 0
+    # Only the branch protection has to be read per repository, team permissions come from the team listings.
+    assert {method for method, _ in github_requests.requests} == {"GET"}
+
+
+@pytest.mark.request_budget(
+    total=BULK_ACCESS_OVERHEAD_REQUESTS + 5 * 8, per_repository=5
+)
+def test_github_access_set_default_all_writes_request_budget(
+    cli_runner, github_requests
+):
+    result = cli_runner.invoke(
+        set_default, ["--organization", github_requests.organization, "--all"]
+    )
+    assert result.exit_code == 0
+
+    # A second run finds everything in place and only reads.
+    github_requests.reset()
+    result = cli_runner.invoke(
+        set_default, ["--organization", github_requests.organization, "--all"]
+    )
+    assert result.exit_code == 0
+    assert {method for method, _ in github_requests.requests} == {"GET"}
+
+
+@pytest.mark.request_budget(total=13, per_repository=9)
+def test_github_access_set_default_single_repository_request_budget(
+    cli_runner, github_requests
+):
+    result = cli_runner.invoke(
+        set_default,
+        [
+            "--organization",
+            github_requests.organization,
+            "--repository-name",
+            github_requests.repository_names[-1],
+        ],
+    )
+    assert result.exit_code == 0
+
+
+@pytest.mark.request_budget(total=2 + 2 * 8, per_repository=2)
+def test_github_hooks_create_bulk_request_budget(cli_runner, github_requests):
+    result = cli_runner.invoke(
+        create,
+        [
+            "--organization",
+            github_requests.organization,
+            "--all",
+            "--url",
+            "https://example.com/hook",
+        ],
+    )
+    assert result.exit_code == 0
+
+
 def test_github_hooks_command_help(cli_runner):
     result = cli_runner.invoke(create, "--help")
     assert "create" in result.output
     assert not result.exception
 
 
+def test_github_hooks_create_bulk(cli_runner, mocker):
+    organization = mocker.MagicMock()
+    repositories = []
+    for name in ["tf-one", "tf-two", "other"]:
+        repository = mocker.MagicMock()
+        repository.name = name
+        repository.archived = False
+        repositories.append(repository)
+    organization.get_repos.return_value = repositories
+    mocker.patch(
+        "launch.cli.github.hooks.commands.get_github_instance"
+    ).return_value.get_organization.return_value = organization
+    mocked_create_hook = mocker.patch("launch.cli.github.hooks.commands.create_hook")
+
+    result = cli_runner.invoke(
+        create,
+        ["--prefix", "tf-", "--url", "https://example.com/hook", "--dry-run"],
+    )
+    assert result.exit_code == 0
+    assert "2 succeeded, 0 failed" in result.output
+    assert sorted(
+        call.kwargs["repo"].name for call in mocked_create_hook.call_args_list
+    ) == ["tf-one", "tf-two"]
+    assert mocked_create_hook.call_args.kwargs["events"] == ["push"]
+
+
 def test_github_version_predict_help(cli_runner):
     result = cli_runner.invoke(predict, "--help")
     assert "predict" in result.output
@@ -66,6 +343,60 @@ def test_github_version_apply_pipeline_safeguard_flag(
     assert "Remote named 'origin' didn't exist" in with_pipeline.stdout
 
 
+def test_github_version_predict_packages(cli_runner, example_github_repo):
+    example_github_repo.create_tag("api/1.2.3")
+    example_github_repo.create_tag("web/0.4.0")
+    path = pathlib.Path(example_github_repo.working_dir)
+    path.joinpath("api").mkdir()
+    path.joinpath("api", "main.py").write_text("api")
+    example_github_repo.index.add("api/main.py")
+    example_github_repo.index.commit("Added api/main.py")
+
+    result = cli_runner.invoke(
+        predict,
+        f"--repo-path {path} --source-branch feature/foo --package api --package web --package db=services/db --tag-scheme dash",
+    )
+    assert not result.exception
+    assert result.output.splitlines() == ["api-v1.3.0", "db-v0.1.0"]
+
+
+def test_github_version_predict_workspace(cli_runner, tmp_path):
+    for name, branch in [("one", "feature/foo"), ("two", "main")]:
+        repo = Repo.init(
+            path=tmp_path.joinpath(name), initial_branch=branch, mkdir=True
+        )
+        tmp_path.joinpath(name, "test.txt").write_text("Sample file")
+        repo.index.add("test.txt")
+        repo.index.commit("Added test.txt")
+    tmp_path.joinpath("branches.json").write_text(json.dumps({"two": "fix/bar"}))
+
+    result = cli_runner.invoke(
+        predict_workspace,
+        f"--root {tmp_path} --branch-map {tmp_path.joinpath('branches.json')} --max-workers 2",
+    )
+    assert result.exit_code == 0
+    records = sorted(
+        (json.loads(line) for line in result.output.splitlines()),
+        key=lambda record: record["repository"],
+    )
+    assert records == [
+        {
+            "repository": "one",
+            "source_branch": "feature/foo",
+            "latest_version": None,
+            "predicted_version": "0.1.0",
+            "error": None,
+        },
+        {
+            "repository": "two",
+            "source_branch": "fix/bar",
+            "latest_version": None,
+            "predicted_version": "0.1.0",
+            "error": None,
+        },
+    ]
+
+
 def test_github_version_apply_bad_branch_name_exit_code(
     cli_runner, example_github_repo
 ):
@@ -87,7 +418,7 @@ def test_github_version_apply_tag_exists_exit_code(cli_runner, example_github_re
 def test_cli_update_general_env_var_not_set(cli_runner, mocker):
     # Mocked since we don't want to reach out to GitHub and potentially induce rate limiting!
     mocked_update_check = mocker.patch.object(
-        entrypoint, "check_for_updates", return_value=None
+        update, "check_for_updates", return_value=None
     )
     result = cli_runner.invoke(entrypoint.cli, ["github", "--help"])
     assert "Command family for GitHub-related tasks." in result.output
@@ -99,14 +430,64 @@ def test_cli_update_general_env_var_set(cli_runner, mocker):
     # Mocked since we don't want to reach out to GitHub and potentially induce rate limiting!
     mocker.patch("launch.cli.entrypoint.UPDATE_CHECK", new=True)
     mocked_update_check = mocker.patch.object(
-        entrypoint, "check_for_updates", return_value=None
+        update, "check_for_updates", return_value=None
     )
     result = cli_runner.invoke(entrypoint.cli, ["github", "--help"])
     assert "Command family for GitHub-related tasks." in result.output
     assert not result.exception
+    # The check runs on a background thread, give it a moment to be scheduled.
+    deadline = time.monotonic() + 5
+    while not mocked_update_check.called and time.monotonic() < deadline:
+        time.sleep(0.01)
     mocked_update_check.assert_called_once()
 
 
+def test_cli_update_check_does_not_delay_subcommand(cli_runner, mocker):
+    mocker.patch("launch.cli.entrypoint.UPDATE_CHECK", new=True)
+    release_update_check = threading.Event()
+    mocker.patch.object(
+        update,
+        "check_for_updates",
+        side_effect=lambda include_prerelease: release_update_check.wait(timeout=10),
+    )
+
+    start = time.monotonic()
+    result = cli_runner.invoke(entrypoint.cli, ["github", "--help"])
+    elapsed = time.monotonic() - start
+    release_update_check.set()
+
+    assert not result.exception
+    assert "Command family for GitHub-related tasks." in result.output
+    assert "now available" not in result.output
+    assert elapsed < 1
+
+
+def test_cli_update_check_reported_when_finished(cli_runner, mocker):
+    mocker.patch("launch.cli.entrypoint.UPDATE_CHECK", new=True)
+    finished_update_check = Future()
+    finished_update_check.set_result(Version(99, 0, 0))
+    mocker.patch.object(
+        entrypoint, "start_update_check", return_value=finished_update_check
+    )
+    result = cli_runner.invoke(entrypoint.cli, ["github", "--help"])
+    assert not result.exception
+    # The notice is printed after the subcommand's own output.
+    assert result.output.index("Command family for GitHub-related tasks.") < (
+        result.output.index("Version 99.0.0 of Launch-CLI is now available!")
+    )
+
+
+def test_start_update_check_failure_is_quiet(capsys, mocker):
+    mocker.patch.object(
+        update, "check_for_updates", side_effect=Exception("Unexpected")
+    )
+    update_check = entrypoint.start_update_check()
+    with pytest.raises(Exception, match="Unexpected"):
+        update_check.result(timeout=5)
+    entrypoint.report_update_check(update_check)
+    assert capsys.readouterr().out == ""
+
+
 @pytest.mark.skip(
     "TODO: Figure out how Aaron is doing his pipeline mocks and perform the same operations here."
 )
@@ -120,3 +501,28 @@ def test_cli_update_pipeline_env_var_not_set():
 @pytest.mark.parametrize("env_var_value", ["0", "1", "false", "true", "foo"])
 def test_cli_update_pipeline_env_var_set(env_var_value):
     pass
+
+
+def test_cli_profile(cli_runner, example_github_repo, tmp_path):
+    trace_path = tmp_path.joinpath("trace.json")
+    result = cli_runner.invoke(
+        entrypoint.cli,
+        [
+            "--profile-trace",
+            str(trace_path),
+            "github",
+            "version",
+            "predict",
+            "--repo-path",
+            example_github_repo.working_dir,
+            "--source-branch",
+            "feature/foo",
+        ],
+    )
+    assert result.exit_code == 0
+    assert result.stdout.strip() == "0.2.0"
+    assert "Profile:" in result.stderr
+    assert "ref scan" in result.stderr
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert "version index" in {event["name"] for event in events}
+    assert entrypoint.disable_profiling() is None
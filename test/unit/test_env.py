@@ -54,3 +54,36 @@ def test_get_bool_env_var_not_exists():
         env.get_bool_env_var(str(randint(1000000, 1000000000)), default_value=True)
         == True
     )
+
+
+@pytest.mark.parametrize(
+    "variable_value, expected_value, raises",
+    [
+        ("0", 0, does_not_raise()),
+        ("3600", 3600, does_not_raise()),
+        ("-1", -1, does_not_raise()),
+        ("one", None, pytest.raises(ValueError)),
+        ("1.5", None, pytest.raises(ValueError)),
+    ],
+)
+def test_get_int_env_var(variable_value, expected_value, raises, mocker):
+    mocker.patch.object(env.os.environ, "get", return_value=variable_value)
+    with raises:
+        assert (
+            env.get_int_env_var("LAUNCH_EXAMPLE_INT", default_value=5) == expected_value
+        )
+
+
+def test_get_int_env_var_not_exists():
+    assert env.get_int_env_var(str(randint(1000000, 1000000000)), default_value=5) == 5
+
+
+def test_cache_directory_honors_xdg_cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert env.cache_directory() == tmp_path.joinpath("launch-cli")
+
+
+def test_cache_directory_defaults_to_home(tmp_path, monkeypatch):
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert env.cache_directory() == tmp_path.joinpath(".cache", "launch-cli")
@@ -0,0 +1,97 @@
+import urllib.request
+
+import pytest
+
+from launch.cli import entrypoint
+
+from ..loadtest import harness
+from ..loadtest.server import (
+    actors_from_payload,
+    generate_state,
+    protection_from_payload,
+)
+
+
+@pytest.fixture
+def stand_in(github_stand_in):
+    yield github_stand_in(
+        generate_state(organization=harness.ORGANIZATION, repository_count=3)
+    )
+
+
+@pytest.mark.parametrize(
+    "scenario", ["access set-default --dry-run", "access set-default"]
+)
+def test_harness_scenarios_run_against_stand_in(cli_runner, stand_in, scenario):
+    result = cli_runner.invoke(
+        entrypoint.cli,
+        [*harness.SCENARIOS[scenario], "--organization", harness.ORGANIZATION],
+    )
+    assert result.exit_code == 0, result.output
+    assert "3 succeeded, 0 failed" in result.output
+    assert stand_in.request_log
+
+
+def test_hooks_create_against_stand_in(cli_runner, stand_in):
+    result = cli_runner.invoke(
+        entrypoint.cli,
+        [*harness.SCENARIOS["hooks create"], "--organization", harness.ORGANIZATION],
+    )
+    assert result.exit_code == 0, result.output
+    with stand_in.state.lock:
+        hooks = list(stand_in.state.hooks.values())
+    assert len(hooks) == 3
+    assert all(
+        any(hook["config"]["url"] == harness.HOOK_URL for hook in repository_hooks)
+        for repository_hooks in hooks
+    )
+
+
+def test_stand_in_counts_token_and_bearer_against_one_budget(stand_in):
+    used = []
+    for authorization in ["token loadtest-token", "Bearer loadtest-token"]:
+        request = urllib.request.Request(
+            f"{stand_in.url}/rate_limit", headers={"Authorization": authorization}
+        )
+        with urllib.request.urlopen(request) as response:
+            used.append(response.headers["X-RateLimit-Used"])
+    assert used == ["1", "2"]
+
+
+def test_set_default_keeps_dismissal_restrictions_and_bypass_allowances(
+    cli_runner, stand_in
+):
+    full_name = next(iter(stand_in.state.repositories))
+    reviewers = {"users": ["octocat"], "teams": ["platform"], "apps": []}
+    bypass = {"users": [], "teams": ["release-managers"], "apps": ["renovate"]}
+    stand_in.state.protections[(full_name, "main")] = protection_from_payload(
+        {
+            "enforce_admins": True,
+            "required_pull_request_reviews": {
+                "required_approving_review_count": 1,
+                "dismissal_restrictions": reviewers,
+                "bypass_pull_request_allowances": bypass,
+            },
+        }
+    )
+
+    result = cli_runner.invoke(
+        entrypoint.cli,
+        [
+            "github",
+            "access",
+            "set-default",
+            "--organization",
+            harness.ORGANIZATION,
+            "--repository-name",
+            full_name.split("/")[1],
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    with stand_in.state.lock:
+        reviews = stand_in.state.protections[(full_name, "main")][
+            "required_pull_request_reviews"
+        ]
+    assert reviews["required_approving_review_count"] == 2
+    assert reviews["dismissal_restrictions"] == actors_from_payload(reviewers)
+    assert reviews["bypass_pull_request_allowances"] == actors_from_payload(bypass)
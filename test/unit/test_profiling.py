@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from launch import profiling
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def profiler():
+    profiler = profiling.enable_profiling()
+    yield profiler
+    profiling.disable_profiling()
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://api.github.com/orgs/example/repos?page=2", "GET /orgs/{org}/repos"),
+        (
+            "https://api.github.com/orgs/example/teams/platform/repos/example/api",
+            "GET /orgs/{org}/teams/{team_slug}/repos/{owner}/{repo}",
+        ),
+        (
+            "https://api.github.com/repos/example/api/branches/main/protection",
+            "GET /repos/{owner}/{repo}/branches/{branch}/protection",
+        ),
+        (
+            "https://api.github.com/repos/example/api/hooks/1234",
+            "GET /repos/{owner}/{repo}/hooks/{id}",
+        ),
+    ],
+)
+def test_endpoint_template(url, expected):
+    assert profiling.endpoint_template("GET", url) == expected
+
+
+def test_phase_is_not_recorded_when_disabled():
+    assert profiling.get_profiler() is None
+    with profiling.phase("anything"):
+        pass
+
+    @profiling.profiled("decorated")
+    def decorated(value):
+        return value * 2
+
+    assert decorated(2) == 4
+
+
+def test_phase_and_profiled(profiler):
+    @profiling.profiled("ref scan", category=profiling.GIT)
+    def scan():
+        return "scanned"
+
+    with profiling.phase("organization lookup"):
+        assert scan() == "scanned"
+
+    assert [(span.name, span.category) for span in profiler.spans] == [
+        ("ref scan", profiling.GIT),
+        ("organization lookup", profiling.PHASE),
+    ]
+
+
+def test_phase_is_recorded_when_the_body_raises(profiler):
+    with pytest.raises(RuntimeError):
+        with profiling.phase("failing"):
+            raise RuntimeError("failed")
+    assert [span.name for span in profiler.spans] == ["failing"]
+
+
+def test_rate_limit_consumed():
+    profiler = profiling.Profiler()
+    assert profiler.rate_limit_consumed() is None
+    for used, reset in [(10, "100"), (12, "100"), (11, "100"), (1, "200"), (2, "200")]:
+        profiler.record_http(
+            method="GET",
+            url="https://api.github.com/rate_limit",
+            status_code=200,
+            start=0,
+            end=0,
+            headers={
+                "X-RateLimit-Used": str(used),
+                "X-RateLimit-Remaining": str(5000 - used),
+                "X-RateLimit-Limit": "5000",
+                "X-RateLimit-Reset": reset,
+            },
+        )
+    # Three requests in the first window and two after it reset.
+    assert profiler.rate_limit_consumed() == 5
+
+
+def test_summary():
+    clock = FakeClock()
+    profiler = profiling.Profiler(clock=clock)
+    profiler.record("team lookups", profiling.PHASE, 0.0, 0.25)
+    for status in [200, 304, 404]:
+        profiler.record_http(
+            method="GET",
+            url="https://api.github.com/repos/example/api/branches/main/protection",
+            status_code=status,
+            start=0.0,
+            end=0.1,
+            headers={},
+        )
+    profiler.record("ref scan", profiling.GIT, 0.0, 0.002)
+    clock.now = 1.5
+
+    lines = profiler.summary().splitlines()
+    assert lines[0] == "Profile: 1500.0 ms wall time"
+    assert lines[3].split() == ["team", "lookups", "1", "250.0", "250.0"]
+    assert lines[6].split() == [
+        "GET",
+        "/repos/{owner}/{repo}/branches/{branch}/protection",
+        "3",
+        "300.0",
+        "100.0",
+        "1",
+        "1",
+    ]
+    assert lines[9].split() == ["ref", "scan", "1", "2.0", "2.0"]
+    assert not any("rate limit" in line for line in lines)
+
+
+def test_chrome_trace(tmp_path):
+    clock = FakeClock()
+    clock.now = 10.0
+    profiler = profiling.Profiler(clock=clock)
+    profiler.record("bulk run", profiling.PHASE, 10.5, 11.0, repositories=3)
+
+    path = tmp_path.joinpath("trace.json")
+    profiler.write_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert events[0]["ph"] == "M"
+    assert events[0]["args"] == {"name": "MainThread"}
+    assert {
+        key: events[1][key] for key in ["name", "cat", "ph", "ts", "dur", "args"]
+    } == {
+        "name": "bulk run",
+        "cat": "phase",
+        "ph": "X",
+        "ts": 500_000,
+        "dur": 500_000,
+        "args": {"repositories": 3},
+    }
@@ -1,55 +1,79 @@
+import json
+import re
+import time
+
+import responses
 from semver import Version
 
 from launch import update
+from launch.github.auth import github_headers
+from launch.github.client import github_request
+from launch.github.ratelimit import get_rate_limit_scheduler
 
 
-def test_check_updates_instance_failure(mocker):
-    mocked_get_anonymous_github_instance = mocker.patch.object(
+def test_check_for_updates_session_failure(mocker):
+    mocked_get_update_check_session = mocker.patch.object(
         update,
-        "get_anonymous_github_instance",
-        side_effect=Exception("Failed to connect to GitHub"),
+        "get_update_check_session",
+        side_effect=Exception("Failed to create a session"),
     )
-    mocked_get_repo_semantic_versions = mocker.patch.object(
-        update, "get_repo_semantic_versions"
+    mocked_get_recent_semantic_versions = mocker.patch.object(
+        update, "get_recent_semantic_versions"
     )
     assert update.check_for_updates() is None
-    mocked_get_anonymous_github_instance.assert_called_once()
+    mocked_get_update_check_session.assert_called_once()
     # If we encounter a failure in retrieving data from GitHub before the stage where we ask for versions, we shouldn't try to get the available versions
-    mocked_get_repo_semantic_versions.assert_not_called()
+    mocked_get_recent_semantic_versions.assert_not_called()
 
 
-def test_check_for_updates_repo_failure(mocker):
-    class FakeInstance:
-        def get_repo(full_name_or_id: str):
-            raise Exception("Organization or repository name lookup failure")
-
-    mocked_get_anonymous_github_instance = mocker.patch.object(
-        update, "get_anonymous_github_instance", return_value=FakeInstance()
-    )
-    mocked_get_repo_semantic_versions = mocker.patch.object(
-        update, "get_repo_semantic_versions"
-    )
-    assert update.check_for_updates() is None
-    mocked_get_anonymous_github_instance.assert_called_once()
-    # If we encounter a failure in retrieving data from GitHub before the stage where we ask for versions, we shouldn't try to get the available versions
-    mocked_get_repo_semantic_versions.assert_not_called()
+def test_check_for_updates_repo_failure():
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            re.compile(r"https://api\.github\.com/repos/.+/releases"),
+            status=404,
+            json={"message": "Not Found"},
+        )
+        assert update.check_for_updates() is None
 
 
 def test_check_for_updates_versions_failure(mocker):
-    mocked_get_anonymous_github_instance = mocker.patch.object(
-        update, "get_anonymous_github_instance"
-    )
-    mocked_get_repo_semantic_versions = mocker.patch.object(
+    mocked_get_recent_semantic_versions = mocker.patch.object(
         update,
-        "get_repo_semantic_versions",
+        "get_recent_semantic_versions",
         side_effect=Exception(
             "Something went horribly wrong, this code shouldn't raise"
         ),
     )
     assert update.check_for_updates() is None
-    # Successful calls to retrieve the instance, and then to call the get_repo on the instance
-    assert len(mocked_get_anonymous_github_instance.mock_calls) == 2
-    mocked_get_repo_semantic_versions.assert_called_once()
+    mocked_get_recent_semantic_versions.assert_called_once()
+    assert (
+        mocked_get_recent_semantic_versions.call_args.kwargs["session"]
+        is update.get_update_check_session()
+    )
+
+
+def test_rate_limited_update_check_does_not_hold_up_github_requests(mocker):
+    scheduler = get_rate_limit_scheduler()
+    mocked_sleep = mocker.patch.object(scheduler, "_sleep")
+    with responses.RequestsMock() as rsps:
+        rsps.get(
+            re.compile(r"https://api\.github\.com/repos/.+/releases"),
+            status=403,
+            json={"message": "API rate limit exceeded"},
+            headers={
+                "X-RateLimit-Limit": "60",
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + 3000),
+            },
+        )
+        rsps.get("https://api.github.com/repos/example/example", json={})
+        assert update.check_for_updates() is None
+        response = github_request(
+            method="GET", path="/repos/example/example", headers=github_headers()
+        )
+        assert response.ok
+    mocked_sleep.assert_not_called()
+    assert scheduler.budget().remaining is None
 
 
 def test_check_for_updates_passes_prerelease_var(mocker):
@@ -59,10 +83,9 @@ def test_check_for_updates_passes_prerelease_var(mocker):
     mocker.patch.object(update, "SEMANTIC_VERSION", new=current_version)
     mocker.patch.object(
         update,
-        "get_repo_semantic_versions",
+        "get_recent_semantic_versions",
         return_value=[older_version, current_version, prerelease_version],
     )
-    mocker.patch.object(update, "get_anonymous_github_instance")
     # There are two versions newer than our current, older version, but only the latest should be returned.
     assert update.check_for_updates(include_prerelease=False) == None
     assert update.check_for_updates(include_prerelease=True) == prerelease_version
@@ -74,10 +97,9 @@ def test_check_for_updates_no_newer_version(mocker):
     mocker.patch.object(update, "SEMANTIC_VERSION", new=current_version)
     mocker.patch.object(
         update,
-        "get_repo_semantic_versions",
+        "get_recent_semantic_versions",
         return_value=[older_version, current_version],
     )
-    mocker.patch.object(update, "get_anonymous_github_instance")
     # Since our current version is latest, we expect None to be returned since there is no update to perform.
     assert update.check_for_updates() == None
 
@@ -89,10 +111,9 @@ def test_check_for_updates_one_newer_version(mocker):
     mocker.patch.object(update, "SEMANTIC_VERSION", new=current_version)
     mocker.patch.object(
         update,
-        "get_repo_semantic_versions",
+        "get_recent_semantic_versions",
         return_value=[older_version, current_version, latest_version],
     )
-    mocker.patch.object(update, "get_anonymous_github_instance")
     assert update.check_for_updates() == latest_version
 
 
@@ -103,10 +124,9 @@ def test_check_for_updates_newest_version(mocker):
     mocker.patch.object(update, "SEMANTIC_VERSION", new=older_version)
     mocker.patch.object(
         update,
-        "get_repo_semantic_versions",
+        "get_recent_semantic_versions",
         return_value=[older_version, current_version, latest_version],
     )
-    mocker.patch.object(update, "get_anonymous_github_instance")
     assert update.check_for_updates() == latest_version
 
 
@@ -183,3 +203,81 @@ def test_latest_version_later_prerelease_is_newer_when_include_set(mocker):
         versions=[older_version, current_version, newer_prerelease],
     )
     assert result == newer_prerelease
+
+
+def test_check_for_updates_uses_cache(mocker):
+    current_version = Version(1, 2, 3)
+    latest_version = Version(1, 2, 4)
+    mocker.patch.object(update, "SEMANTIC_VERSION", new=current_version)
+    mocked_get_recent_semantic_versions = mocker.patch.object(
+        update,
+        "get_recent_semantic_versions",
+        return_value=[current_version, latest_version],
+    )
+    assert update.check_for_updates() == latest_version
+    assert update.check_for_updates() == latest_version
+    mocked_get_recent_semantic_versions.assert_called_once()
+
+
+def test_check_for_updates_caches_failures(mocker):
+    mocked_get_recent_semantic_versions = mocker.patch.object(
+        update,
+        "get_recent_semantic_versions",
+        side_effect=Exception("Failed to connect to GitHub"),
+    )
+    assert update.check_for_updates() is None
+    assert update.check_for_updates() is None
+    mocked_get_recent_semantic_versions.assert_called_once()
+
+
+def test_check_for_updates_expired_cache(mocker):
+    latest_version = Version(1, 2, 4)
+    mocker.patch.object(update, "SEMANTIC_VERSION", new=Version(1, 2, 3))
+    mocker.patch.object(update, "UPDATE_CHECK_TTL", new=60)
+    update.write_update_cache(versions=[], succeeded=True, now=0)
+    mocked_get_recent_semantic_versions = mocker.patch.object(
+        update, "get_recent_semantic_versions", return_value=[latest_version]
+    )
+    assert update.check_for_updates() == latest_version
+    mocked_get_recent_semantic_versions.assert_called_once()
+
+
+def test_read_update_cache_ttl(mocker):
+    mocker.patch.object(update, "UPDATE_CHECK_TTL", new=60)
+    mocker.patch.object(update, "UPDATE_CHECK_FAILURE_TTL", new=10)
+    update.write_update_cache(versions=[Version(1, 0, 0)], succeeded=True, now=100)
+    assert update.read_update_cache(now=159) == [Version(1, 0, 0)]
+    assert update.read_update_cache(now=160) is None
+    # Timestamps in the future indicate clock skew, treat them as expired.
+    assert update.read_update_cache(now=99) is None
+
+    update.write_update_cache(versions=[], succeeded=False, now=100)
+    assert update.read_update_cache(now=109) == []
+    assert update.read_update_cache(now=110) is None
+
+
+def test_read_update_cache_missing_or_corrupt(isolated_cache_directory):
+    assert update.read_update_cache() is None
+    isolated_cache_directory.mkdir(parents=True)
+    update.update_cache_path().write_text("{not json")
+    assert update.read_update_cache() is None
+
+
+def test_write_update_cache_keeps_newest_release_and_prerelease():
+    versions = [
+        Version(1, 0, 0),
+        Version(1, 1, 0),
+        Version(1, 2, 0, "alpha"),
+        Version(1, 0, 1, "beta"),
+    ]
+    update.write_update_cache(versions=versions, succeeded=True, now=0)
+    cached = json.loads(update.update_cache_path().read_text())
+    assert cached["versions"] == ["1.1.0", "1.2.0-alpha"]
+
+
+def test_write_update_cache_leaves_no_temporary_files(isolated_cache_directory):
+    for _ in range(3):
+        update.write_update_cache(versions=[Version(1, 0, 0)], succeeded=True)
+    assert [p.name for p in isolated_cache_directory.iterdir()] == [
+        update.UPDATE_CACHE_FILE_NAME
+    ]
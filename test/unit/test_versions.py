@@ -0,0 +1,85 @@
+import pytest
+from semver import Version
+
+from launch import versions
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "1.2.3",
+        "0.0.0",
+        "10.20.30-alpha.1+build.5",
+        "1.0.0-0.3.7",
+        "1.0.0-x-y-z.--",
+        "1.0.0+21AF26D3----117B344092BD",
+        "1.2",
+        "v1.2.3",
+        "01.2.3",
+        "1.2.3-01",
+        "1.2.3\n",
+        "1.2.3 ",
+        "release/1.2.3",
+        "hello-world",
+        "",
+    ],
+)
+def test_parse_version_matches_semver(name):
+    try:
+        expected = Version.parse(name)
+    except ValueError:
+        expected = None
+    assert versions.parse_version(name) == expected
+    assert versions.is_semantic_version(name) == (expected is not None)
+
+
+def test_parse_version_is_memoized():
+    versions.parse_version.cache_clear()
+    first = versions.parse_version("4.5.6")
+    assert versions.parse_version("4.5.6") is first
+    assert versions.parse_version.cache_info().hits == 1
+
+
+def test_parse_versions_drops_non_semantic_names():
+    assert versions.parse_versions(["2.0.0", "foo", "1.0.0-rc.1"]) == {
+        "2.0.0": Version(2, 0, 0),
+        "1.0.0-rc.1": Version(1, 0, 0, "rc.1"),
+    }
+
+
+def test_top_and_latest_versions():
+    candidates = versions.parse_versions(
+        ["0.1.0", "1.0.0", "1.0.0-rc.1", "0.10.0", "0.9.9"]
+    ).values()
+    assert versions.top_versions(candidates, 2) == [
+        Version(1, 0, 0),
+        Version(1, 0, 0, "rc.1"),
+    ]
+    assert versions.latest_version(candidates) == Version(1, 0, 0)
+    assert versions.latest_version([]) is None
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("api/1.2.3", ("api", Version(1, 2, 3))),
+        ("api-v1.2.3-rc.1", ("api", Version(1, 2, 3, "rc.1"))),
+        ("services/web/2.0.0", ("services/web", Version(2, 0, 0))),
+        ("my-vault-v0.1.0", ("my-vault", Version(0, 1, 0))),
+        ("api/v1.2.3", None),
+        ("1.2.3", None),
+        ("v1.2.3", None),
+        ("api/1.2", None),
+    ],
+)
+def test_parse_package_version(name, expected):
+    assert versions.parse_package_version(name) == expected
+
+
+@pytest.mark.parametrize(
+    "scheme, expected", [("slash", "api/1.2.3"), ("dash", "api-v1.2.3")]
+)
+def test_format_package_tag_round_trips(scheme, expected):
+    name = versions.format_package_tag("api", Version(1, 2, 3), scheme=scheme)
+    assert name == expected
+    assert versions.parse_package_version(name) == ("api", Version(1, 2, 3))